@@ -7,12 +7,99 @@ and integration with Agent-RAG-AutoGen workflows.
 """
 
 import os
+import copy
 import json
+import functools
 from typing import Dict, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, fields
 
+try:
+    import orjson
+    _dumps = lambda obj: orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    _loads = orjson.loads
+except ImportError:
+    _dumps = lambda obj: json.dumps(obj, indent=2).encode()
+    _loads = json.loads
 
-@dataclass
+# Environment lookups are read once at import; the agent never mutates its
+# environment at runtime, so there is no need to rescan os.environ per config.
+_ENV = os.environ
+_PINECONE_KEY = _ENV.get("PINECONE_API_KEY")
+_PINECONE_ENV = _ENV.get("PINECONE_ENV", "us-west1-gcp")
+_SMTP_SERVER = _ENV.get("SMTP_SERVER")
+_SMTP_PORT = int(_ENV.get("SMTP_PORT", "587"))
+_SMTP_USER = _ENV.get("SMTP_USERNAME")
+_SMTP_PASS = _ENV.get("SMTP_PASSWORD")
+_SLACK_URL = _ENV.get("SLACK_WEBHOOK_URL")
+_WEBHOOK_URL = _ENV.get("NOTIFICATION_WEBHOOK_URL")
+_METRICS_ENDPOINT = _ENV.get("METRICS_ENDPOINT")
+
+# Default templates, built once; each config gets its own deep copy
+_VECTOR_TEMPLATE = {
+    "chromadb": {
+        "path": "./chroma_db",
+        "collection_name": "cms_providers"
+    },
+    "pinecone": {
+        "api_key": _PINECONE_KEY,
+        "environment": _PINECONE_ENV,
+        "index_name": "cms-providers"
+    }
+}
+
+_VALIDATION_TEMPLATE = {
+    "min_records": 10000,
+    "required_fields": [
+        "cms_certification_number_ccn",
+        "hhcahps_survey_summary_star_rating"
+    ],
+    "valid_ratings": ["1", "2", "3", "4", "5", ""],
+    "max_file_age_hours": 48
+}
+
+_NOTIFICATION_TEMPLATE = {
+    "email": {
+        "enabled": False,
+        "smtp_server": _SMTP_SERVER,
+        "smtp_port": _SMTP_PORT,
+        "username": _SMTP_USER,
+        "password": _SMTP_PASS,
+        "recipients": []
+    },
+    "slack": {
+        "enabled": False,
+        "webhook_url": _SLACK_URL
+    },
+    "webhook": {
+        "enabled": False,
+        "url": _WEBHOOK_URL
+    }
+}
+
+
+@functools.lru_cache(maxsize=32)
+def _load_cached(filepath: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse a config file; keyed on stat info so edits invalidate the entry"""
+    with open(filepath, 'rb') as f:
+        return _loads(f.read())
+
+
+def _default_vector_config() -> Dict[str, Any]:
+    """Default vector database configuration"""
+    return copy.deepcopy(_VECTOR_TEMPLATE)
+
+
+def _default_validation_rules() -> Dict[str, Any]:
+    """Default data validation rules"""
+    return copy.deepcopy(_VALIDATION_TEMPLATE)
+
+
+def _default_notification_config() -> Dict[str, Any]:
+    """Default notification configuration"""
+    return copy.deepcopy(_NOTIFICATION_TEMPLATE)
+
+
+@dataclass(slots=True)  # slots require Python 3.10+
 class AgentConfig:
     """Configuration for CMS Data Agent deployment"""
     
@@ -25,7 +112,7 @@ class AgentConfig:
     # RAG configuration
     embedding_model: str = "text-embedding-ada-002"
     vector_db_type: str = "chromadb"  # chromadb, pinecone, weaviate
-    vector_db_config: Dict[str, Any] = None
+    vector_db_config: Dict[str, Any] = field(default_factory=_default_vector_config)
     
     # Monitoring configuration
     enable_logging: bool = True
@@ -40,83 +127,55 @@ class AgentConfig:
     
     # Data validation
     enable_validation: bool = True
-    validation_rules: Dict[str, Any] = None
+    validation_rules: Dict[str, Any] = field(default_factory=_default_validation_rules)
     
     # Notification settings
     enable_notifications: bool = False
-    notification_config: Dict[str, Any] = None
+    notification_config: Dict[str, Any] = field(default_factory=_default_notification_config)
     
     def __post_init__(self):
+        # An explicit None (or null in a loaded config) means "use the defaults"
         if self.vector_db_config is None:
-            self.vector_db_config = self._default_vector_config()
+            self.vector_db_config = _default_vector_config()
         
         if self.validation_rules is None:
-            self.validation_rules = self._default_validation_rules()
+            self.validation_rules = _default_validation_rules()
         
         if self.notification_config is None:
-            self.notification_config = self._default_notification_config()
-    
-    def _default_vector_config(self) -> Dict[str, Any]:
-        """Default vector database configuration"""
-        return {
-            "chromadb": {
-                "path": "./chroma_db",
-                "collection_name": "cms_providers"
-            },
-            "pinecone": {
-                "api_key": os.getenv("PINECONE_API_KEY"),
-                "environment": os.getenv("PINECONE_ENV", "us-west1-gcp"),
-                "index_name": "cms-providers"
-            }
-        }
-    
-    def _default_validation_rules(self) -> Dict[str, Any]:
-        """Default data validation rules"""
-        return {
-            "min_records": 10000,
-            "required_fields": [
-                "cms_certification_number_ccn",
-                "hhcahps_survey_summary_star_rating"
-            ],
-            "valid_ratings": ["1", "2", "3", "4", "5", ""],
-            "max_file_age_hours": 48
-        }
-    
-    def _default_notification_config(self) -> Dict[str, Any]:
-        """Default notification configuration"""
-        return {
-            "email": {
-                "enabled": False,
-                "smtp_server": os.getenv("SMTP_SERVER"),
-                "smtp_port": int(os.getenv("SMTP_PORT", "587")),
-                "username": os.getenv("SMTP_USERNAME"),
-                "password": os.getenv("SMTP_PASSWORD"),
-                "recipients": []
-            },
-            "slack": {
-                "enabled": False,
-                "webhook_url": os.getenv("SLACK_WEBHOOK_URL")
-            },
-            "webhook": {
-                "enabled": False,
-                "url": os.getenv("NOTIFICATION_WEBHOOK_URL")
-            }
-        }
+            self.notification_config = _default_notification_config()
     
     def save_config(self, filepath: str):
         """Save configuration to file"""
-        with open(filepath, 'w') as f:
-            json.dump(asdict(self), f, indent=2)
+        with open(filepath, 'wb') as f:
+            # Field values are plain JSON types, so a shallow dict suffices
+            # (asdict would deep-copy every nested config dict)
+            f.write(_dumps({name: getattr(self, name) for name in _FIELDS}))
     
     @classmethod
     def load_config(cls, filepath: str) -> 'AgentConfig':
         """Load configuration from file"""
-        with open(filepath, 'r') as f:
-            data = json.load(f)
-        return cls(**data)
+        st = os.stat(filepath)
+        data = _load_cached(filepath, st.st_mtime_ns, st.st_size)
+        return cls(**copy.deepcopy(data))
+    
+    @classmethod
+    def invalidate_cache(cls):
+        """Drop all cached parsed config files"""
+        _load_cached.cache_clear()
+
+
+_FIELDS = tuple(f.name for f in fields(AgentConfig))
+
+
+def clone_config(config: AgentConfig) -> AgentConfig:
+    """Return an independent, mutable copy of a (possibly shared) configuration"""
+    return copy.deepcopy(config)
 
 
 # Environment-specific configurations
+# These are built once and shared; treat the result as read-only and use
+# clone_config() when a modified variant is needed.
+@functools.lru_cache(maxsize=None)
 def get_development_config() -> AgentConfig:
     """Configuration for development environment"""
     return AgentConfig(
@@ -130,6 +189,7 @@ def get_development_config() -> AgentConfig:
     )
 
 
+@functools.lru_cache(maxsize=None)
 def get_production_config() -> AgentConfig:
     """Configuration for production environment"""
     return AgentConfig(
@@ -141,10 +201,11 @@ def get_production_config() -> AgentConfig:
         enable_metrics=True,
         enable_validation=True,
         enable_notifications=True,
-        metrics_endpoint=os.getenv("METRICS_ENDPOINT")
+        metrics_endpoint=_METRICS_ENDPOINT
     )
 
 
+@functools.lru_cache(maxsize=None)
 def get_testing_config() -> AgentConfig:
     """Configuration for testing environment"""
     return AgentConfig(
@@ -218,26 +279,10 @@ KUBERNETES_CONFIG = {
 }
 
 
-def create_deployment_files():
-    """Create deployment configuration files"""
-    
-    # Create config files for different environments
-    configs = {
-        "development": get_development_config(),
-        "production": get_production_config(),
-        "testing": get_testing_config()
-    }
-    
-    os.makedirs("deploy/config", exist_ok=True)
-    
-    for env, config in configs.items():
-        config.save_config(f"deploy/config/{env}.json")
-    
-    # Create Docker files
-    os.makedirs("deploy/docker", exist_ok=True)
-    
-    with open("deploy/docker/docker-compose.yml", "w") as f:
-        f.write("""version: '3.8'
+# Serialized once at import; the manifest is static
+_K8S_JSON = _dumps(KUBERNETES_CONFIG)
+
+_COMPOSE_BYTES = b"""version: '3.8'
 services:
   cms-data-agent:
     build: .
@@ -255,11 +300,9 @@ services:
       interval: 30s
       timeout: 10s
       retries: 3
-""")
-    
-    # Create Dockerfile
-    with open("deploy/docker/Dockerfile", "w") as f:
-        f.write("""FROM python:3.11-slim
+"""
+
+_DOCKERFILE_BYTES = b"""FROM python:3.11-slim
 
 WORKDIR /app
 
@@ -283,13 +326,37 @@ CMD ["python", "cms_agent.py", "--run-scheduler"]
 EXPOSE 8080
 HEALTHCHECK --interval=30s --timeout=10s --start-period=5s --retries=3 \\
   CMD python health_check.py
-""")
+"""
+
+_DEPLOY_DIRS = ("deploy/config", "deploy/docker", "deploy/k8s")
+
+
+def create_deployment_files():
+    """Create deployment configuration files"""
     
-    # Create Kubernetes manifests
-    os.makedirs("deploy/k8s", exist_ok=True)
+    for d in _DEPLOY_DIRS:
+        os.makedirs(d, exist_ok=True)
     
-    with open("deploy/k8s/deployment.yaml", "w") as f:
-        json.dump(KUBERNETES_CONFIG, f, indent=2)
+    # Create config files for different environments
+    configs = {
+        "development": get_development_config(),
+        "production": get_production_config(),
+        "testing": get_testing_config()
+    }
+    
+    for env, config in configs.items():
+        config.save_config(f"deploy/config/{env}.json")
+    
+    # Create Docker files
+    with open("deploy/docker/docker-compose.yml", "wb") as f:
+        f.write(_COMPOSE_BYTES)
+    
+    with open("deploy/docker/Dockerfile", "wb") as f:
+        f.write(_DOCKERFILE_BYTES)
+    
+    # Create Kubernetes manifests
+    with open("deploy/k8s/deployment.yaml", "wb") as f:
+        f.write(_K8S_JSON)
     
     print("✅ Deployment files created in deploy/ directory")
 
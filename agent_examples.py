@@ -7,239 +7,503 @@ in the Agent-RAG-AutoGen project for automated data management.
 """
 
 import asyncio
+import heapq
+import io
+import os
+import sys
 import time
+from contextlib import contextmanager
 from datetime import datetime
-from cms_agent import create_cms_agent
-from agent_integration import (
-    RAGDataManager, 
-    AutoGenCMSAgent, 
-    CMSDataService,
-    create_rag_integration
-)
+from itertools import chain, islice
+from multiprocessing import Pool
+# cms_agent and agent_integration are imported inside the examples that use
+# them so that importing this module (or running only the configuration
+# example) does not pay for their dependency chain.
 from agent_config import get_development_config, get_production_config
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-async def example_basic_agent_usage():
-    """Basic agent usage example"""
-    print("🤖 Basic CMS Data Agent Example")
-    print("=" * 50)
+# Examples print many short lines; they are collected and written to stdout in
+# one go. Set CMS_EXAMPLES_UNBUFFERED=1 to get line-by-line output instead.
+_UNBUFFERED = os.getenv("CMS_EXAMPLES_UNBUFFERED") == "1"
+
+
+@contextmanager
+def _example_output():
+    """
+    Print function for one example's output
+    
+    Lines are collected in a local buffer and written to stdout in a single
+    call when the block exits, or earlier when emitted with flush=True.
+    Nothing else writing to stdout is captured.
+    """
+    if _UNBUFFERED:
+        yield print
+        return
     
-    # Create agent with custom configuration
-    agent = create_cms_agent(
-        output_dir="example_data",
-        check_interval_hours=1,
-        auto_update=True
-    )
+    buf = io.StringIO()
     
-    # Check current status
-    status = agent.get_status()
-    print(f"📊 Current Status:")
-    print(f"   Records: {status['current_record_count']}")
-    print(f"   Data Age: {status['data_age_hours']:.1f} hours")
-    print(f"   Updates Available: {status['update_available']}")
+    def write_out():
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+        buf.seek(0)
+        buf.truncate()
     
-    # Check for updates
-    print(f"\n🔍 Checking for updates...")
-    has_updates = agent.check_for_updates()
-    print(f"   Updates available: {has_updates}")
+    def emit(*args, sep=' ', end='\n', flush=False):
+        print(*args, sep=sep, end=end, file=buf)
+        if flush:
+            write_out()
     
-    # Get latest data
-    print(f"\n📥 Getting latest data...")
-    data = agent.get_latest_data(max_age_hours=24)
-    if data:
-        print(f"   ✅ Loaded {len(data)} records")
-        # Show sample record
-        sample = data[0]
-        print(f"   Sample provider: {sample.get('cms_certification_number_ccn')}")
-        print(f"   Rating: {sample.get('hhcahps_survey_summary_star_rating')}/5")
-    else:
-        print(f"   ❌ No data available")
+    try:
+        yield emit
+    finally:
+        write_out()
+
+
+async def example_basic_agent_usage():
+    """Basic agent usage example"""
+    from cms_agent import create_cms_agent
     
-    return agent
+    with _example_output() as emit:
+        emit("🤖 Basic CMS Data Agent Example")
+        emit("=" * 50)
+        
+        # Create agent with custom configuration
+        agent = create_cms_agent(
+            output_dir="example_data",
+            check_interval_hours=1,
+            auto_update=True
+        )
+        
+        # Check current status
+        status = agent.get_status()
+        emit(f"📊 Current Status:")
+        emit(f"   Records: {status['current_record_count']}")
+        emit(f"   Data Age: {status['data_age_hours']:.1f} hours")
+        emit(f"   Updates Available: {status['update_available']}")
+        
+        # Check for updates
+        emit(f"\n🔍 Checking for updates...")
+        has_updates = agent.check_for_updates()
+        emit(f"   Updates available: {has_updates}")
+        
+        # Get latest data
+        emit(f"\n📥 Getting latest data...")
+        data = agent.get_latest_data(max_age_hours=24)
+        if data:
+            emit(f"   ✅ Loaded {len(data)} records")
+            # Show sample record
+            sample = data[0]
+            emit(f"   Sample provider: {sample.get('cms_certification_number_ccn')}")
+            emit(f"   Rating: {sample.get('hhcahps_survey_summary_star_rating')}/5")
+        else:
+            emit(f"   ❌ No data available")
+        
+        return agent
 
 
 async def example_rag_integration():
     """RAG integration example"""
-    print("\n🧠 RAG Integration Example")
-    print("=" * 50)
-    
-    # Create RAG manager
-    rag_manager = RAGDataManager()
-    
-    # Ensure fresh data
-    fresh = await rag_manager.ensure_fresh_data(max_age_hours=24)
-    print(f"📊 Fresh data available: {fresh}")
-    
-    # Get high-rated providers for context
-    print(f"\n⭐ Getting high-rated providers...")
-    high_rated = rag_manager.get_provider_context(
-        rating_threshold=5,
-        limit=3
-    )
-    
-    if high_rated:
-        context = rag_manager.format_for_llm(high_rated)
-        print(f"   Found {len(high_rated)} 5-star providers")
-        print(f"   Context preview: {context[:200]}...")
+    from agent_integration import RAGDataManager
     
-    # Get statistics for LLM
-    print(f"\n📈 Getting statistics...")
-    stats = rag_manager.get_statistics_context()
-    print(f"   Stats preview: {stats[:200]}...")
-    
-    return rag_manager
+    with _example_output() as emit:
+        emit("\n🧠 RAG Integration Example")
+        emit("=" * 50)
+        
+        # Create RAG manager
+        rag_manager = RAGDataManager()
+        
+        # Ensure fresh data
+        fresh = await rag_manager.ensure_fresh_data(max_age_hours=24)
+        emit(f"📊 Fresh data available: {fresh}")
+        
+        # Get high-rated providers for context
+        emit(f"\n⭐ Getting high-rated providers...")
+        high_rated = rag_manager.get_provider_context(
+            rating_threshold=5,
+            limit=3
+        )
+        
+        if high_rated:
+            context = rag_manager.format_for_llm(high_rated)
+            emit(f"   Found {len(high_rated)} 5-star providers")
+            emit(f"   Context preview: {context[:200]}...")
+        
+        # Get statistics for LLM
+        emit(f"\n📈 Getting statistics...")
+        stats = rag_manager.get_statistics_context()
+        emit(f"   Stats preview: {stats[:200]}...")
+        
+        return rag_manager
 
 
 async def example_autogen_agent():
     """AutoGen agent example"""
-    print("\n🔄 AutoGen Agent Example")
-    print("=" * 50)
-    
-    # Create AutoGen-compatible agent
-    autogen_agent = AutoGenCMSAgent(name="healthcare_data_agent")
-    
-    # Simulate different types of requests
-    requests = [
-        "What's the current data status?",
-        "Show me high rated providers",
-        "Get statistics about the dataset",
-        "Find provider 017000",
-        "Update the data"
-    ]
+    from agent_integration import AutoGenCMSAgent
     
-    for request in requests:
-        print(f"\n📨 Request: {request}")
-        response = await autogen_agent.handle_data_request(request)
-        print(f"🤖 Response: {response[:150]}{'...' if len(response) > 150 else ''}")
-    
-    return autogen_agent
+    with _example_output() as emit:
+        emit("\n🔄 AutoGen Agent Example")
+        emit("=" * 50)
+        
+        # Create AutoGen-compatible agent
+        autogen_agent = AutoGenCMSAgent(name="healthcare_data_agent")
+        
+        # Simulate different types of requests
+        requests = [
+            "What's the current data status?",
+            "Show me high rated providers",
+            "Get statistics about the dataset",
+            "Find provider 017000",
+            "Update the data"
+        ]
+        
+        # Dispatch all requests at once; results come back in request order
+        responses = await asyncio.gather(
+            *(autogen_agent.handle_data_request(request) for request in requests)
+        )
+        
+        for request, response in zip(requests, responses):
+            emit(f"\n📨 Request: {request}")
+            emit(f"🤖 Response: {response[:150]}{'...' if len(response) > 150 else ''}")
+        
+        return autogen_agent
 
 
 async def example_background_service():
     """Background service example"""
-    print("\n⚙️  Background Service Example")
-    print("=" * 50)
-    
-    # Create background service
-    service = CMSDataService(check_interval_hours=0.1)  # Check every 6 minutes for demo
-    
-    print(f"🚀 Starting background service...")
-    print(f"   Check interval: {service.check_interval_hours} hours")
-    print(f"   Auto-update enabled: {service.agent.auto_update}")
-    
-    # Run for a short time (in real usage, this would run indefinitely)
-    print(f"\n⏰ Running service for 30 seconds...")
+    from agent_integration import CMSDataService
     
-    # Start service in background
-    service_task = asyncio.create_task(service.start())
-    
-    # Let it run for a short time
-    await asyncio.sleep(30)
-    
-    # Stop service
-    service.stop()
-    service_task.cancel()
-    
-    print(f"⏹️  Service stopped")
-    
-    return service
+    with _example_output() as emit:
+        emit("\n⚙️  Background Service Example")
+        emit("=" * 50)
+        
+        # Create background service
+        service = CMSDataService(check_interval_hours=0.1)  # Check every 6 minutes for demo
+        
+        emit(f"🚀 Starting background service...")
+        emit(f"   Check interval: {service.check_interval_hours} hours")
+        emit(f"   Auto-update enabled: {service.agent.auto_update}")
+        
+        # Run for a short time (in real usage, this would run indefinitely)
+        emit(f"\n⏰ Running service for 30 seconds...", flush=True)
+        
+        # Run the service inside a task group; the timeout cancels it cleanly
+        try:
+            async with asyncio.timeout(30):
+                async with asyncio.TaskGroup() as tg:
+                    tg.create_task(service.start())
+        except TimeoutError:
+            service.stop()
+        
+        emit(f"⏹️  Service stopped")
+        
+        return service
 
 
 def example_configuration():
     """Configuration example"""
-    print("\n⚙️  Configuration Example")
-    print("=" * 50)
-    
-    # Get different environment configs
-    dev_config = get_development_config()
-    prod_config = get_production_config()
-    
-    print(f"🔧 Development Config:")
-    print(f"   Output Dir: {dev_config.output_dir}")
-    print(f"   Check Interval: {dev_config.check_interval_hours}h")
-    print(f"   Auto Update: {dev_config.auto_update}")
-    print(f"   Log Level: {dev_config.log_level}")
-    
-    print(f"\n🏭 Production Config:")
-    print(f"   Output Dir: {prod_config.output_dir}")
-    print(f"   Check Interval: {prod_config.check_interval_hours}h")
-    print(f"   Metrics: {prod_config.enable_metrics}")
-    print(f"   Notifications: {prod_config.enable_notifications}")
-    
-    # Save configs
-    dev_config.save_config("example_dev_config.json")
-    prod_config.save_config("example_prod_config.json")
-    print(f"\n💾 Configs saved to JSON files")
+    with _example_output() as emit:
+        emit("\n⚙️  Configuration Example")
+        emit("=" * 50)
+        
+        # Get different environment configs
+        dev_config = get_development_config()
+        prod_config = get_production_config()
+        
+        emit(f"🔧 Development Config:")
+        emit(f"   Output Dir: {dev_config.output_dir}")
+        emit(f"   Check Interval: {dev_config.check_interval_hours}h")
+        emit(f"   Auto Update: {dev_config.auto_update}")
+        emit(f"   Log Level: {dev_config.log_level}")
+        
+        emit(f"\n🏭 Production Config:")
+        emit(f"   Output Dir: {prod_config.output_dir}")
+        emit(f"   Check Interval: {prod_config.check_interval_hours}h")
+        emit(f"   Metrics: {prod_config.enable_metrics}")
+        emit(f"   Notifications: {prod_config.enable_notifications}")
+        
+        # Save configs
+        dev_config.save_config("example_dev_config.json")
+        prod_config.save_config("example_prod_config.json")
+        emit(f"\n💾 Configs saved to JSON files")
 
 
 async def example_data_analysis():
     """Data analysis example"""
-    print("\n📊 Data Analysis Example")
-    print("=" * 50)
+    from cms_agent import create_cms_agent
     
-    # Get agent and data
-    agent = create_cms_agent()
-    data = agent.get_latest_data()
-    
-    if not data:
-        print("❌ No data available for analysis")
-        return
-    
-    print(f"📈 Analyzing {len(data)} provider records...")
-    
-    # Rating distribution
-    ratings = [
-        int(r.get('hhcahps_survey_summary_star_rating', '0'))
-        for r in data 
-        if r.get('hhcahps_survey_summary_star_rating', '').isdigit()
-    ]
-    
-    if ratings:
-        from collections import Counter
-        rating_dist = Counter(ratings)
-        print(f"\n⭐ Rating Distribution:")
-        for rating in sorted(rating_dist.keys()):
-            count = rating_dist[rating]
-            pct = (count / len(ratings)) * 100
-            print(f"   {rating} stars: {count:,} providers ({pct:.1f}%)")
+    with _example_output() as emit:
+        emit("\n📊 Data Analysis Example")
+        emit("=" * 50)
+        
+        # Get agent and stream the data; only aggregates are kept in memory
+        agent = create_cms_agent()
+        records = agent.iter_latest_data()
+        
+        if records is None:
+            emit("❌ No data available for analysis")
+            return
+        
+        summary = _summarize_providers_numpy(records) if np is not None else _summarize_providers_parallel(records)
+        
+        if not summary['total']:
+            emit("❌ No data available for analysis")
+            return
+        
+        emit(f"📈 Analyzed {summary['total']} provider records...")
+        
+        rating_counts = summary['rating_counts']
+        if rating_counts:
+            total_rated = sum(rating_counts.values())
+            emit(f"\n⭐ Rating Distribution:")
+            for rating in sorted(rating_counts):
+                count = rating_counts[rating]
+                pct = (count / total_rated) * 100
+                emit(f"   {rating} stars: {count:,} providers ({pct:.1f}%)")
+        
+        if summary['response_rates']:
+            avg_rate, min_rate, max_rate = summary['response_rates']
+            emit(f"\n📋 Survey Response Rates:")
+            emit(f"   Average: {avg_rate:.1f}%")
+            emit(f"   Range: {min_rate}% - {max_rate}%")
+        
+        emit(f"\n🏆 Top Performers:")
+        emit(f"   5-star providers: {summary['five_star_count']}")
+        
+        if summary['top_by_surveys']:
+            emit(f"   Top 5 by survey volume:")
+            for i, provider in enumerate(summary['top_by_surveys'], 1):
+                ccn = provider.get('cms_certification_number_ccn', 'Unknown')
+                surveys = provider.get('number_of_completed_surveys', 'Unknown')
+                emit(f"     {i}. Provider {ccn}: {surveys} surveys")
+
+
+def _to_int(s):
+    """
+    Parse a plain decimal-digit string as an int; -1 marks missing or
+    non-numeric values
+    
+    Signs, spaces and underscores (which int() alone would accept) are
+    rejected, matching the vectorized np.char.isdecimal parse.
+    """
+    try:
+        return int(s) if s.isdecimal() else -1
+    except AttributeError:
+        return -1
+
+
+def _survey_count(record):
+    """Completed survey count for sorting, 0 when missing"""
+    return max(_to_int(record.get('number_of_completed_surveys', '0')), 0)
+
+
+# Records per worker task when aggregating in parallel
+_SHARD_SIZE = 8192
+
+
+def _shard_stats(records):
+    """Partial aggregates for one shard of records, combined by _merge_shard_stats"""
+    rating_hist = [0] * 6  # star ratings are 0-5, so a flat list beats a Counter
+    rating_other = {}  # any larger values still count, as in the original Counter
+    rate_sum = rate_n = 0
+    rate_min = rate_max = None
+    five_star_count = 0
+    top = []  # min-heap of (surveys, -position, record), at most 5 entries
+    total = 0
+    
+    # Loop-invariant lookups bound to locals (LOAD_FAST instead of LOAD_GLOBAL/LOAD_ATTR)
+    _get = dict.get
+    _parse = _to_int
+    _surveys = _survey_count
+    _push = heapq.heappush
+    _replace = heapq.heapreplace
+    
+    for r in records:
+        total += 1
+        
+        # Rating distribution
+        rating_raw = _get(r, 'hhcahps_survey_summary_star_rating', '')
+        rating = _parse(rating_raw)
+        if 0 <= rating <= 5:
+            rating_hist[rating] += 1
+        elif rating > 5:
+            rating_other[rating] = rating_other.get(rating, 0) + 1
+        
+        # Response rate analysis
+        rate = _parse(_get(r, 'survey_response_rate', ''))
+        if rate >= 0:
+            rate_sum += rate
+            rate_n += 1
+            if rate_min is None or rate < rate_min:
+                rate_min = rate
+            if rate_max is None or rate > rate_max:
+                rate_max = rate
+        
+        # Bounded heap keeps the top 5 without sorting every 5-star record;
+        # -total makes earlier records win ties, as a stable sort would
+        if rating_raw == '5':
+            five_star_count += 1
+            entry = (_surveys(r), -total, r)
+            if len(top) < 5:
+                _push(top, entry)
+            elif entry > top[0]:
+                _replace(top, entry)
+    
+    # Only the shard's own top 5 can make the overall top 5
+    top = [r for _, _, r in sorted(top, reverse=True)]
+    return total, rating_hist, rating_other, rate_sum, rate_n, rate_min, rate_max, five_star_count, top
+
+
+def _merge_shard_stats(partials):
+    """Combine _shard_stats results (in record order) into a summary dict"""
+    total = rate_sum = rate_n = five_star_count = 0
+    rate_min = rate_max = None
+    rating_hist = [0] * 6
+    rating_other = {}
+    candidates = []
+    
+    for (shard_total, shard_hist, shard_other, shard_sum, shard_n, shard_min, shard_max,
+         shard_five_star, shard_top) in partials:
+        total += shard_total
+        for rating in range(6):
+            rating_hist[rating] += shard_hist[rating]
+        for rating, count in shard_other.items():
+            rating_other[rating] = rating_other.get(rating, 0) + count
+        rate_sum += shard_sum
+        rate_n += shard_n
+        if shard_n:
+            rate_min = shard_min if rate_min is None else min(rate_min, shard_min)
+            rate_max = shard_max if rate_max is None else max(rate_max, shard_max)
+        five_star_count += shard_five_star
+        candidates.extend(shard_top)
+    
+    return {
+        'total': total,
+        'rating_counts': {
+            **{rating: count for rating, count in enumerate(rating_hist) if count},
+            **rating_other
+        },
+        'response_rates': (rate_sum / rate_n, rate_min, rate_max) if rate_n else None,
+        'five_star_count': five_star_count,
+        'top_by_surveys': sorted(candidates, key=_survey_count, reverse=True)[:5]
+    }
+
+
+# Below this many records a serial pass beats starting a process pool
+_PARALLEL_MIN_RECORDS = 16 * _SHARD_SIZE
+
+
+def _summarize_providers_parallel(records, processes=None):
+    """
+    Aggregate rating, response-rate and top-performer stats, spreading shards
+    across processes for large inputs
+    
+    Args:
+        records: Iterable of provider record dicts
+        processes: Worker count; passing it forces the pool even for small
+            inputs, otherwise one is only started past _PARALLEL_MIN_RECORDS
+    
+    Returns:
+        Summary dict built by _merge_shard_stats
+    """
+    records = iter(records)
+    shards = iter(lambda: list(islice(records, _SHARD_SIZE)), [])
+    min_shards = 2 if processes else _PARALLEL_MIN_RECORDS // _SHARD_SIZE
+    head = list(islice(shards, min_shards))
+    
+    # Too little work to pay for starting workers
+    if len(head) < min_shards:
+        return _merge_shard_stats(map(_shard_stats, head))
+    
+    with Pool(processes or os.cpu_count()) as pool:
+        # imap keeps shard order so ties in the top 5 resolve like a serial pass
+        return _merge_shard_stats(pool.imap(_shard_stats, chain(head, shards)))
+
+
+# Digit strings up to this length are parsed as int64 columns; a sum of up to a
+# billion such values cannot overflow. Longer ones are parsed as Python ints.
+_NUMPY_MAX_DIGITS = 9
+
+
+def _parse_column(raw):
+    """
+    Vectorized _to_int over a string array
+    
+    Returns:
+        (values, mask, extra): int64 values of the short digit strings, the mask
+        selecting them from raw, and the longer digit strings as Python ints
+    """
+    digits = np.char.isdecimal(raw)
+    short = digits & (np.char.str_len(raw) <= _NUMPY_MAX_DIGITS)
+    extra = [int(v) for v in raw[digits & ~short].tolist()]
+    return raw[short].astype(np.int64), short, extra
+
+
+def _summarize_providers_numpy(records):
+    """Vectorized equivalent of _summarize_providers_parallel using column arrays"""
+    # One pass pulls out just the columns we need; 5-star records are kept for display
+    ratings_col, rates_col, five_star = [], [], []
+    _get = dict.get
+    add_rating, add_rate, add_five_star = ratings_col.append, rates_col.append, five_star.append
+    for r in records:
+        rating = _get(r, 'hhcahps_survey_summary_star_rating', '')
+        add_rating(rating)
+        add_rate(_get(r, 'survey_response_rate', ''))
+        if rating == '5':
+            add_five_star(r)
+    
+    # Non-string values count as missing, as in _to_int
+    ratings_raw = np.array([v if isinstance(v, str) else '' for v in ratings_col], dtype=str)
+    rates_raw = np.array([v if isinstance(v, str) else '' for v in rates_col], dtype=str)
+    
+    # Rating distribution: 0-5 through bincount, anything larger counted separately
+    ratings, _, ratings_extra = _parse_column(ratings_raw)
+    counts = np.bincount(ratings[ratings <= 5], minlength=6)
+    rating_counts = {int(r): int(counts[r]) for r in np.flatnonzero(counts)}
+    values, value_counts = np.unique(ratings[ratings > 5], return_counts=True)
+    rating_counts.update(zip(values.tolist(), value_counts.tolist()))
+    for rating in ratings_extra:
+        rating_counts[rating] = rating_counts.get(rating, 0) + 1
     
     # Response rate analysis
-    response_rates = [
-        int(r.get('survey_response_rate', '0'))
-        for r in data 
-        if r.get('survey_response_rate', '').isdigit()
-    ]
-    
-    if response_rates:
-        avg_rate = sum(response_rates) / len(response_rates)
-        min_rate = min(response_rates)
-        max_rate = max(response_rates)
-        print(f"\n📋 Survey Response Rates:")
-        print(f"   Average: {avg_rate:.1f}%")
-        print(f"   Range: {min_rate}% - {max_rate}%")
-    
-    # Top providers
-    five_star = [
-        r for r in data 
-        if r.get('hhcahps_survey_summary_star_rating') == '5'
-    ]
-    
-    print(f"\n🏆 Top Performers:")
-    print(f"   5-star providers: {len(five_star)}")
-    
+    rates, _, rates_extra = _parse_column(rates_raw)
+    rate_stats = None
+    rate_n = rates.size + len(rates_extra)
+    if rate_n:
+        rate_sum = int(rates.sum()) + sum(rates_extra)
+        bounds = ([int(rates.min()), int(rates.max())] if rates.size else []) + rates_extra
+        rate_stats = (rate_sum / rate_n, min(bounds), max(bounds))
+    
+    # Top providers: partial selection instead of a full sort
+    top_by_surveys = []
     if five_star:
-        # Sort by survey count
-        top_by_surveys = sorted(
-            five_star,
-            key=lambda x: int(x.get('number_of_completed_surveys', '0')) if x.get('number_of_completed_surveys', '').isdigit() else 0,
-            reverse=True
-        )[:5]
-        
-        print(f"   Top 5 by survey volume:")
-        for i, provider in enumerate(top_by_surveys, 1):
-            ccn = provider.get('cms_certification_number_ccn', 'Unknown')
-            surveys = provider.get('number_of_completed_surveys', 'Unknown')
-            print(f"     {i}. Provider {ccn}: {surveys} surveys")
+        surveys_col = [_get(r, 'number_of_completed_surveys', '') for r in five_star]
+        surveys_raw = np.array([v if isinstance(v, str) else '' for v in surveys_col], dtype=str)
+        parsed, short, surveys_extra = _parse_column(surveys_raw)
+        if surveys_extra:
+            # Counts too long for int64 are rare; rank them with Python ints instead
+            top_by_surveys = sorted(five_star, key=_survey_count, reverse=True)[:5]
+        else:
+            surveys = np.zeros(surveys_raw.size, dtype=np.int64)
+            surveys[short] = parsed
+            k = min(5, surveys.size)
+            # k-th largest count via partition; everything at or above it is a candidate
+            kth = np.partition(surveys, surveys.size - k)[surveys.size - k]
+            candidates = np.flatnonzero(surveys >= kth)
+            # Order by survey count, ties by original position (matches a stable sort)
+            candidates = candidates[np.argsort(-surveys[candidates], kind='stable')][:k]
+            top_by_surveys = [five_star[i] for i in candidates]
+    
+    return {
+        'total': len(ratings_col),
+        'rating_counts': rating_counts,
+        'response_rates': rate_stats,
+        'five_star_count': len(five_star),
+        'top_by_surveys': top_by_surveys
+    }
 
 
 async def main():
@@ -8,10 +8,67 @@ Agent-RAG-AutoGen framework for seamless data management in AI workflows.
 
 import asyncio
 import json
+import re
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from cms_agent import CMSDataAgent, create_cms_agent
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+_CCN_RE = re.compile(r'\b\d{6}\b')
+_HELP_TEXT = """I can help with CMS healthcare provider data. Available commands:
+- 'update data' - Refresh the dataset
+- 'status' - Check data status
+- 'provider [ID]' - Get specific provider info
+- 'statistics' - Get data summary
+- 'high rated providers' - Get top-rated providers"""
+
+
+def _rating_stats(ratings, response_rates):
+    """
+    Fused rating histogram and sums over the rating/response-rate columns
+    
+    Missing values are stored as -1 and skipped. Compiled with Numba when available.
+    """
+    counts = np.zeros(128, dtype=np.int64)
+    rating_sum = rating_n = rate_sum = rate_n = 0
+    for i in range(ratings.shape[0]):
+        rating = ratings[i]
+        if rating >= 0:
+            counts[rating] += 1
+            rating_sum += rating
+            rating_n += 1
+        rate = response_rates[i]
+        if rate >= 0:
+            rate_sum += rate
+            rate_n += 1
+    return counts, rating_sum, rating_n, rate_sum, rate_n
+
+
+if njit is not None:
+    _rating_stats = njit(cache=True, nogil=True)(_rating_stats)
+
+
+def _format_provider(i: int, provider: Dict) -> str:
+    """Format one provider record as a numbered block for LLM context"""
+    get = provider.get
+    return (
+        f"{i}. Provider {get('cms_certification_number_ccn', 'Unknown')}:\n"
+        f"   - Overall Rating: {get('hhcahps_survey_summary_star_rating', 'Not rated')}/5 stars\n"
+        f"   - Survey Responses: {get('number_of_completed_surveys', 'Unknown')} completed\n"
+        f"   - Response Rate: {get('survey_response_rate', 'Unknown')}%\n"
+        f"   - Professional Care: {get('star_rating_for_health_team_gave_care_in_a_professional_way', 'N/A')}/5 stars\n"
+        f"   - Communication: {get('star_rating_for_health_team_communicated_well_with_them', 'N/A')}/5 stars\n\n"
+    )
+
 
 class RAGDataManager:
     """
@@ -67,27 +124,29 @@ class RAGDataManager:
         Returns:
             List of provider records for context
         """
-        data = self.cms_agent.get_latest_data()
-        if not data:
+        # Records, columns and indexes from one load, so rows stay aligned
+        # even if a download replaces the data meanwhile
+        snapshot = self.cms_agent.get_snapshot()
+        if snapshot is None or not snapshot.records:
             return []
+        data = snapshot.records
         
         # Filter data based on criteria
-        filtered_data = data
+        ratings = snapshot.columns['rating']
         
         if provider_id:
-            filtered_data = [
-                r for r in filtered_data 
-                if r.get('cms_certification_number_ccn') == provider_id
-            ]
-        
-        if rating_threshold:
-            filtered_data = [
-                r for r in filtered_data 
-                if (r.get('hhcahps_survey_summary_star_rating', '0').isdigit() and
-                    int(r.get('hhcahps_survey_summary_star_rating', '0')) >= rating_threshold)
-            ]
-        
-        return filtered_data[:limit]
+            # Hash lookup instead of scanning every record for the CCN
+            rows = snapshot.find_provider_rows(provider_id)
+            if rating_threshold:
+                rows = [i for i in rows if ratings[i] >= rating_threshold]
+            return [data[i] for i in rows[:limit]]
+        
+        if not rating_threshold:
+            return data[:limit]
+        
+        # Best rated first, from the agent's presorted rating order
+        rows = snapshot.top_rated_rows(rating_threshold, limit)
+        return [data[i] for i in rows]
     
     def format_for_llm(self, providers: List[Dict]) -> str:
         """
@@ -102,27 +161,9 @@ class RAGDataManager:
         if not providers:
             return "No provider data available."
         
-        formatted_text = "Healthcare Provider Information:\n\n"
-        
-        for i, provider in enumerate(providers, 1):
-            ccn = provider.get('cms_certification_number_ccn', 'Unknown')
-            rating = provider.get('hhcahps_survey_summary_star_rating', 'Not rated')
-            surveys = provider.get('number_of_completed_surveys', 'Unknown')
-            response_rate = provider.get('survey_response_rate', 'Unknown')
-            
-            formatted_text += f"{i}. Provider {ccn}:\n"
-            formatted_text += f"   - Overall Rating: {rating}/5 stars\n"
-            formatted_text += f"   - Survey Responses: {surveys} completed\n"
-            formatted_text += f"   - Response Rate: {response_rate}%\n"
-            
-            # Add specific care ratings
-            prof_care = provider.get('star_rating_for_health_team_gave_care_in_a_professional_way', 'N/A')
-            communication = provider.get('star_rating_for_health_team_communicated_well_with_them', 'N/A')
-            
-            formatted_text += f"   - Professional Care: {prof_care}/5 stars\n"
-            formatted_text += f"   - Communication: {communication}/5 stars\n\n"
-        
-        return formatted_text
+        return "Healthcare Provider Information:\n\n" + "".join(
+            [_format_provider(i, provider) for i, provider in enumerate(providers, 1)]
+        )
     
     def get_statistics_context(self) -> str:
         """
@@ -131,30 +172,57 @@ class RAGDataManager:
         Returns:
             Statistical summary string
         """
-        data = self.cms_agent.get_latest_data()
-        if not data:
+        snapshot = self.cms_agent.get_snapshot()
+        if snapshot is None or not snapshot.records:
             return "No statistical data available."
+        data = snapshot.records
         
         # Calculate statistics
         total_providers = len(data)
         
-        # Rating distribution
-        ratings = [
-            int(r.get('hhcahps_survey_summary_star_rating', '0'))
-            for r in data 
-            if r.get('hhcahps_survey_summary_star_rating', '').isdigit()
-        ]
-        
-        avg_rating = sum(ratings) / len(ratings) if ratings else 0
-        
-        # Response rates
-        response_rates = [
-            int(r.get('survey_response_rate', '0'))
-            for r in data 
-            if r.get('survey_response_rate', '').isdigit()
-        ]
-        
-        avg_response_rate = sum(response_rates) / len(response_rates) if response_rates else 0
+        columns = snapshot.columns
+        if np is not None:
+            if njit is not None:
+                counts, rating_sum, rating_n, rate_sum, rate_n = _rating_stats(
+                    columns['rating'], columns['response_rate']
+                )
+            else:
+                rating_column = columns['rating']
+                ratings = rating_column[rating_column >= 0]
+                response_column = columns['response_rate']
+                response_rates = response_column[response_column >= 0]
+                
+                # Ratings are small non-negative ints, so one bincount gives the histogram
+                counts = np.bincount(ratings, minlength=6)
+                rating_sum, rating_n = int(ratings.sum()), ratings.size
+                rate_sum, rate_n = int(response_rates.sum()), response_rates.size
+            
+            avg_rating = rating_sum / rating_n if rating_n else 0
+            avg_response_rate = rate_sum / rate_n if rate_n else 0
+            rating_dist = [
+                (rating, count, (count / rating_n) * 100)
+                for rating, count in enumerate(counts.tolist())
+                if count
+            ]
+        else:
+            # Single fused pass over the pre-parsed columns (-1 = missing)
+            rating_counts = {}
+            rating_sum = rating_n = rate_sum = rate_n = 0
+            for rating, rate in zip(columns['rating'], columns['response_rate']):
+                if rating >= 0:
+                    rating_counts[rating] = rating_counts.get(rating, 0) + 1
+                    rating_sum += rating
+                    rating_n += 1
+                if rate >= 0:
+                    rate_sum += rate
+                    rate_n += 1
+            
+            avg_rating = rating_sum / rating_n if rating_n else 0
+            avg_response_rate = rate_sum / rate_n if rate_n else 0
+            rating_dist = [
+                (rating, rating_counts[rating], (rating_counts[rating] / rating_n) * 100)
+                for rating in sorted(rating_counts)
+            ]
         
         context = f"""Healthcare Provider Statistics:
 - Total Providers: {total_providers:,}
@@ -165,15 +233,10 @@ class RAGDataManager:
 Rating Distribution:
 """
         
-        if ratings:
-            from collections import Counter
-            rating_dist = Counter(ratings)
-            for rating in sorted(rating_dist.keys()):
-                count = rating_dist[rating]
-                percentage = (count / len(ratings)) * 100
-                context += f"- {rating} stars: {count} providers ({percentage:.1f}%)\n"
-        
-        return context
+        return context + "".join([
+            f"- {rating} stars: {count} providers ({percentage:.1f}%)\n"
+            for rating, count, percentage in rating_dist
+        ])
 
 
 class AutoGenCMSAgent:
@@ -186,6 +249,15 @@ class AutoGenCMSAgent:
         self.cms_agent = create_cms_agent()
         self.rag_manager = RAGDataManager(self.cms_agent)
         
+        # Keyword dispatch table, checked in priority order
+        self._handlers = (
+            (("update", "refresh"), self._handle_update),
+            (("status",), self._handle_status),
+            (("provider",), self._handle_provider),
+            (("statistics", "stats"), self._handle_statistics),
+            (("high rated", "best"), self._handle_top_rated),
+        )
+        
     async def handle_data_request(self, message: str) -> str:
         """
         Handle data requests from other AutoGen agents
@@ -198,44 +270,42 @@ class AutoGenCMSAgent:
         """
         message_lower = message.lower()
         
-        if "update" in message_lower or "refresh" in message_lower:
-            success = self.cms_agent.download_latest_data()
-            return f"Data update {'successful' if success else 'failed'}"
-        
-        elif "status" in message_lower:
-            status = self.cms_agent.get_status()
-            return f"CMS Data Status: {status['current_record_count']} records, " \
-                   f"last updated {status['data_age_hours']:.1f} hours ago"
-        
-        elif "provider" in message_lower:
-            # Extract provider ID if mentioned
-            import re
-            provider_match = re.search(r'\b\d{6}\b', message)
-            provider_id = provider_match.group() if provider_match else None
-            
-            providers = self.rag_manager.get_provider_context(
-                provider_id=provider_id,
-                limit=5
-            )
-            return self.rag_manager.format_for_llm(providers)
-        
-        elif "statistics" in message_lower or "stats" in message_lower:
-            return self.rag_manager.get_statistics_context()
+        for keywords, handler in self._handlers:
+            for keyword in keywords:
+                if keyword in message_lower:
+                    return handler(message)
         
-        elif "high rated" in message_lower or "best" in message_lower:
-            providers = self.rag_manager.get_provider_context(
-                rating_threshold=5,
-                limit=10
-            )
-            return self.rag_manager.format_for_llm(providers)
-        
-        else:
-            return """I can help with CMS healthcare provider data. Available commands:
-- 'update data' - Refresh the dataset
-- 'status' - Check data status
-- 'provider [ID]' - Get specific provider info
-- 'statistics' - Get data summary
-- 'high rated providers' - Get top-rated providers"""
+        return _HELP_TEXT
+    
+    def _handle_update(self, message: str) -> str:
+        success = self.cms_agent.download_latest_data()
+        return f"Data update {'successful' if success else 'failed'}"
+    
+    def _handle_status(self, message: str) -> str:
+        status = self.cms_agent.get_status()
+        return f"CMS Data Status: {status['current_record_count']} records, " \
+               f"last updated {status['data_age_hours']:.1f} hours ago"
+    
+    def _handle_provider(self, message: str) -> str:
+        # Extract provider ID if mentioned
+        provider_match = _CCN_RE.search(message)
+        provider_id = provider_match.group() if provider_match else None
+        
+        providers = self.rag_manager.get_provider_context(
+            provider_id=provider_id,
+            limit=5
+        )
+        return self.rag_manager.format_for_llm(providers)
+    
+    def _handle_statistics(self, message: str) -> str:
+        return self.rag_manager.get_statistics_context()
+    
+    def _handle_top_rated(self, message: str) -> str:
+        providers = self.rag_manager.get_provider_context(
+            rating_threshold=5,
+            limit=10
+        )
+        return self.rag_manager.format_for_llm(providers)
 
 
 # Integration functions for different RAG frameworks
@@ -304,12 +374,13 @@ class CMSDataService:
         
         while self.running:
             try:
-                # Check for updates
-                has_updates = self.agent.check_for_updates()
+                # Check for updates; the blocking HTTP and disk work runs in a
+                # worker thread so other coroutines on this loop keep running
+                has_updates = await asyncio.to_thread(self.agent.check_for_updates)
                 
                 if has_updates:
                     print("New CMS data detected, downloading...")
-                    success = self.agent.download_latest_data()
+                    success = await asyncio.to_thread(self.agent.download_latest_data)
                     if success:
                         print("✅ CMS data updated successfully")
                     else:
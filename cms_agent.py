@@ -8,15 +8,143 @@ automated CMS data downloading, monitoring, and updating.
 
 import os
 import json
+import asyncio
+import bisect
 import logging
-import schedule
-import time
+import tempfile
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from download_api_data import APIDataDownloader
 from cms_config import CMS_CONFIG, get_query_params, get_filename
 
+try:
+    import orjson
+    _dumps = lambda obj: orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    _loads = orjson.loads
+except ImportError:
+    _dumps = lambda obj: json.dumps(obj, indent=2).encode()
+    _loads = json.loads
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# Above this size the dataset is stream-parsed (when ijson is installed) so the
+# raw file bytes are never held in memory alongside the parsed records
+_STREAM_PARSE_BYTES = 256 * 1024 * 1024
+
+_VALID_RATINGS = frozenset(('1', '2', '3', '4', '5', ''))
+
+
+# Largest value stored in the int8 rating and int16 response-rate columns
+_MAX_RATING = 127
+_MAX_RESPONSE_RATE = 32767
+
+
+def _parse_int(value, limit: int) -> int:
+    """Parse a numeric CMS field, returning -1 for blank, non-numeric or above-limit values"""
+    try:
+        number = int(value) if value.isdecimal() else -1
+    except AttributeError:
+        return -1
+    return number if number <= limit else -1
+
+
+def _build_columns(records: List[Dict]) -> Dict[str, Any]:
+    """
+    Convert records to columns for the fields used in filtering and statistics
+    
+    One pass over the records feeds every column, so the string-to-int parsing
+    happens once per load. Non-numeric ratings and response rates, and values
+    too large for their column, are stored as -1. Columns are NumPy arrays when NumPy is installed, otherwise lists.
+    """
+    ccns, ratings, response_rates = [], [], []
+    add_ccn, add_rating, add_rate = ccns.append, ratings.append, response_rates.append
+    for r in records:
+        get = r.get
+        add_ccn(get('cms_certification_number_ccn', ''))
+        add_rating(_parse_int(get('hhcahps_survey_summary_star_rating', ''), _MAX_RATING))
+        add_rate(_parse_int(get('survey_response_rate', ''), _MAX_RESPONSE_RATE))
+    
+    if np is None:
+        return {'ccn': ccns, 'rating': ratings, 'response_rate': response_rates}
+    
+    return {
+        'ccn': np.array(ccns),
+        'rating': np.array(ratings, dtype=np.int8),
+        'response_rate': np.array(response_rates, dtype=np.int16),
+    }
+
+
+def _build_ccn_index(records: List[Dict]) -> Dict[str, List[int]]:
+    """CCN -> ascending row indices of the records for that provider"""
+    index = {}
+    for i, r in enumerate(records):
+        value = r.get('cms_certification_number_ccn')
+        if value:
+            index.setdefault(value, []).append(i)
+    return index
+
+
+def _build_rating_order(columns: Dict[str, Any]) -> Tuple[Any, Any]:
+    """
+    Rows sorted by rating, then response rate (both descending, ties in file
+    order), with the negated ratings in that order as binary-search keys
+    """
+    ratings, rates = columns['rating'], columns['response_rate']
+    if np is not None:
+        order = np.lexsort((-rates, -ratings))
+        return order, -ratings[order]
+    order = sorted(range(len(ratings)), key=lambda i: (-ratings[i], -rates[i]))
+    return order, [-ratings[i] for i in order]
+
+
+@dataclass(frozen=True)
+class DataSnapshot:
+    """
+    One loaded dataset with the columns and indexes built from it
+    
+    Every field comes from the same load, so rows stay aligned even if the
+    agent reloads or re-downloads the data while the snapshot is in use.
+    The records and derived structures are shared and must not be modified.
+    """
+    records: List[Dict]
+    columns: Dict[str, Any]
+    ccn_index: Dict[str, List[int]]
+    rating_order: Tuple[Any, Any]
+    
+    def find_provider_rows(self, ccn: str) -> List[int]:
+        """Row indices (ascending) of the records for a provider CCN"""
+        return self.ccn_index.get(ccn, [])
+    
+    def top_rated_rows(self, min_rating: int, limit: int) -> List[int]:
+        """
+        Row indices of the best rated providers, best first
+        
+        Args:
+            min_rating: Minimum star rating
+            limit: Maximum number of rows
+        """
+        order, keys = self.rating_order
+        if np is not None:
+            end = int(np.searchsorted(keys, -min_rating, side='right'))
+            return order[:end][:limit].tolist()
+        return order[:bisect.bisect_right(keys, -min_rating)][:limit]
+
 
 @dataclass
 class DataUpdateStatus:
@@ -60,6 +188,20 @@ class CMSDataAgent:
         self.auto_update = auto_update
         self.max_retries = max_retries
         
+        # File paths used on every request, resolved once
+        self._data_path = os.path.join(self.output_dir, get_filename('all_data'))
+        self._parquet_path = os.path.splitext(self._data_path)[0] + '.parquet'
+        self._status_path = os.path.join(self.output_dir, 'agent_status.json')
+        self._log_path = os.path.join(self.output_dir, 'agent.log')
+        
+        # Parsed dataset cache, keyed on the data file's (mtime_ns, size), and
+        # the snapshot built from it; replaced together under the lock because
+        # downloads run in worker threads
+        self._cache_lock = threading.Lock()
+        self._cache = None
+        self._cache_key = None
+        self._snapshot = None
+        
         # Initialize downloader
         self.downloader = APIDataDownloader(
             base_url=CMS_CONFIG['base_url'],
@@ -71,14 +213,10 @@ class CMSDataAgent:
         
         # Initialize status
         self.status = self._load_status()
-        
-        # Setup scheduler if auto_update is enabled
-        if self.auto_update:
-            self._setup_scheduler()
     
     def _setup_logging(self):
         """Setup agent-specific logging"""
-        log_file = os.path.join(self.output_dir, 'agent.log')
+        log_file = self._log_path
         os.makedirs(self.output_dir, exist_ok=True)
         
         # Create agent logger
@@ -94,19 +232,14 @@ class CMSDataAgent:
             handler.setFormatter(formatter)
             self.logger.addHandler(handler)
     
-    def _setup_scheduler(self):
-        """Setup automatic data checking schedule"""
-        schedule.every(self.check_interval_hours).hours.do(self._scheduled_check)
-        self.logger.info(f"Scheduled data checks every {self.check_interval_hours} hours")
-    
     def _load_status(self) -> DataUpdateStatus:
         """Load previous status or create new one"""
-        status_file = os.path.join(self.output_dir, 'agent_status.json')
+        status_file = self._status_path
         
         if os.path.exists(status_file):
             try:
-                with open(status_file, 'r') as f:
-                    data = json.load(f)
+                with open(status_file, 'rb') as f:
+                    data = _loads(f.read())
                 return DataUpdateStatus(
                     last_check=datetime.fromisoformat(data['last_check']),
                     last_update=datetime.fromisoformat(data['last_update']),
@@ -129,7 +262,7 @@ class CMSDataAgent:
     
     def _save_status(self):
         """Save current status to file"""
-        status_file = os.path.join(self.output_dir, 'agent_status.json')
+        status_file = self._status_path
         
         status_data = {
             'last_check': self.status.last_check.isoformat(),
@@ -140,8 +273,17 @@ class CMSDataAgent:
             'last_error': self.status.last_error
         }
         
-        with open(status_file, 'w') as f:
-            json.dump(status_data, f, indent=2)
+        # Write a uniquely named temp file and rename it over the old one, so a
+        # crash mid-write can never leave a truncated status file behind and
+        # concurrent saves never share a temp file
+        fd, tmp_file = tempfile.mkstemp(dir=self.output_dir, prefix='agent_status.json.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_dumps(status_data))
+            os.replace(tmp_file, status_file)
+        except BaseException:
+            os.unlink(tmp_file)
+            raise
     
     def check_for_updates(self) -> bool:
         """
@@ -153,27 +295,17 @@ class CMSDataAgent:
         self.logger.info("Checking for data updates...")
         
         try:
-            # Get current record count from API
+            # Get current record count from API, straight from the response
             params = get_query_params('count_records')
-            success = self.downloader.download_json_data(
-                'sql', 'temp_count.json', params=params
-            )
+            count_data = self.downloader.fetch_json('sql', params=params)
             
-            if not success:
+            if count_data is None:
                 self.status.last_error = "Failed to check record count"
                 self._save_status()
                 return False
             
-            # Read the count
-            count_file = os.path.join(self.output_dir, 'temp_count.json')
-            with open(count_file, 'r') as f:
-                count_data = json.load(f)
-            
             new_count = int(count_data[0]['expression'])
             
-            # Clean up temp file
-            os.remove(count_file)
-            
             # Update status
             self.status.previous_record_count = self.status.current_record_count
             self.status.current_record_count = new_count
@@ -218,9 +350,13 @@ class CMSDataAgent:
             params = get_query_params('all_data')
             filename = get_filename('all_data')
             
-            success = self.downloader.download_json_data('sql', filename, params=params)
+            success = self.downloader.download_json_data('sql', filename, params=params, streaming=True)
             
             if success:
+                with self._cache_lock:
+                    self._cache = None
+                    self._snapshot = None
+                self._write_parquet()
                 self.status.last_update = datetime.now()
                 self.status.update_available = False
                 self.status.last_error = None
@@ -242,17 +378,17 @@ class CMSDataAgent:
             self._save_status()
             return False
     
-    def get_latest_data(self, max_age_hours: int = 24) -> Optional[List[Dict]]:
+    def _ensure_data_file(self, max_age_hours: int) -> Optional[str]:
         """
-        Get the latest data, downloading if necessary
+        Make sure a sufficiently fresh data file exists, downloading if necessary
         
         Args:
             max_age_hours: Maximum age of data before forcing update
             
         Returns:
-            List of data records or None if unavailable
+            Path to the data file or None if unavailable
         """
-        data_file = os.path.join(self.output_dir, get_filename('all_data'))
+        data_file = self._data_path
         
         # Check if we need to update data
         needs_update = False
@@ -272,16 +408,207 @@ class CMSDataAgent:
                 if not self.download_latest_data():
                     return None
         
-        # Load and return data
+        return data_file
+    
+    def get_latest_data(self, max_age_hours: int = 24) -> Optional[List[Dict]]:
+        """
+        Get the latest data, downloading if necessary
+        
+        Args:
+            max_age_hours: Maximum age of data before forcing update
+            
+        Returns:
+            List of data records or None if unavailable.
+            The list is shared between calls and must not be modified.
+        """
+        data_file = self._ensure_data_file(max_age_hours)
+        if data_file is None:
+            return None
+        
+        # Load and return data, reusing the parsed copy while the file is unchanged
         try:
-            with open(data_file, 'r') as f:
-                data = json.load(f)
+            st = os.stat(data_file)
+            cached = self._cached_data(st)
+            if cached is not None:
+                return cached
+            
+            if self._parquet_is_current(st):
+                data = pq.read_table(self._parquet_path).to_pylist()
+            elif ijson is not None and st.st_size > _STREAM_PARSE_BYTES:
+                data = list(self._iter_records(data_file))
+            else:
+                with open(data_file, 'rb') as f:
+                    data = _loads(f.read())
             self.logger.info(f"Loaded {len(data)} records from local file")
+            with self._cache_lock:
+                self._cache = data
+                self._cache_key = (st.st_mtime_ns, st.st_size)
+                self._snapshot = None
             return data
         except Exception as e:
             self.logger.error(f"Error loading data: {e}")
             return None
     
+    def _parquet_is_current(self, st: os.stat_result) -> bool:
+        """Check whether a Parquet copy at least as new as the JSON file (st) exists"""
+        if pq is None:
+            return False
+        try:
+            return os.stat(self._parquet_path).st_mtime_ns >= st.st_mtime_ns
+        except OSError:
+            return False
+    
+    def _write_parquet(self):
+        """
+        Transcode a downloaded JSON dataset to a zstd-compressed Parquet copy
+        
+        JSON stays the canonical format; the Parquet copy only speeds up reloads.
+        It is written only when every record has the same keys, in the same
+        order, with string or null values, so reading it back gives exactly the
+        records the JSON file holds.
+        """
+        if pq is None:
+            return
+        
+        try:
+            with open(self._data_path, 'rb') as f:
+                data = _loads(f.read())
+            
+            keys = tuple(data[0]) if data and isinstance(data[0], dict) else None
+            uniform = keys is not None and all(
+                isinstance(record, dict)
+                and tuple(record) == keys
+                and all(value is None or isinstance(value, str) for value in record.values())
+                for record in data
+            )
+            if not uniform:
+                # An older copy would be stale; reloads fall back to the JSON file
+                if os.path.exists(self._parquet_path):
+                    os.remove(self._parquet_path)
+                return
+            
+            schema = pa.schema([(key, pa.string()) for key in keys])
+            pq.write_table(
+                pa.Table.from_pylist(data, schema=schema),
+                self._parquet_path,
+                compression='zstd'
+            )
+        except Exception as e:
+            self.logger.warning(f"Could not write Parquet copy of {self._data_path}: {e}")
+    
+    def _cached_data(self, st: os.stat_result) -> Optional[List[Dict]]:
+        """Return the cached dataset if it was parsed from the file described by st"""
+        with self._cache_lock:
+            if self._cache is not None and self._cache_key == (st.st_mtime_ns, st.st_size):
+                return self._cache
+        return None
+    
+    def get_snapshot(self, max_age_hours: int = 24) -> Optional[DataSnapshot]:
+        """
+        Get the latest data together with its columns and indexes
+        
+        Use this instead of separate get_latest_data / get_columns /
+        find_provider_rows calls when the results are combined, since a
+        download in another thread can replace the data between those calls.
+        
+        Args:
+            max_age_hours: Maximum age of data before forcing update
+            
+        Returns:
+            DataSnapshot of one load, or None if no data is available
+        """
+        data = self.get_latest_data(max_age_hours)
+        if data is None:
+            return None
+        return self._snapshot_of(data)
+    
+    def _snapshot_of(self, data: List[Dict]) -> DataSnapshot:
+        """Snapshot for a loaded record list, built once per load"""
+        with self._cache_lock:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.records is data:
+                return snapshot
+            columns = _build_columns(data)
+            snapshot = DataSnapshot(data, columns, _build_ccn_index(data), _build_rating_order(columns))
+            # Only cache it if no reload or download replaced the data meanwhile
+            if self._cache is data:
+                self._snapshot = snapshot
+            return snapshot
+    
+    def _current_snapshot(self) -> Optional[DataSnapshot]:
+        """Snapshot of the dataset last returned by get_latest_data, if any"""
+        data = self._cache
+        return None if data is None else self._snapshot_of(data)
+    
+    def get_columns(self) -> Optional[Dict[str, Any]]:
+        """
+        Get a column-oriented view of the dataset last returned by get_latest_data
+        
+        Returns:
+            Dict of 'ccn', 'rating' and 'response_rate' columns aligned with the
+            record list (see _build_columns), or None if nothing is loaded
+        """
+        snapshot = self._current_snapshot()
+        return None if snapshot is None else snapshot.columns
+    
+    def find_provider_rows(self, ccn: str) -> List[int]:
+        """
+        Find a provider in the dataset last returned by get_latest_data
+        
+        A CCN -> row-index hash table is built once per load, so lookups are O(1).
+        
+        Args:
+            ccn: Provider CMS certification number
+            
+        Returns:
+            Row indices (ascending) of matching records; must not be modified
+        """
+        snapshot = self._current_snapshot()
+        return [] if snapshot is None else snapshot.find_provider_rows(ccn)
+    
+    def top_rated_rows(self, min_rating: int, limit: int) -> List[int]:
+        """
+        Find the best rated providers in the dataset last returned by get_latest_data
+        
+        Rows are sorted once per load by rating, then response rate (both
+        descending, ties in file order), so each query is a binary search
+        plus a slice.
+        
+        Args:
+            min_rating: Minimum star rating
+            limit: Maximum number of rows
+            
+        Returns:
+            Row indices of matching records, best first
+        """
+        snapshot = self._current_snapshot()
+        return [] if snapshot is None else snapshot.top_rated_rows(min_rating, limit)
+    
+    def iter_latest_data(self, max_age_hours: int = 24) -> Optional[Iterator[Dict]]:
+        """
+        Stream the latest data record by record, downloading if necessary
+        
+        Uses ijson when installed so the full dataset is never held in memory.
+        
+        Args:
+            max_age_hours: Maximum age of data before forcing update
+            
+        Returns:
+            Iterator over data records or None if unavailable
+        """
+        data_file = self._ensure_data_file(max_age_hours)
+        if data_file is None:
+            return None
+        return self._iter_records(data_file)
+    
+    def _iter_records(self, data_file: str) -> Iterator[Dict]:
+        """Yield records from a JSON array file"""
+        with open(data_file, 'rb') as f:
+            if ijson is not None:
+                yield from ijson.items(f, 'item')
+            else:
+                yield from _loads(f.read())
+    
     def _scheduled_check(self):
         """Scheduled check for updates"""
         self.logger.info("Running scheduled data check...")
@@ -289,13 +616,18 @@ class CMSDataAgent:
         if self.check_for_updates() and self.auto_update:
             self.download_latest_data()
     
-    def run_scheduler(self):
-        """Run the scheduler (blocking call)"""
+    async def run(self):
+        """Run scheduled data checks forever, sleeping between them on the event loop"""
         self.logger.info("Starting CMS Data Agent scheduler...")
+        self.logger.info(f"Scheduled data checks every {self.check_interval_hours} hours")
         
         while True:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
+            await asyncio.sleep(self.check_interval_hours * 3600)
+            await asyncio.to_thread(self._scheduled_check)
+    
+    def run_scheduler(self):
+        """Run the scheduler (blocking call)"""
+        asyncio.run(self.run())
     
     def get_status(self) -> Dict[str, Any]:
         """Get current agent status"""
@@ -316,34 +648,46 @@ class CMSDataAgent:
         Returns:
             Dict with validation results
         """
-        data_file = os.path.join(self.output_dir, get_filename('all_data'))
+        data_file = self._data_path
         
         if not os.path.exists(data_file):
             return {'valid': False, 'error': 'Data file not found'}
         
         try:
-            with open(data_file, 'r') as f:
-                data = json.load(f)
+            # Validate in a single pass, streaming the file unless it is already cached
+            st = os.stat(data_file)
+            records = self._cached_data(st)
+            if records is None:
+                records = self._iter_records(data_file)
             
-            # Basic validation
-            record_count = len(data)
-            has_required_fields = all(
-                'cms_certification_number_ccn' in record and
-                'hhcahps_survey_summary_star_rating' in record
-                for record in data[:10]  # Check first 10 records
-            )
+            record_count = 0
+            has_required_fields = True
+            valid_ratings = True
+            providers = set()
             
-            # Star rating validation
-            ratings = [r.get('hhcahps_survey_summary_star_rating', '') for r in data if r.get('hhcahps_survey_summary_star_rating')]
-            valid_ratings = all(r in ['1', '2', '3', '4', '5', ''] for r in ratings)
+            for record in records:
+                # Basic validation
+                if record_count < 10:  # Check first 10 records
+                    has_required_fields = has_required_fields and (
+                        'cms_certification_number_ccn' in record and
+                        'hhcahps_survey_summary_star_rating' in record
+                    )
+                
+                # Star rating validation
+                rating = record.get('hhcahps_survey_summary_star_rating')
+                if rating and rating not in _VALID_RATINGS:
+                    valid_ratings = False
+                
+                providers.add(record.get('cms_certification_number_ccn', ''))
+                record_count += 1
             
             return {
                 'valid': True,
                 'record_count': record_count,
                 'has_required_fields': has_required_fields,
                 'valid_ratings': valid_ratings,
-                'unique_providers': len(set(r.get('cms_certification_number_ccn', '') for r in data)),
-                'file_size_mb': os.path.getsize(data_file) / (1024 * 1024)
+                'unique_providers': len(providers),
+                'file_size_mb': st.st_size / (1024 * 1024)
             }
             
         except Exception as e:
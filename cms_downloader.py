@@ -7,75 +7,298 @@ Specialized script for downloading data from CMS.gov Provider Data API
 
 import os
 import sys
-from download_api_data import APIDataDownloader
+import time
+import hashlib
+import random
+import asyncio
+from typing import Optional
+from download_api_data import APIDataDownloader, load_validators, validator_key, write_meta_sidecar
 from cms_config import CMS_CONFIG, get_query_params, get_filename, QUERIES
 
+# httpx drives the concurrent downloads; without it queries are fetched one
+# at a time through APIDataDownloader (requests)
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import ijson
+    _JSON_ERRORS = (ValueError, ijson.JSONError)
+except ImportError:
+    ijson = None
+    _JSON_ERRORS = (ValueError,)
+
+# httpx speaks HTTP/2 when the h2 package is installed (httpx[http2]); all
+# concurrent queries are then multiplexed over a single connection
+try:
+    import h2  # noqa: F401
+    _HTTP2 = httpx is not None
+except ImportError:
+    _HTTP2 = False
+
+# Connection pool shared by all queries in one download run
+_MAX_CONNECTIONS = 8
+_REQUEST_TIMEOUT = 30.0
+_CHUNK_SIZE = 64 * 1024
+
+# Politeness limits towards the CMS API
+_MAX_CONCURRENT = 10
+_MAX_RETRIES = 4
+_MAX_BACKOFF = 60.0
+_RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+
+def _retry_delay(attempt: int, response: 'httpx.Response' = None) -> float:
+    """Seconds to wait before retrying: the server's Retry-After, else exponential backoff with jitter"""
+    if response is not None:
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return min(_MAX_BACKOFF, float(retry_after))
+    return min(_MAX_BACKOFF, 2 ** attempt + random.random())
+
+def _rate_limit_pause(response: 'httpx.Response') -> float:
+    """Seconds to hold the request slot when the server reports an exhausted rate limit"""
+    if response.headers.get('X-RateLimit-Remaining') != '0':
+        return 0.0
+    try:
+        reset = float(response.headers.get('X-RateLimit-Reset', ''))
+    except ValueError:
+        return 1.0
+    if reset > 1e9:  # Epoch timestamp rather than seconds remaining
+        reset -= time.time()
+    return min(_MAX_BACKOFF, max(0.0, reset))
+
+
+async def _stream_to_file(response: 'httpx.Response', filepath: str) -> int:
+    """
+    Stream a JSON array response body to disk chunk by chunk
+    
+    The body is written to a .part file and renamed into place once complete,
+    so a failed download never replaces a good file. When ijson is installed
+    the chunks are also fed to an incremental parser, which validates the
+    JSON and counts records without holding the payload in memory. The bytes
+    are hashed on the way through and recorded with the count in the file's
+    .meta.json sidecar.
+    
+    Returns:
+        Number of records, or -1 if not counted
+    """
+    records = None
+    counter = None
+    if ijson is not None:
+        records = ijson.sendable_list()
+        counter = ijson.items_coro(records, 'item')
+    count = 0
+    digest = hashlib.sha256()
+    
+    def consume(f, chunk: bytes):
+        nonlocal count
+        f.write(chunk)
+        digest.update(chunk)
+        if counter is not None:
+            counter.send(chunk)
+            count += len(records)
+            del records[:]
+    
+    def finish():
+        nonlocal count
+        if counter is not None:
+            counter.close()
+            count += len(records)
+        os.replace(tmp_path, filepath)
+        if counter is None:
+            count = -1
+        write_meta_sidecar(filepath, count if count >= 0 else None, digest.hexdigest())
+    
+    # File I/O, hashing and parsing run in a worker thread so a large body
+    # does not stall the other downloads sharing the event loop
+    tmp_path = filepath + '.part'
+    try:
+        f = await asyncio.to_thread(open, tmp_path, 'wb')
+        try:
+            async for chunk in response.aiter_bytes(_CHUNK_SIZE):
+                await asyncio.to_thread(consume, f, chunk)
+        finally:
+            await asyncio.to_thread(f.close)
+        await asyncio.to_thread(finish)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    
+    return count
+
+async def _download_one(client: 'httpx.AsyncClient', downloader: APIDataDownloader,
+                        semaphore: asyncio.Semaphore, params: dict, filename: str) -> bool:
+    """
+    Download a single CMS query and stream it to disk as JSON
+    
+    Transient failures (connection errors, 429 and 5xx responses) are retried
+    with exponential backoff; at most one request per semaphore slot is in flight.
+    When the downloader's validator store holds an ETag/Last-Modified for the
+    existing file, the request is conditional and a 304 reply leaves the file
+    untouched. Entries are shared with APIDataDownloader.download_json_data.
+    
+    Args:
+        client: Shared async HTTP client
+        downloader: Downloader providing the output directory, logger and
+            validator store
+        semaphore: Limits concurrent requests to the CMS API
+        params: Query parameters
+        filename: Output filename
+        
+    Returns:
+        bool: Success status
+    """
+    logger = downloader.logger
+    filepath = os.path.join(downloader.output_dir, filename)
+    key = downloader._validator_key('sql', params, '.json')
+    headers, _ = downloader._conditional_headers(key, filepath, filename)
+    try:
+        async with semaphore:
+            for attempt in range(_MAX_RETRIES):
+                logger.info(f"Downloading JSON data from: {client.base_url}sql")
+                request = client.build_request('GET', 'sql', params=params, headers=headers)
+                try:
+                    response = await client.send(request, stream=True)
+                except httpx.TransportError as e:
+                    error, delay = e, _retry_delay(attempt)
+                else:
+                    if response.status_code not in _RETRY_STATUSES:
+                        break
+                    await response.aclose()
+                    error, delay = f"HTTP {response.status_code}", _retry_delay(attempt, response)
+                
+                if attempt + 1 < _MAX_RETRIES:
+                    logger.warning(f"Retrying {filename} in {delay:.1f}s ({error})")
+                    await asyncio.sleep(delay)
+            else:
+                logger.error(f"Giving up on {filename} after {_MAX_RETRIES} attempts: {error}")
+                print(f"❌ Failed to download: {filename}")
+                return False
+            
+            if response.status_code == 304:
+                await response.aclose()
+                logger.info(f"Not modified since last download: {filepath}")
+                await asyncio.to_thread(downloader._record_validators, key, None, response.headers)
+                print(f"✅ Already up to date: {filename}")
+                return True
+            
+            try:
+                response.raise_for_status()
+                record_count = await _stream_to_file(response, filepath)
+            finally:
+                await response.aclose()
+            await asyncio.to_thread(downloader._record_validators, key, filepath, response.headers)
+            
+            # Back off while holding the slot if the server's budget is spent
+            pause = _rate_limit_pause(response)
+            if pause:
+                logger.info(f"Rate limit reached, pausing {pause:.1f}s")
+                await asyncio.sleep(pause)
+        
+        logger.info(f"Successfully saved JSON data to: {filepath}")
+        logger.info(f"Records downloaded: {record_count if record_count >= 0 else 'N/A'}")
+        print(f"✅ Successfully downloaded: {filename}")
+        return True
+        
+    except httpx.HTTPError as e:
+        logger.error(f"Request error: {e}")
+        print(f"❌ Failed to download: {filename}")
+        return False
+    except _JSON_ERRORS as e:
+        logger.error(f"JSON decode error: {e}")
+        print(f"❌ Failed to download: {filename}")
+        return False
+
 def download_cms_data(query_types=None, custom_queries=None):
     """
     Download data from CMS.gov API
     
+    Blocking wrapper around download_cms_data_async for scripts; code already
+    running in an event loop should await download_cms_data_async instead.
+    
     Args:
         query_types: List of predefined query types to download
         custom_queries: Dict of custom queries {filename: query_string}
+        
+    Returns:
+        (successful downloads, total downloads)
+    """
+    return asyncio.run(download_cms_data_async(query_types, custom_queries))
+
+async def download_cms_data_async(query_types=None, custom_queries=None):
     """
+    Download data from CMS.gov API
     
-    # Initialize downloader
-    downloader = APIDataDownloader(
-        base_url=CMS_CONFIG['base_url'],
-        output_dir=CMS_CONFIG['output_dir']
-    )
+    All queries run concurrently over one pooled, keep-alive HTTP client
+    (HTTP/2 when h2 is installed). Without httpx they are downloaded one
+    after another with APIDataDownloader in a worker thread.
+    
+    Args:
+        query_types: List of predefined query types to download
+        custom_queries: Dict of custom queries {filename: query_string}
+        
+    Returns:
+        (successful downloads, total downloads)
+    """
     
     print("🏥 Starting CMS.gov Provider Data download...")
     print(f"📁 Output directory: {CMS_CONFIG['output_dir']}")
     print(f"🆔 Dataset ID: {CMS_CONFIG['dataset_id']}")
     print("-" * 60)
     
-    success_count = 0
-    total_downloads = 0
+    jobs = []
     
-    # Download predefined query types
+    # Predefined query types
     if query_types:
         for query_type in query_types:
             if query_type not in QUERIES:
                 print(f"❌ Unknown query type: {query_type}")
                 continue
                 
-            total_downloads += 1
             print(f"📥 Downloading {query_type}...")
-            
-            try:
-                params = get_query_params(query_type)
-                filename = get_filename(query_type)
-                
-                if downloader.download_json_data('sql', filename, params=params):
-                    success_count += 1
-                    print(f"✅ Successfully downloaded: {filename}")
-                else:
-                    print(f"❌ Failed to download: {filename}")
-                    
-            except Exception as e:
-                print(f"❌ Error downloading {query_type}: {e}")
+            jobs.append((get_query_params(query_type), get_filename(query_type)))
     
-    # Download custom queries
+    # Custom queries
     if custom_queries:
         for filename, query in custom_queries.items():
-            total_downloads += 1
             print(f"📥 Downloading custom query to {filename}...")
-            
-            try:
-                params = {
-                    'query': query,
-                    **CMS_CONFIG['default_params']
-                }
-                
-                if downloader.download_json_data('sql', filename, params=params):
-                    success_count += 1
-                    print(f"✅ Successfully downloaded: {filename}")
-                else:
-                    print(f"❌ Failed to download: {filename}")
-                    
-            except Exception as e:
-                print(f"❌ Error downloading custom query: {e}")
+            params = {
+                'query': query,
+                **CMS_CONFIG['default_params']
+            }
+            jobs.append((params, filename))
+    
+    # Initialize downloader (output directory, logging and validator store)
+    downloader = APIDataDownloader(
+        base_url=CMS_CONFIG['base_url'],
+        output_dir=CMS_CONFIG['output_dir']
+    )
+    try:
+        if httpx is None:
+            results = []
+            for params, filename in jobs:
+                success = await asyncio.to_thread(
+                    downloader.download_json_data, 'sql', filename, params=params, streaming=True
+                )
+                print(f"✅ Successfully downloaded: {filename}" if success else f"❌ Failed to download: {filename}")
+                results.append(success)
+        else:
+            limits = httpx.Limits(max_connections=_MAX_CONNECTIONS, max_keepalive_connections=_MAX_CONNECTIONS)
+            semaphore = asyncio.Semaphore(_MAX_CONCURRENT)
+            async with httpx.AsyncClient(base_url=CMS_CONFIG['base_url'], limits=limits,
+                                         timeout=_REQUEST_TIMEOUT, http2=_HTTP2) as client:
+                results = await asyncio.gather(*[
+                    _download_one(client, downloader, semaphore, params, filename)
+                    for params, filename in jobs
+                ])
+    finally:
+        downloader.close()
+    
+    success_count = sum(results)
+    total_downloads = len(jobs)
     
     print("-" * 60)
     print(f"✅ Download completed: {success_count}/{total_downloads} successful")
@@ -84,6 +307,52 @@ def download_cms_data(query_types=None, custom_queries=None):
     
     return success_count, total_downloads
 
+async def check_remote_changed(query_type: str = 'all_data') -> Optional[bool]:
+    """
+    Ask the CMS API whether a previously downloaded query has changed
+    
+    Sends a HEAD request carrying the validators stored by the last download of
+    the query (by download_cms_data or APIDataDownloader.download_json_data), so
+    no body is transferred.
+    
+    Args:
+        query_type: Predefined query type to check
+        
+    Returns:
+        False if the server confirms the local copy is current, True if it has
+        changed, or None if there is nothing to compare against, httpx is not
+        installed or the check failed
+    """
+    if httpx is None:
+        return None
+    params = get_query_params(query_type)
+    key = validator_key(CMS_CONFIG['base_url'], 'sql', params, '.json')
+    stored = load_validators(CMS_CONFIG['output_dir']).get(key)
+    if not stored or not os.path.exists(stored.get('file', '')):
+        return None
+    headers = {}
+    if stored.get('etag'):
+        headers['If-None-Match'] = stored['etag']
+    if stored.get('last_modified'):
+        headers['If-Modified-Since'] = stored['last_modified']
+    if not headers:
+        return None
+    
+    try:
+        async with httpx.AsyncClient(base_url=CMS_CONFIG['base_url'], timeout=_REQUEST_TIMEOUT,
+                                     http2=_HTTP2) as client:
+            response = await client.head('sql', params=params, headers=headers)
+    except httpx.HTTPError:
+        return None
+    
+    if response.status_code == 304:
+        return False
+    if response.status_code != 200:
+        return None
+    if stored.get('etag') and response.headers.get('ETag') == stored['etag']:
+        return False
+    return True
+
 def main():
     """Main function with different download options"""
     
@@ -3,13 +3,27 @@ FastAPI backend for CMS Data Agent Dashboard
 Provides REST API endpoints for the web dashboard
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
+import asyncio
+import hashlib
+import heapq
 import json
+import mmap
 import os
+import re
 import sys
+import tempfile
+import threading
+import time
+import uuid
+from array import array
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 import logging
 from pathlib import Path
@@ -24,6 +38,43 @@ except ImportError as e:
     print(f"Warning: Could not import agent modules: {e}")
     print("Running in demo mode without live agent integration")
 
+try:
+    from cms_downloader import check_remote_changed
+except ImportError:
+    check_remote_changed = None
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as _DefaultResponse
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    _DefaultResponse = JSONResponse
+    _dumps = lambda obj: json.dumps(obj, separators=(',', ':')).encode()
+    _loads = json.loads
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -31,22 +82,153 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="CMS Data Agent API",
     description="REST API for CMS Healthcare Provider Data Agent Dashboard",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=_DefaultResponse
 )
 
 # Configure CORS for web dashboard
+# Set DASHBOARD_CORS_ORIGINS to a comma-separated list of origins in production;
+# preflight responses are cacheable by the browser for a day.
+_CORS_ORIGINS = [o.strip() for o in os.getenv("DASHBOARD_CORS_ORIGINS", "*").split(",") if o.strip()]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, specify your domain
+    allow_origins=_CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,
 )
 
+# Compress larger JSON responses (records pages, insights) on the wire
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Global agent instance
 agent = None
 demo_mode = False
 
+# Computed endpoint results, keyed on the (path, mtime_ns, size) of their source files.
+# The data only changes after a download, so repeated polls are served from memory.
+_RESULT_CACHE: Dict[str, tuple] = {}
+
+# With watchdog installed, file keys under the data directory are remembered
+# until the observer reports a change, so polling endpoints stop issuing stat()
+# calls per request. Without it every lookup stats the file.
+_DATA_DIR = Path("cms_data")
+_WATCHED_KEYS: Dict[str, Optional[tuple]] = {}
+_watch_generation = 0
+# Guards _WATCHED_KEYS and _watch_generation, which the observer thread updates
+# while request handlers read them from the executor threads
+_watch_lock = threading.Lock()
+_observer = None
+
+class _DataDirHandler(FileSystemEventHandler):
+    """Forget remembered file keys for paths the observer reports as changed"""
+    
+    def on_any_event(self, event):
+        global _watch_generation
+        paths = [
+            os.path.abspath(os.fsdecode(path))
+            for path in (event.src_path, getattr(event, 'dest_path', None))
+            if path
+        ]
+        with _watch_lock:
+            _watch_generation += 1
+            for path in paths:
+                _WATCHED_KEYS.pop(path, None)
+
+def _start_data_watcher():
+    """Watch the data directory for changes if watchdog is available"""
+    global _observer
+    if Observer is None or not _DATA_DIR.is_dir():
+        return
+    _observer = Observer()
+    _observer.schedule(_DataDirHandler(), str(_DATA_DIR), recursive=False)
+    _observer.daemon = True
+    _observer.start()
+
+def _file_key(path: Path) -> Optional[tuple]:
+    """Identity of a file version, or None if it does not exist"""
+    watched = None
+    if _observer is not None:
+        watched = os.path.abspath(path)
+        if os.path.dirname(watched) != os.path.abspath(_DATA_DIR):
+            watched = None
+        else:
+            with _watch_lock:
+                if watched in _WATCHED_KEYS:
+                    return _WATCHED_KEYS[watched]
+                generation = _watch_generation
+    
+    try:
+        st = path.stat()
+        key = (str(path), st.st_mtime_ns, st.st_size)
+    except OSError:
+        key = None
+    
+    # Only remember the result if no change event raced with the stat
+    if watched is not None:
+        with _watch_lock:
+            if generation == _watch_generation:
+                _WATCHED_KEYS[watched] = key
+    return key
+
+def _etag_for(*parts) -> str:
+    """Build a strong ETag from file keys and any extra version parts"""
+    tokens = []
+    for part in parts:
+        if isinstance(part, tuple):
+            tokens.append(f"{part[1]:x}-{part[2]:x}")
+        else:
+            tokens.append(str(part))
+    return '"' + "-".join(tokens) + '"'
+
+def _not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """Set the ETag header and return a 304 response if the client copy is current"""
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
+
+def _cached_result(name: str, key: tuple, compute):
+    """Return the cached result for name if its key matches, otherwise recompute it"""
+    cached = _RESULT_CACHE.get(name)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    result = compute()
+    _RESULT_CACHE[name] = (key, result)
+    return result
+
+def _read_json(path: Path) -> Any:
+    """Parse a JSON file; blocking, so handlers call it through asyncio.to_thread"""
+    with open(path, 'rb') as f:
+        return _loads(f.read())
+
+def _current_meta(data_file: Path) -> Optional[Dict[str, Any]]:
+    """
+    Read the downloader's .meta.json sidecar for a data file
+    
+    Returns:
+        The metadata dict, or None if it is missing or describes an older file version
+    """
+    key = _file_key(data_file)
+    if key is None:
+        return None
+    try:
+        meta = _read_json(data_file.with_suffix('.meta.json'))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(meta, dict) or (meta.get('mtime_ns'), meta.get('size')) != key[1:]:
+        return None
+    return meta
+
+def _sha256_file(path: Path, block: int = 1 << 20) -> str:
+    """Hex SHA-256 digest of a file, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(block), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 def init_agent():
     """Initialize the CMS agent if available"""
     global agent, demo_mode
@@ -62,8 +244,17 @@ def init_agent():
 @app.on_event("startup")
 async def startup_event():
     """Initialize the agent on startup"""
+    # File parsing and agent calls run in this pool so they never block the event loop
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=8))
+    _start_data_watcher()
     init_agent()
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the data directory watcher"""
+    if _observer is not None:
+        _observer.stop()
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -84,9 +275,8 @@ async def get_agent_status():
         
         # Get real agent status
         status_file = Path("cms_data/agent_status.json")
-        if status_file.exists():
-            with open(status_file, 'r') as f:
-                status_data = json.load(f)
+        if _file_key(status_file) is not None:
+            status_data = await asyncio.to_thread(_read_json, status_file)
         else:
             status_data = {"status": "unknown", "last_seen": None}
         
@@ -101,7 +291,7 @@ async def get_agent_status():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/data/stats")
-async def get_data_stats():
+async def get_data_stats(request: Request, response: Response):
     """Get data statistics"""
     try:
         if demo_mode or agent is None:
@@ -111,29 +301,73 @@ async def get_data_stats():
         cms_data_file = Path("cms_data/cms_full_dataset.json")
         record_count_file = Path("cms_data/cms_record_count.json")
         
-        stats = {
-            "record_count": 0,
-            "data_size": 0,
-            "last_update": None
-        }
-        
-        if cms_data_file.exists():
-            stats["data_size"] = cms_data_file.stat().st_size
-            stats["last_update"] = datetime.fromtimestamp(
-                cms_data_file.stat().st_mtime
-            ).isoformat()
+        meta_file = cms_data_file.with_suffix('.meta.json')
+        key = await asyncio.to_thread(
+            lambda: (_file_key(cms_data_file), _file_key(record_count_file), _file_key(meta_file))
+        )
+        not_modified = _not_modified(request, response, _etag_for(*key))
+        if not_modified:
+            return not_modified
         
-        if record_count_file.exists():
-            with open(record_count_file, 'r') as f:
-                count_data = json.load(f)
-                stats["record_count"] = count_data.get("total_records", 0)
-        
-        return stats
+        return await asyncio.to_thread(
+            _cached_result, "stats", key, lambda: _compute_data_stats(key, cms_data_file, record_count_file)
+        )
         
     except Exception as e:
         logger.error(f"Error getting data stats: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _compute_data_stats(key: tuple, cms_data_file: Path, record_count_file: Path) -> Dict[str, Any]:
+    """Build the data statistics payload from the current file versions"""
+    data_key, count_key, _ = key
+    stats = {
+        "record_count": 0,
+        "data_size": 0,
+        "last_update": None
+    }
+    
+    if data_key is not None:
+        stats["data_size"] = data_key[2]
+        stats["last_update"] = datetime.fromtimestamp(data_key[1] / 1e9).isoformat()
+    
+    # Prefer the downloader's metadata sidecar; fall back to the API count file
+    meta = _current_meta(cms_data_file)
+    if meta is not None and meta.get("record_count") is not None:
+        stats["record_count"] = meta["record_count"]
+    elif count_key is not None:
+        count_data = _read_json(record_count_file)
+        stats["record_count"] = count_data.get("total_records", 0)
+    
+    return stats
+
+def _tail_lines(path: Path, n: int, block: int = 8192) -> List[str]:
+    """
+    Read the last n lines of a file by seeking backwards from the end
+    
+    Args:
+        path: File to read
+        n: Number of lines to return
+        block: Bytes read per backwards step
+        
+    Returns:
+        Up to n decoded lines, oldest first
+    """
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        buf = b''
+        # One extra newline guarantees the first kept line is complete
+        while position > 0 and buf.count(b'\n') <= n:
+            step = min(block, position)
+            position -= step
+            f.seek(position)
+            buf = f.read(step) + buf
+    
+    lines = buf.split(b'\n')
+    if lines and not lines[-1]:
+        lines.pop()
+    return [line.decode() for line in lines[-n:]]
+
 @app.get("/api/activity")
 async def get_recent_activity():
     """Get recent agent activity"""
@@ -147,11 +381,8 @@ async def get_recent_activity():
         
         if log_file.exists():
             try:
-                with open(log_file, 'r') as f:
-                    lines = f.readlines()
-                    
                 # Parse last 10 log entries
-                for line in lines[-10:]:
+                for line in await asyncio.to_thread(_tail_lines, log_file, 10):
                     if line.strip():
                         # Simple log parsing - adapt based on your log format
                         parts = line.strip().split(' - ', 2)
@@ -184,7 +415,7 @@ async def get_recent_activity():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/data/quality")
-async def get_data_quality():
+async def get_data_quality(request: Request, response: Response):
     """Get data quality metrics"""
     try:
         if demo_mode or agent is None:
@@ -193,25 +424,34 @@ async def get_data_quality():
         # Calculate real data quality metrics
         cms_data_file = Path("cms_data/cms_full_dataset.json")
         
-        if not cms_data_file.exists():
+        key = await asyncio.to_thread(_file_key, cms_data_file)
+        if key is None:
             return {"completeness": 0, "validity": 0, "freshness": 0}
         
-        quality = {"completeness": 100, "validity": 100, "freshness": 100}
+        # Freshness depends on the file age in whole days, so that is part of the version
+        file_age = datetime.now() - datetime.fromtimestamp(key[1] / 1e9)
+        not_modified = _not_modified(request, response, _etag_for(key, file_age.days))
+        if not_modified:
+            return not_modified
         
-        # Check freshness based on file age
-        file_age = datetime.now() - datetime.fromtimestamp(cms_data_file.stat().st_mtime)
-        if file_age > timedelta(days=7):
-            quality["freshness"] = max(0, 100 - (file_age.days - 7) * 10)
+        def compute():
+            quality = {"completeness": 100, "validity": 100, "freshness": 100}
+            
+            # Check freshness based on file age
+            if file_age > timedelta(days=7):
+                quality["freshness"] = max(0, 100 - (file_age.days - 7) * 10)
+            
+            # You can add more sophisticated quality checks here
+            return quality
         
-        # You can add more sophisticated quality checks here
-        return quality
+        return _cached_result("quality", (key, file_age.days), compute)
         
     except Exception as e:
         logger.error(f"Error getting data quality: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/insights")
-async def get_insights():
+async def get_insights(request: Request, response: Response):
     """Get data insights and analytics"""
     try:
         if demo_mode or agent is None:
@@ -220,53 +460,18 @@ async def get_insights():
         # Analyze real data for insights
         cms_data_file = Path("cms_data/cms_full_dataset.json")
         
-        if not cms_data_file.exists():
+        key = await asyncio.to_thread(_file_key, cms_data_file)
+        if key is None:
             return get_demo_insights()
         
-        insights = {
-            "rating_distribution": {"1": 0, "2": 0, "3": 0, "4": 0, "5": 0},
-            "top_performers": []
-        }
+        not_modified = _not_modified(request, response, _etag_for(key))
+        if not_modified:
+            return not_modified
         
-        try:
-            with open(cms_data_file, 'r') as f:
-                data = json.load(f)
-                
-            if isinstance(data, list) and len(data) > 0:
-                # Analyze rating distribution
-                rating_counts = {"1": 0, "2": 0, "3": 0, "4": 0, "5": 0}
-                top_providers = []
-                
-                for provider in data:
-                    # Look for rating fields - adapt based on your data structure
-                    rating_field = None
-                    for field in ['overall_rating', 'rating', 'star_rating']:
-                        if field in provider and provider[field]:
-                            rating_field = field
-                            break
-                    
-                    if rating_field:
-                        rating = str(provider[rating_field])
-                        if rating in rating_counts:
-                            rating_counts[rating] += 1
-                    
-                    # Collect top performers
-                    if rating_field and provider.get(rating_field) == 5:
-                        top_providers.append({
-                            "id": provider.get("provider_id", "unknown"),
-                            "name": provider.get("facility_name", f"Provider {provider.get('provider_id', 'unknown')}"),
-                            "rating": 5,
-                            "survey_count": provider.get("number_of_surveys", 0)
-                        })
-                
-                insights["rating_distribution"] = rating_counts
-                
-                # Sort top performers by survey count
-                top_providers.sort(key=lambda x: x["survey_count"], reverse=True)
-                insights["top_performers"] = top_providers[:10]
-                
-        except Exception as e:
-            logger.warning(f"Could not analyze data file: {e}")
+        insights = await asyncio.to_thread(
+            _cached_result, "insights", key, lambda: _analyze_insights(cms_data_file)
+        )
+        if insights is None:
             return get_demo_insights()
         
         return insights
@@ -275,6 +480,127 @@ async def get_insights():
         logger.error(f"Error getting insights: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+_RATING_FIELDS = ('overall_rating', 'rating', 'star_rating')
+_RATING_LABELS = ("1", "2", "3", "4", "5")
+_INSIGHT_COLUMNS = _RATING_FIELDS + ('provider_id', 'facility_name', 'number_of_surveys')
+_RATING_CODES = {label: code for code, label in enumerate(_RATING_LABELS, 1)}
+
+def _rating_histogram(codes):
+    """
+    Count rating codes 1-5 in an int8 column (0 = not a star label)
+    
+    Compiled with Numba when available, otherwise np.bincount is used.
+    """
+    counts = np.zeros(6, dtype=np.int64)
+    for i in range(codes.shape[0]):
+        counts[codes[i]] += 1
+    return counts
+
+if njit is not None:
+    _rating_histogram = njit(cache=True, nogil=True)(_rating_histogram)
+elif np is not None:
+    _rating_histogram = lambda codes: np.bincount(codes, minlength=6)
+
+def _load_insight_rows(cms_data_file: Path) -> Any:
+    """
+    Load the records insights are computed from
+    
+    When the agent's Parquet copy of the dataset is current, only the columns
+    insights use are read from it; otherwise the full JSON file is parsed.
+    """
+    parquet_file = cms_data_file.with_suffix('.parquet')
+    if pq is not None:
+        try:
+            if parquet_file.stat().st_mtime_ns >= cms_data_file.stat().st_mtime_ns:
+                names = set(pq.read_schema(parquet_file).names)
+                columns = [c for c in _INSIGHT_COLUMNS if c in names]
+                if not columns:
+                    return [{} for _ in range(pq.read_metadata(parquet_file).num_rows)]
+                # Keys missing from a JSON record come back as None (Parquet has no "absent")
+                return pq.read_table(parquet_file, columns=columns).to_pylist()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not read Parquet copy {parquet_file}: {e}")
+    
+    return _read_json(cms_data_file)
+
+
+def _analyze_insights(cms_data_file: Path) -> Optional[Dict[str, Any]]:
+    """Compute rating distribution and top performers, or None if the file is unreadable"""
+    insights = {
+        "rating_distribution": {"1": 0, "2": 0, "3": 0, "4": 0, "5": 0},
+        "top_performers": []
+    }
+    
+    try:
+        data = _load_insight_rows(cms_data_file)
+            
+        if isinstance(data, list) and len(data) > 0:
+            # The schema is fixed per dataset, so the rating field is detected once
+            # from the first record that has one (adapt the field list to your data)
+            sample = next((p for p in data if any(p.get(f) for f in _RATING_FIELDS)), None)
+            rating_field = next((f for f in _RATING_FIELDS if sample.get(f)), None) if sample else None
+            
+            ratings = []
+            five_star = []
+            if rating_field is not None:
+                for provider in data:
+                    value = provider.get(rating_field)
+                    if value:
+                        ratings.append(value)
+                        if value == 5:
+                            five_star.append(provider)
+            
+            # Analyze rating distribution
+            if np is not None:
+                codes = np.fromiter((_RATING_CODES.get(str(v), 0) for v in ratings),
+                                    dtype=np.int8, count=len(ratings))
+                counts = _rating_histogram(codes)
+                insights["rating_distribution"] = {
+                    label: int(counts[code]) for label, code in _RATING_CODES.items()
+                }
+            else:
+                counts = Counter(map(str, ratings))
+                insights["rating_distribution"] = {label: counts[label] for label in _RATING_LABELS}
+            
+            # Top performers by survey count; nlargest keeps sorted(..., reverse=True) tie order
+            top_providers = [
+                {
+                    "id": provider.get("provider_id", "unknown"),
+                    "name": provider.get("facility_name", f"Provider {provider.get('provider_id', 'unknown')}"),
+                    "rating": 5,
+                    "survey_count": provider.get("number_of_surveys", 0)
+                }
+                for provider in five_star
+            ]
+            insights["top_performers"] = heapq.nlargest(10, top_providers, key=lambda x: x["survey_count"])
+            
+    except Exception as e:
+        logger.warning(f"Could not analyze data file: {e}")
+        return None
+    
+    return insights
+
+# Download jobs run in the background; clients poll /api/data/download/{job_id}.
+# Jobs are kept in process memory, so polling needs the single-worker default
+# (DASHBOARD_WORKERS=1). Only the running job and the most recent one are kept.
+_DOWNLOAD_JOBS: Dict[str, Dict[str, Any]] = {}
+_DOWNLOAD_TASKS = set()  # Strong references so running tasks are not garbage collected
+
+async def _run_download(job_id: str):
+    """Run agent.download_latest_data off the event loop and record the outcome on the job"""
+    job = _DOWNLOAD_JOBS[job_id]
+    try:
+        success = await asyncio.to_thread(agent.download_latest_data, True)
+        job["status"] = "completed" if success else "failed"
+        job["success"] = success
+        job["message"] = "Download completed successfully" if success else "Download failed"
+    except Exception as e:
+        logger.error(f"Error in download job {job_id}: {e}")
+        job.update(status="failed", success=False, message=str(e))
+    job["finished"] = datetime.now().isoformat()
+
 @app.post("/api/data/download")
 async def trigger_download():
     """Trigger data download"""
@@ -282,13 +608,32 @@ async def trigger_download():
         if demo_mode or agent is None:
             return {"success": True, "message": "Demo mode - download simulated"}
         
-        # Trigger real download
+        # Trigger real download, reusing a job that is already running
         if agent:
-            success = agent.update_data()
-            return {
-                "success": success,
-                "message": "Download completed successfully" if success else "Download failed"
-            }
+            for job_id, job in _DOWNLOAD_JOBS.items():
+                if job["status"] == "running":
+                    break
+            else:
+                # Only one job runs at a time, so every job left here has finished
+                _DOWNLOAD_JOBS.clear()
+                job_id = uuid.uuid4().hex
+                _DOWNLOAD_JOBS[job_id] = {
+                    "job_id": job_id,
+                    "status": "running",
+                    "success": None,
+                    "message": "Download in progress",
+                    "started": datetime.now().isoformat(),
+                    "finished": None
+                }
+                task = asyncio.create_task(_run_download(job_id))
+                _DOWNLOAD_TASKS.add(task)
+                task.add_done_callback(_DOWNLOAD_TASKS.discard)
+            
+            return _DefaultResponse(status_code=202, content={
+                "success": True,
+                "job_id": job_id,
+                "message": "Download started"
+            })
         else:
             return {"success": False, "message": "Agent not available"}
         
@@ -296,6 +641,14 @@ async def trigger_download():
         logger.error(f"Error triggering download: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/data/download/{job_id}")
+async def get_download_job(job_id: str):
+    """Get the status of a download job"""
+    job = _DOWNLOAD_JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown download job")
+    return job
+
 @app.get("/api/data/check-updates")
 async def check_updates():
     """Check for data updates"""
@@ -305,7 +658,11 @@ async def check_updates():
         
         # Check for real updates
         if agent:
-            updates_available = agent.check_for_updates()
+            # A conditional HEAD against the stored ETag avoids querying the data at all
+            if check_remote_changed is not None and await check_remote_changed() is False:
+                return {"updates_available": False, "message": "Data is up to date"}
+            
+            updates_available = await asyncio.to_thread(agent.check_for_updates)
             return {
                 "updates_available": updates_available,
                 "message": "Updates available" if updates_available else "Data is up to date"
@@ -332,12 +689,29 @@ async def validate_data():
         # Perform real validation
         cms_data_file = Path("cms_data/cms_full_dataset.json")
         
-        if not cms_data_file.exists():
+        if _file_key(cms_data_file) is None:
             return {"valid": False, "message": "Data file not found"}
         
+        # With a current metadata sidecar, the checksum replaces a full parse
+        meta = await asyncio.to_thread(_current_meta, cms_data_file)
+        if meta is not None and meta.get("record_count") is not None:
+            digest = await asyncio.to_thread(_sha256_file, cms_data_file)
+            if digest != meta.get("sha256"):
+                return {
+                    "valid": False,
+                    "record_count": meta["record_count"],
+                    "issues": 1,
+                    "message": "Checksum mismatch"
+                }
+            return {
+                "valid": True,
+                "record_count": meta["record_count"],
+                "issues": 0,
+                "message": "Data validation successful"
+            }
+        
         try:
-            with open(cms_data_file, 'r') as f:
-                data = json.load(f)
+            data = await asyncio.to_thread(_read_json, cms_data_file)
             
             record_count = len(data) if isinstance(data, list) else 0
             
@@ -361,44 +735,47 @@ async def validate_data():
         raise HTTPException(status_code=500, detail=str(e))
 
 # Demo data functions
-def get_demo_status():
+# Demo payloads only depend on "now", so they are rebuilt at most once per tick
+_DEMO_TICK_SECONDS = 5
+_DEMO_ACTIVITY = (
+    ("success", "Data Download Complete", timedelta(hours=2)),
+    ("info", "Checking for Updates", timedelta(hours=4)),
+    ("warning", "Validation Warning", timedelta(days=1)),
+    ("success", "Agent Started", timedelta(days=2)),
+)
+
+@lru_cache(maxsize=1)
+def _demo_payloads(tick: int) -> Dict[str, Any]:
+    """Build the time-dependent demo responses from a single datetime.now()"""
+    now = datetime.now()
     return {
-        "status": "active",
-        "last_seen": datetime.now().isoformat(),
-        "demo_mode": True
+        "status": {
+            "status": "active",
+            "last_seen": now.isoformat(),
+            "demo_mode": True
+        },
+        "stats": {
+            "record_count": 12068,
+            "data_size": 22548578,  # ~21.5MB
+            "last_update": (now - timedelta(hours=2)).isoformat()
+        },
+        "activity": [
+            {"type": activity_type, "message": message, "timestamp": (now - age).isoformat()}
+            for activity_type, message, age in _DEMO_ACTIVITY
+        ]
     }
 
+def _demo_payload(name: str) -> Any:
+    return _demo_payloads(int(time.time() // _DEMO_TICK_SECONDS))[name]
+
+def get_demo_status():
+    return _demo_payload("status")
+
 def get_demo_stats():
-    return {
-        "record_count": 12068,
-        "data_size": 22548578,  # ~21.5MB
-        "last_update": (datetime.now() - timedelta(hours=2)).isoformat()
-    }
+    return _demo_payload("stats")
 
 def get_demo_activity():
-    now = datetime.now()
-    return [
-        {
-            "type": "success",
-            "message": "Data Download Complete",
-            "timestamp": (now - timedelta(hours=2)).isoformat()
-        },
-        {
-            "type": "info",
-            "message": "Checking for Updates",
-            "timestamp": (now - timedelta(hours=4)).isoformat()
-        },
-        {
-            "type": "warning",
-            "message": "Validation Warning",
-            "timestamp": (now - timedelta(days=1)).isoformat()
-        },
-        {
-            "type": "success",
-            "message": "Agent Started",
-            "timestamp": (now - timedelta(days=2)).isoformat()
-        }
-    ]
+    return _demo_payload("activity")
 
 def get_demo_quality():
     return {
@@ -407,6 +784,222 @@ def get_demo_quality():
         "freshness": 92
     }
 
+# Record index sidecars: a compact one-record-per-line copy of the dataset
+# (<name>.records) plus a binary offset/rating table (<name>.idx). Pages are
+# served by slicing the memory-mapped records file instead of parsing the
+# whole dataset on every request.
+_INDEX_VERSION = 1
+_RECORD_INDEX: Dict[str, "RecordIndex"] = {}
+# Single-flight guard so concurrent first requests build the sidecars once
+_RECORD_INDEX_LOCK = threading.Lock()
+
+def _rating_code(value) -> int:
+    """Encode a star rating string as a small int, or -1 if it is not a plain number"""
+    if isinstance(value, str) and value.isdecimal() and str(int(value)) == value and int(value) < 128:
+        return int(value)
+    return -1
+
+def _replace_sidecar(target: Path, write) -> None:
+    """
+    Atomically (re)write a sidecar file
+    
+    Args:
+        target: Final sidecar path
+        write: Callable taking the open binary temp file to fill
+    """
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=target.name + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            write(out)
+        os.replace(tmp, target)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def build_record_index(source: Path) -> bool:
+    """
+    Write the .records and .idx sidecars for a JSON dataset
+    
+    Args:
+        source: Path to a JSON file containing a list of records
+        
+    Returns:
+        True if the index was written, False if the file is not a record list
+    """
+    records = _read_json(source)
+    
+    if not isinstance(records, list):
+        return False
+    
+    st = source.stat()
+    offsets = array('q', [0])
+    ratings = array('b')
+    
+    def write_records(out):
+        position = 0
+        for record in records:
+            line = _dumps(record) + b'\n'
+            out.write(line)
+            position += len(line)
+            offsets.append(position)
+            rating = record.get('hhcahps_survey_summary_star_rating') if isinstance(record, dict) else None
+            ratings.append(_rating_code(rating))
+    
+    def write_index(out):
+        array('q', [_INDEX_VERSION, st.st_mtime_ns, st.st_size, len(records)]).tofile(out)
+        offsets.tofile(out)
+        ratings.tofile(out)
+    
+    # Unique temp files per writer, so concurrent builders (threads or
+    # workers) never interleave writes into the same file
+    _replace_sidecar(source.with_suffix('.records'), write_records)
+    _replace_sidecar(source.with_suffix('.idx'), write_index)
+    return True
+
+class RecordIndex:
+    """Read-only view of a dataset through its memory-mapped record sidecar"""
+    
+    def __init__(self, source: Path):
+        self.source = source
+        self.key = _file_key(source)
+        self.trigrams: Optional[Dict[str, frozenset]] = None
+        
+        with open(source.with_suffix('.idx'), 'rb') as f:
+            header = array('q')
+            header.fromfile(f, 4)
+            version, mtime_ns, size, count = header
+            if version != _INDEX_VERSION or (mtime_ns, size) != self.key[1:]:
+                raise ValueError(f"Stale record index for {source}")
+            self.offsets = array('q')
+            self.offsets.fromfile(f, count + 1)
+            ratings = array('b')
+            ratings.fromfile(f, count)
+        
+        self.count = count
+        self.buckets: Dict[int, List[int]] = {}
+        for i, code in enumerate(ratings):
+            self.buckets.setdefault(code, []).append(i)
+        
+        with open(source.with_suffix('.records'), 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if count else b''
+    
+    def record(self, i: int) -> Dict[str, Any]:
+        """Decode the record at position i"""
+        return _loads(self.mm[self.offsets[i]:self.offsets[i + 1]])
+    
+    def with_rating(self, rating: int) -> List[int]:
+        """Positions of records whose star rating string equals str(rating)"""
+        if rating < 0:
+            return []
+        return self.buckets.get(rating, [])
+    
+    def search(self, positions, text: str) -> List[int]:
+        """
+        Filter positions to records with a value containing text
+        
+        Args:
+            positions: Candidate record positions, in output order
+            text: Lowercased search string
+            
+        Returns:
+            Matching positions in their original order
+        """
+        if len(text) >= 3:
+            # Narrow to records containing every trigram of the query, then verify
+            trigrams = self._load_trigrams()
+            postings = sorted((trigrams.get(gram, frozenset()) for gram in _trigrams_of(text)), key=len)
+            candidates = postings[0].intersection(*postings[1:])
+            positions = [i for i in positions if i in candidates]
+        
+        return [
+            i for i in positions
+            if any(
+                text in str(value).lower()
+                for value in self.record(i).values()
+                if value is not None
+            )
+        ]
+    
+    def _load_trigrams(self) -> Dict[str, frozenset]:
+        """Load the trigram sidecar for this file version, building it on first use"""
+        if self.trigrams is not None:
+            return self.trigrams
+        
+        grams_path = self.source.with_suffix('.grams')
+        try:
+            stored = _read_json(grams_path)
+            if [stored["version"], stored["mtime_ns"], stored["size"]] != [_INDEX_VERSION, *self.key[1:]]:
+                raise ValueError(f"Stale trigram index for {self.source}")
+            postings = stored["grams"]
+        except (OSError, ValueError, KeyError):
+            postings = self._build_trigrams()
+            payload = _dumps({
+                "version": _INDEX_VERSION,
+                "mtime_ns": self.key[1],
+                "size": self.key[2],
+                "grams": postings
+            })
+            _replace_sidecar(grams_path, lambda out: out.write(payload))
+        
+        self.trigrams = {gram: frozenset(ids) for gram, ids in postings.items()}
+        return self.trigrams
+    
+    def _build_trigrams(self) -> Dict[str, List[int]]:
+        """Map each lowercased trigram to the ascending positions of records containing it"""
+        postings: Dict[str, List[int]] = defaultdict(list)
+        seen: Dict[str, set] = {}  # many field values repeat across records
+        for i in range(self.count):
+            record = self.record(i)
+            if not isinstance(record, dict):
+                continue
+            grams = set()
+            for value in record.values():
+                if value is None:
+                    continue
+                text = str(value).lower()
+                value_grams = seen.get(text)
+                if value_grams is None:
+                    value_grams = seen[text] = _trigrams_of(text)
+                grams |= value_grams
+            for gram in grams:
+                postings[gram].append(i)
+        return postings
+
+def _trigrams_of(text: str) -> set:
+    """All three-character substrings of text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def get_record_index(source: Path) -> Optional[RecordIndex]:
+    """
+    Return an up-to-date RecordIndex for source, building the sidecars if needed
+    
+    Args:
+        source: Path to the JSON dataset
+        
+    Returns:
+        RecordIndex, or None if the dataset is not a list of records
+    """
+    key = _file_key(source)
+    index = _RECORD_INDEX.get(str(source))
+    if index is not None and index.key == key:
+        return index
+    
+    with _RECORD_INDEX_LOCK:
+        # Another request may have built it while this one waited
+        index = _RECORD_INDEX.get(str(source))
+        if index is not None and index.key == key:
+            return index
+        
+        try:
+            index = RecordIndex(source)
+        except (OSError, ValueError):
+            if not build_record_index(source):
+                return None
+            index = RecordIndex(source)
+        
+        _RECORD_INDEX[str(source)] = index
+    return index
+
 @app.get("/api/data/records")
 async def get_data_records(
     page: int = 1,
@@ -418,58 +1011,50 @@ async def get_data_records(
     try:
         cms_data_file = Path("cms_data/cms_full_dataset.json")
         
-        if not cms_data_file.exists():
+        if _file_key(cms_data_file) is None:
             # Try sample data
             cms_data_file = Path("cms_data/cms_sample_10_records.json")
             
-        if not cms_data_file.exists():
-            return {"records": [], "total": 0, "page": page, "limit": limit}
-        
-        with open(cms_data_file, 'r') as f:
-            all_records = json.load(f)
-        
-        if not isinstance(all_records, list):
+        if _file_key(cms_data_file) is None:
             return {"records": [], "total": 0, "page": page, "limit": limit}
         
-        # Apply filters
-        filtered_records = all_records
-        
-        if search:
-            search_lower = search.lower()
-            filtered_records = [
-                record for record in filtered_records
-                if any(
-                    search_lower in str(value).lower()
-                    for value in record.values()
-                    if value is not None
-                )
-            ]
-        
-        if rating is not None:
-            rating_str = str(rating)
-            filtered_records = [
-                record for record in filtered_records
-                if record.get('hhcahps_survey_summary_star_rating') == rating_str
-            ]
-        
-        # Pagination
-        total = len(filtered_records)
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        page_records = filtered_records[start_idx:end_idx]
-        
-        return {
-            "records": page_records,
-            "total": total,
-            "page": page,
-            "limit": limit,
-            "total_pages": (total + limit - 1) // limit
-        }
+        return await asyncio.to_thread(_query_records, cms_data_file, page, limit, search, rating)
         
     except Exception as e:
         logger.error(f"Error getting data records: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _query_records(cms_data_file: Path, page: int, limit: int,
+                   search: Optional[str], rating: Optional[int]) -> Dict[str, Any]:
+    """Filter and paginate records through the record index (blocking)"""
+    index = get_record_index(cms_data_file)
+    
+    if index is None:
+        return {"records": [], "total": 0, "page": page, "limit": limit}
+    
+    # Apply filters
+    if rating is not None:
+        positions = index.with_rating(rating)
+    else:
+        positions = range(index.count)
+    
+    if search:
+        positions = index.search(positions, search.lower())
+    
+    # Pagination
+    total = len(positions)
+    start_idx = (page - 1) * limit
+    end_idx = start_idx + limit
+    page_records = [index.record(i) for i in positions[start_idx:end_idx]]
+    
+    return {
+        "records": page_records,
+        "total": total,
+        "page": page,
+        "limit": limit,
+        "total_pages": (total + limit - 1) // limit
+    }
+
 @app.post("/api/chat")
 async def chat_with_data(request: dict):
     """Chat endpoint for AI questions about the data"""
@@ -482,7 +1067,7 @@ async def chat_with_data(request: dict):
         # For demo purposes, return a helpful response
         # In production, this could integrate with your Claude API or other AI service
         
-        response = generate_chat_response(message)
+        response = await asyncio.to_thread(generate_chat_response, message)
         
         return {
             "response": response,
@@ -493,36 +1078,16 @@ async def chat_with_data(request: dict):
         logger.error(f"Error in chat endpoint: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-def generate_chat_response(message: str) -> str:
-    """Generate a helpful response about the CMS data"""
-    message_lower = message.lower()
-    
-    # Try to load actual data for context
-    try:
-        cms_data_file = Path("cms_data/cms_full_dataset.json")
-        if cms_data_file.exists():
-            with open(cms_data_file, 'r') as f:
-                data = json.load(f)
-                total_records = len(data) if isinstance(data, list) else 0
-        else:
-            total_records = 0
-    except:
-        total_records = 0
-    
-    if "average" in message_lower and "rating" in message_lower:
-        return f"Based on the CMS dataset of {total_records} healthcare providers, I can help you calculate average ratings. The dataset includes overall star ratings and specific care quality metrics for each provider."
-    
-    elif "5 star" in message_lower or "five star" in message_lower:
-        return f"I can identify all providers with 5-star ratings in the dataset. These represent the highest-performing healthcare providers based on patient survey results."
-    
-    elif "survey" in message_lower and ("most" in message_lower or "highest" in message_lower):
-        return f"I'll help you find providers with the most survey responses. This typically indicates larger healthcare facilities with higher patient volumes."
-    
-    elif "quality" in message_lower or "trend" in message_lower:
-        return f"The CMS dataset includes multiple quality metrics including overall ratings, care delivery ratings, communication scores, and patient satisfaction percentages. I can help analyze trends across these metrics."
-    
-    elif "help" in message_lower or "what can" in message_lower:
-        return """I can help you analyze the CMS healthcare provider data in many ways:
+# Chat keyword routing: a single regex scan finds every keyword in the message.
+# The lookahead makes matches zero-width so overlapping keywords are all found.
+_CHAT_KEYWORDS = ("average", "rating", "5 star", "five star", "survey", "most",
+                  "highest", "quality", "trend", "help", "what can")
+_CHAT_KEYWORD_RE = re.compile("(?=(" + "|".join(map(re.escape, _CHAT_KEYWORDS)) + "))")
+
+_CHAT_FIVE_STAR = "I can identify all providers with 5-star ratings in the dataset. These represent the highest-performing healthcare providers based on patient survey results."
+_CHAT_SURVEY = "I'll help you find providers with the most survey responses. This typically indicates larger healthcare facilities with higher patient volumes."
+_CHAT_QUALITY = "The CMS dataset includes multiple quality metrics including overall ratings, care delivery ratings, communication scores, and patient satisfaction percentages. I can help analyze trends across these metrics."
+_CHAT_HELP = """I can help you analyze the CMS healthcare provider data in many ways:
 
 • Calculate statistics (averages, totals, distributions)
 • Find top-performing providers by ratings
@@ -532,9 +1097,47 @@ def generate_chat_response(message: str) -> str:
 • Filter data by specific criteria
 
 What specific aspect of the healthcare data would you like to explore?"""
+
+def _total_records() -> int:
+    """Dataset record count for chat context, cached per file version"""
+    cms_data_file = Path("cms_data/cms_full_dataset.json")
+    key = (_file_key(cms_data_file), _file_key(cms_data_file.with_suffix('.meta.json')))
+    if key[0] is None:
+        return 0
+    
+    def compute():
+        meta = _current_meta(cms_data_file)
+        if meta is not None and meta.get("record_count") is not None:
+            return meta["record_count"]
+        data = _read_json(cms_data_file)
+        return len(data) if isinstance(data, list) else 0
+    
+    try:
+        return _cached_result("total_records", key, compute)
+    except Exception:
+        return 0
+
+def generate_chat_response(message: str) -> str:
+    """Generate a helpful response about the CMS data"""
+    keywords = set(_CHAT_KEYWORD_RE.findall(message.lower()))
+    
+    if "average" in keywords and "rating" in keywords:
+        return f"Based on the CMS dataset of {_total_records()} healthcare providers, I can help you calculate average ratings. The dataset includes overall star ratings and specific care quality metrics for each provider."
+    
+    elif "5 star" in keywords or "five star" in keywords:
+        return _CHAT_FIVE_STAR
+    
+    elif "survey" in keywords and ("most" in keywords or "highest" in keywords):
+        return _CHAT_SURVEY
+    
+    elif "quality" in keywords or "trend" in keywords:
+        return _CHAT_QUALITY
+    
+    elif "help" in keywords or "what can" in keywords:
+        return _CHAT_HELP
     
     else:
-        return f"I'm here to help you analyze the CMS healthcare provider dataset ({total_records} records). I can answer questions about provider ratings, survey results, quality metrics, and trends. What would you like to know about the data?"
+        return f"I'm here to help you analyze the CMS healthcare provider dataset ({_total_records()} records). I can answer questions about provider ratings, survey results, quality metrics, and trends. What would you like to know about the data?"
 
 def get_demo_insights():
     return {
@@ -550,4 +1153,12 @@ def get_demo_insights():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Result cache, file watcher, record indexes and download jobs live in process
+    # memory, so a single worker is the default; extra workers each keep their own
+    # copy and job polling only works against the worker that started the job.
+    # uvicorn picks uvloop and httptools automatically when they are installed
+    # (uvicorn[standard]).
+    workers = int(os.getenv("DASHBOARD_WORKERS", "1"))
+    if workers > 1:
+        logger.warning(f"Starting {workers} workers; caches and download jobs are per worker")
+    uvicorn.run("dashboard_api:app", host="0.0.0.0", port=8000, workers=workers)
@@ -7,46 +7,456 @@ Supports JSON, CSV, and other data formats with error handling and logging.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import InvalidHeader
+from urllib3.util.retry import Retry
+import asyncio
 import json
 import csv
+import hashlib
 import os
+import queue
+import shutil
+import tempfile
+import atexit
 import logging
-from datetime import datetime
-from typing import Dict, Any, Optional
+import logging.handlers
+import threading
 import time
+from datetime import datetime
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from urllib.parse import urlencode
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# With httpx and h2 (httpx[http2]) installed, paginated downloads multiplex
+# their concurrent page requests over a single HTTP/2 connection
+try:
+    import h2  # noqa: F401
+    _HTTP2 = httpx is not None
+except ImportError:
+    _HTTP2 = False
+
+_REQUEST_ERRORS = (requests.exceptions.RequestException,) + ((httpx.HTTPError,) if httpx is not None else ())
+
+try:
+    import orjson
+    _loads = orjson.loads
+    
+    def _encode(obj: Any, pretty: bool = False) -> bytes:
+        """Encode obj as UTF-8 JSON, compact or with 2-space indentation"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+except ImportError:
+    _loads = json.loads
+    
+    def _encode(obj: Any, pretty: bool = False) -> bytes:
+        """Encode obj as UTF-8 JSON, compact or with 2-space indentation"""
+        if pretty:
+            return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+try:
+    import ijson
+    _JSON_ERRORS = (json.JSONDecodeError, ijson.JSONError)
+except ImportError:
+    ijson = None
+    _JSON_ERRORS = (json.JSONDecodeError,)
+
+
+# Connection pool per session; sized above the batch/pagination worker counts
+_POOL_SIZE = 32
+
+# Retry policy for transient failures, shared by the requests session and the
+# HTTP/2 page client
+_RETRY_TOTAL = 5
+_RETRY_BACKOFF = 0.3
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Buffer size for copying raw response bodies to disk
+_COPY_BUFFER_SIZE = 1024 * 1024
+
+# Earlier downloads (file, fetch time, ETag / Last-Modified), kept in the output directory
+_VALIDATORS_FILE = '.api_etags.json'
+
+# Endpoint path -> filename stem
+_SLASH_TO_UNDERSCORE = str.maketrans('/', '_')
+
+# (epoch second, formatted timestamp) of the last generated filename
+_last_timestamp = (None, '')
+
+# Background log writer shared by every APIDataDownloader that configured
+# logging, with the number of open downloaders still using it
+_log_lock = threading.Lock()
+_log_listener = None
+_log_handler = None
+_log_users = 0
+
+
+@lru_cache(maxsize=256)
+def _safe_endpoint_name(endpoint: str) -> str:
+    """Filename stem for an endpoint path, e.g. '/posts/1' -> 'posts_1'"""
+    return endpoint.translate(_SLASH_TO_UNDERSCORE).lstrip('_')
+
+
+def _timestamp() -> str:
+    """Filename timestamp (YYYYmmdd_HHMMSS), formatted at most once per second"""
+    global _last_timestamp
+    second = int(time.time())
+    if _last_timestamp[0] != second:
+        _last_timestamp = (second, datetime.fromtimestamp(second).strftime("%Y%m%d_%H%M%S"))
+    return _last_timestamp[1]
+
+
+def meta_path_for(filepath: str) -> str:
+    """Path of the metadata sidecar for a downloaded JSON file (data.json -> data.meta.json)"""
+    root, ext = os.path.splitext(filepath)
+    return f"{root}.meta{ext or '.json'}"
+
+
+def _replace_json(path: str, obj: Any):
+    """
+    Atomically (re)write a small JSON file
+    
+    The temp file gets a unique name next to the target, so concurrent writers
+    never share (or truncate) each other's temp file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.',
+                                    prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(obj, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_validators(output_dir: str) -> Dict[str, Dict]:
+    """
+    Load the stored HTTP validators of an output directory
+    
+    This is the single store shared by APIDataDownloader and the CMS
+    downloader, keyed by validator_key.
+    
+    Returns:
+        Map of query key -> entry, or an empty map if none have been saved
+    """
+    try:
+        with open(os.path.join(output_dir, _VALIDATORS_FILE), 'r', encoding='utf-8') as f:
+            validators = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return validators if isinstance(validators, dict) else {}
+
+
+def validator_key(base_url: str, endpoint: str, params: Optional[Dict], ext: str) -> str:
+    """Key identifying one query: the URL, its sorted parameters and the output format"""
+    query = urlencode(sorted((params or {}).items()), doseq=True)
+    return hashlib.blake2b(f"{ext}:{base_url.rstrip('/')}/{endpoint}?{query}".encode(),
+                           digest_size=16).hexdigest()
+
+
+def _response_json(response) -> Any:
+    """
+    Decode a JSON response body (requests or httpx)
+    
+    Bodies in UTF-8, JSON's default, are parsed straight from the bytes,
+    skipping the client's text decoding and charset detection. Bodies declared
+    in another charset, or that fail to parse that way, go through
+    response.json().
+    """
+    content_type = response.headers.get('Content-Type', '')
+    charset = content_type.partition('charset=')[2].split(';')[0].strip(' "\'').lower()
+    if charset and charset not in ('utf-8', 'utf8'):
+        return response.json()
+    try:
+        return _loads(response.content)
+    except (ValueError, UnicodeDecodeError):
+        return response.json()
+
+
+class _TokenBucket:
+    """
+    Token-bucket rate limiter
+    
+    Allows bursts of up to rps requests and only sleeps once the configured
+    rate is actually being exceeded.
+    """
+    
+    def __init__(self, rps: float):
+        self.rps = rps
+        self.capacity = max(1.0, rps)
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+    
+    def take(self):
+        """Block until a request may be made, then consume one token"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rps)
+        self.last = now
+        if self.tokens < 1:
+            time.sleep((1 - self.tokens) / self.rps)
+            self.last = time.monotonic()
+            self.tokens = 0.0
+        else:
+            self.tokens -= 1
+
+
+class _JSONArrayWriter:
+    """
+    Write a JSON array to a binary file one element at a time
+    
+    The pretty layout matches json.dump(items, f, indent=2); otherwise the
+    array is compact.
+    """
+    
+    def __init__(self, write, pretty: bool = False):
+        self.write = write
+        self.pretty = pretty
+        self.count = 0
+        write(b'[')
+    
+    def append(self, item: Any):
+        if self.pretty:
+            self.write(b',\n  ' if self.count else b'\n  ')
+            self.write(_encode(item, True).replace(b'\n', b'\n  '))
+        else:
+            if self.count:
+                self.write(b',')
+            self.write(_encode(item))
+        self.count += 1
+    
+    def close(self):
+        self.write(b'\n]' if self.pretty and self.count else b']')
+
+
+def _start_log_listener(log_file: str) -> bool:
+    """
+    Attach the shared queue-backed log writer to the root logger, or take a
+    reference on it if it is already running
+    
+    Like logging.basicConfig, nothing is configured if the root logger already
+    has handlers of its own.
+    
+    Returns:
+        True if the caller holds a reference and must call _release_log_listener
+    """
+    global _log_listener, _log_handler, _log_users
+    with _log_lock:
+        if _log_listener is None:
+            root = logging.getLogger()
+            if root.handlers:
+                return False
+            
+            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+            handlers = [logging.FileHandler(log_file), logging.StreamHandler()]
+            for handler in handlers:
+                handler.setFormatter(formatter)
+            
+            log_queue = queue.SimpleQueue()
+            _log_handler = logging.handlers.QueueHandler(log_queue)
+            _log_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+            _log_listener.start()
+            # Flush queued records at exit if some downloader is never closed
+            atexit.register(_stop_log_listener)
+            
+            root.addHandler(_log_handler)
+            root.setLevel(logging.INFO)
+        _log_users += 1
+        return True
+
+
+def _release_log_listener():
+    """Drop one reference on the shared log writer, stopping it after the last"""
+    global _log_users
+    with _log_lock:
+        _log_users -= 1
+        if _log_users == 0:
+            _stop_log_listener()
+
+
+def _stop_log_listener():
+    """Flush and stop the shared log writer and detach it from the root logger"""
+    global _log_listener, _log_handler, _log_users
+    if _log_listener is None:
+        return
+    atexit.unregister(_stop_log_listener)
+    logging.getLogger().removeHandler(_log_handler)
+    _log_listener.stop()
+    for handler in _log_listener.handlers:
+        handler.close()
+    _log_listener = _log_handler = None
+    _log_users = 0
+
+
+def write_meta_sidecar(filepath: str, record_count: Optional[int], sha256: str):
+    """
+    Atomically write the metadata sidecar for a downloaded JSON file
+    
+    Readers compare the stored mtime_ns/size with the data file to tell whether
+    the sidecar is current, and can use the record count and checksum without
+    parsing the data itself.
+    
+    Args:
+        filepath: Path of the downloaded data file
+        record_count: Number of records, or None if unknown
+        sha256: Hex digest of the file contents
+    """
+    st = os.stat(filepath)
+    meta = {
+        'record_count': record_count,
+        'sha256': sha256,
+        'mtime_ns': st.st_mtime_ns,
+        'size': st.st_size
+    }
+    _replace_json(meta_path_for(filepath), meta)
 
 
 class APIDataDownloader:
-    def __init__(self, base_url: str, output_dir: str = "data"):
+    def __init__(self, base_url: str, output_dir: str = "data", cache_ttl: Optional[float] = None,
+                 use_http2: bool = True):
         """
         Initialize the API Data Downloader
         
         Args:
             base_url: Base URL of the API
             output_dir: Directory to save downloaded data
+            cache_ttl: Seconds for which a JSON download is reused without
+                contacting the API again (disabled by default)
+            use_http2: Fetch pages of paginated downloads over one multiplexed
+                HTTP/2 connection (needs httpx and h2; ignored otherwise)
         """
         self.base_url = base_url.rstrip('/')
         self.output_dir = output_dir
+        self.cache_ttl = cache_ttl
+        self.use_http2 = use_http2 and _HTTP2
+        self._http2_client = None
         self.session = requests.Session()
         
+        # Pooled keep-alive connections, with transient failures retried with backoff
+        self._retry = Retry(
+            total=_RETRY_TOTAL,
+            backoff_factor=_RETRY_BACKOFF,
+            status_forcelist=_RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'HEAD'])
+        )
+        adapter = HTTPAdapter(pool_connections=_POOL_SIZE, pool_maxsize=_POOL_SIZE, max_retries=self._retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
         # Create output directory if it doesn't exist
         os.makedirs(self.output_dir, exist_ok=True)
         
+        # Earlier downloads for conditional GETs and cache_ttl, keyed by endpoint + query
+        self._validators_path = os.path.join(self.output_dir, _VALIDATORS_FILE)
+        self._validators = load_validators(self.output_dir)
+        self._validators_lock = threading.Lock()
+        
         # Setup logging
         self._setup_logging()
         
     def _setup_logging(self):
-        """Setup logging configuration"""
-        log_file = os.path.join(self.output_dir, 'download.log')
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler()
-            ]
-        )
+        """
+        Setup logging configuration
+        
+        Like logging.basicConfig, this only configures the root logger if it has
+        no handlers yet. Records are handed to a queue and written to the log
+        file and console by a background listener thread, so logging from the
+        download loops does not block on file I/O. The listener is shared by
+        all downloaders and stops when the last of them is closed.
+        """
         self.logger = logging.getLogger(__name__)
+        self._uses_log_listener = _start_log_listener(os.path.join(self.output_dir, 'download.log'))
+        
+    def close(self):
+        """Release the shared background log writer and close the HTTP clients"""
+        if self._uses_log_listener:
+            self._uses_log_listener = False
+            _release_log_listener()
+        if self._http2_client is not None:
+            self._http2_client.close()
+            self._http2_client = None
+        self.session.close()
+        
+    def _validator_key(self, endpoint: str, params: Optional[Dict], ext: str) -> str:
+        """validator_key for a query against this downloader's API"""
+        return validator_key(self.base_url, endpoint, params, ext)
+        
+    def _fresh_download(self, key: str, filepath: str, filename: Optional[str]) -> Optional[str]:
+        """Path of an earlier download of this query younger than cache_ttl, if any"""
+        if not self.cache_ttl:
+            return None
+        entry = self._validators.get(key)
+        if not entry or time.time() - entry.get('fetched_at', 0) >= self.cache_ttl:
+            return None
+        if not os.path.exists(entry.get('file', '')) or (filename and entry['file'] != filepath):
+            return None
+        return entry['file']
+        
+    def _conditional_headers(self, key: str, filepath: str, filename: Optional[str]) -> Tuple[Dict, Optional[str]]:
+        """
+        If-None-Match / If-Modified-Since headers for a query already downloaded
+        
+        Args:
+            key: Query key from _validator_key
+            filepath: Path this download would be written to
+            filename: Filename the caller asked for, or None for a generated one
+            
+        Returns:
+            (headers, path of the file a 304 would refer to); empty headers and
+            None when the earlier copy is missing or was saved elsewhere
+        """
+        entry = self._validators.get(key)
+        if not entry or not os.path.exists(entry.get('file', '')):
+            return {}, None
+        if filename and entry['file'] != filepath:
+            return {}, None
+        
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers, entry['file'] if headers else None
+        
+    def _record_validators(self, key: str, filepath: Optional[str], headers):
+        """
+        Remember a download and its validators, persisting them atomically
+        
+        The store on disk is re-read first, so entries written meanwhile by
+        another downloader for the same directory (such as the CMS
+        downloader) are merged rather than overwritten.
+        
+        Args:
+            key: Query key from _validator_key
+            filepath: Path of the fresh copy, or None after a 304 to keep the
+                existing entry and only renew its fetch time
+            headers: Response headers
+        """
+        with self._validators_lock:
+            validators = {**self._validators, **load_validators(self.output_dir)}
+            entry = validators.get(key)
+            if filepath is None:
+                if entry is None:
+                    return
+                entry['fetched_at'] = time.time()
+            else:
+                validators[key] = {
+                    'etag': headers.get('ETag'),
+                    'last_modified': headers.get('Last-Modified'),
+                    'file': filepath,
+                    'fetched_at': time.time()
+                }
+            
+            _replace_json(self._validators_path, validators)
+            self._validators = validators
         
     def set_authentication(self, auth_type: str, **kwargs):
         """
@@ -68,7 +478,35 @@ class APIDataDownloader:
             api_key = kwargs.get('api_key')
             self.session.headers.update({key_name: api_key})
             
-    def download_json_data(self, endpoint: str, filename: str = None, params: Dict = None) -> bool:
+    def fetch_json(self, endpoint: str, params: Dict = None) -> Optional[Any]:
+        """
+        Fetch JSON data from API endpoint without writing it to disk
+        
+        Args:
+            endpoint: API endpoint path
+            params: Query parameters (optional)
+            
+        Returns:
+            Parsed JSON response, or None on failure
+        """
+        try:
+            url = f"{self.base_url}/{endpoint.lstrip('/')}"
+            self.logger.info(f"Fetching JSON data from: {url}")
+            
+            response = self.session.get(url, params=params, timeout=30)
+            response.raise_for_status()
+            return _response_json(response)
+            
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"Request error: {e}")
+            return None
+        except ValueError as e:
+            self.logger.error(f"JSON decode error: {e}")
+            return None
+            
+    def download_json_data(self, endpoint: str, filename: str = None, params: Dict = None,
+                           streaming: bool = False, pretty: bool = False,
+                           ignore_cache: bool = False) -> bool:
         """
         Download JSON data from API endpoint
         
@@ -76,6 +514,12 @@ class APIDataDownloader:
             endpoint: API endpoint path
             filename: Output filename (optional)
             params: Query parameters (optional)
+            streaming: Parse the response incrementally with ijson (when installed)
+                and write each record as it is decoded, instead of loading the
+                whole body; the output file is identical either way
+            pretty: Indent the output by 2 spaces (best for small samples);
+                by default it is written compactly
+            ignore_cache: Download even if a copy younger than cache_ttl exists
             
         Returns:
             bool: Success status
@@ -84,30 +528,154 @@ class APIDataDownloader:
             url = f"{self.base_url}/{endpoint.lstrip('/')}"
             self.logger.info(f"Downloading JSON data from: {url}")
             
-            response = self.session.get(url, params=params, timeout=30)
+            filepath = self._output_path(endpoint, filename, '.json')
+            key = self._validator_key(endpoint, params, '.json')
+            cached_file = None if ignore_cache else self._fresh_download(key, filepath, filename)
+            if cached_file:
+                self.logger.info(f"Cache hit, reusing recent download: {cached_file}")
+                return True
+            headers, cached_file = self._conditional_headers(key, filepath, filename)
+            
+            use_stream = streaming and ijson is not None
+            response = self.session.get(url, params=params, timeout=30, stream=use_stream,
+                                        headers=headers)
+            if response.status_code == 304:
+                response.close()
+                self.logger.info(f"Not modified since last download: {cached_file}")
+                self._record_validators(key, None, response.headers)
+                return True
             response.raise_for_status()
             
-            data = response.json()
+            if use_stream:
+                response.raw.decode_content = True
+                try:
+                    record_count = self._write_json_stream(response.raw, filepath, pretty)
+                finally:
+                    response.close()
+            else:
+                record_count = self._save_json(filepath, _response_json(response), pretty)
+            self._record_validators(key, filepath, response.headers)
+                
+            self.logger.info(f"Successfully saved JSON data to: {filepath}")
+            self.logger.info(f"Records downloaded: {record_count if record_count is not None else 'N/A'}")
+            return True
             
-            # Generate filename if not provided
-            if not filename:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"{endpoint.replace('/', '_')}_{timestamp}.json"
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"Request error: {e}")
+            return False
+        except _JSON_ERRORS as e:
+            self.logger.error(f"JSON decode error: {e}")
+            return False
+        except Exception as e:
+            self.logger.error(f"Unexpected error: {e}")
+            return False
             
-            # Ensure .json extension
-            if not filename.endswith('.json'):
-                filename += '.json'
-                
-            filepath = os.path.join(self.output_dir, filename)
+    def _output_path(self, endpoint: str, filename: Optional[str], ext: str, tag: str = '') -> str:
+        """
+        Resolve the output path for a download, generating a name if needed
+        
+        Args:
+            endpoint: API endpoint path
+            filename: Output filename, or None to name it after the endpoint
+            ext: Extension to ensure, including the dot
+            tag: Infix for generated names, e.g. '_paginated'
+            
+        Returns:
+            Path inside the output directory
+        """
+        if not filename:
+            filename = f"{_safe_endpoint_name(endpoint)}{tag}_{_timestamp()}{ext}"
+        elif not filename.endswith(ext):
+            filename += ext
+            
+        return os.path.join(self.output_dir, filename)
+        
+    @staticmethod
+    def _save_json(filepath: str, data: Any, pretty: bool = False) -> Optional[int]:
+        """Write decoded JSON and its metadata sidecar; returns the record count"""
+        record_count = len(data) if isinstance(data, list) else None
+        payload = _encode(data, pretty)
+        
+        with open(filepath, 'wb') as f:
+            f.write(payload)
+        write_meta_sidecar(filepath, record_count, hashlib.sha256(payload).hexdigest())
+        return record_count
+        
+    def async_client(self, max_connections: int = 8) -> 'httpx.AsyncClient':
+        """
+        Create an httpx.AsyncClient carrying this downloader's headers and auth
+        
+        Args:
+            max_connections: Connection pool size
+            
+        Returns:
+            httpx.AsyncClient, to be used as an async context manager
+        """
+        if httpx is None:
+            raise RuntimeError("httpx is required for async downloads (pip install httpx)")
+        
+        return httpx.AsyncClient(
+            headers=dict(self.session.headers),
+            auth=self.session.auth,
+            timeout=30,
+            limits=httpx.Limits(max_connections=max_connections),
+            transport=httpx.AsyncHTTPTransport(retries=3),
+        )
+        
+    async def download_json_data_async(self, client: 'httpx.AsyncClient', endpoint: str,
+                                       filename: str = None, params: Dict = None,
+                                       pretty: bool = False,
+                                       semaphore: Optional[asyncio.Semaphore] = None,
+                                       ignore_cache: bool = False) -> bool:
+        """
+        Download JSON data from API endpoint on an httpx.AsyncClient
+        
+        Behaves like download_json_data, so that many endpoints can be awaited
+        together instead of one after another.
+        
+        Args:
+            client: Client from async_client()
+            endpoint: API endpoint path
+            filename: Output filename (optional)
+            params: Query parameters (optional)
+            pretty: Indent the output by 2 spaces
+            semaphore: Optional semaphore limiting requests in flight
+            ignore_cache: Download even if a copy younger than cache_ttl exists
+            
+        Returns:
+            bool: Success status
+        """
+        try:
+            url = f"{self.base_url}/{endpoint.lstrip('/')}"
+            self.logger.info(f"Downloading JSON data from: {url}")
+            
+            filepath = self._output_path(endpoint, filename, '.json')
+            key = self._validator_key(endpoint, params, '.json')
+            cached_file = None if ignore_cache else self._fresh_download(key, filepath, filename)
+            if cached_file:
+                self.logger.info(f"Cache hit, reusing recent download: {cached_file}")
+                return True
+            headers, cached_file = self._conditional_headers(key, filepath, filename)
+            
+            if semaphore is not None:
+                async with semaphore:
+                    response = await client.get(url, params=params, headers=headers)
+            else:
+                response = await client.get(url, params=params, headers=headers)
+            if response.status_code == 304:
+                self.logger.info(f"Not modified since last download: {cached_file}")
+                await asyncio.to_thread(self._record_validators, key, None, response.headers)
+                return True
+            response.raise_for_status()
+            
+            record_count = await asyncio.to_thread(self._save_json, filepath, _response_json(response), pretty)
+            await asyncio.to_thread(self._record_validators, key, filepath, response.headers)
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-                
             self.logger.info(f"Successfully saved JSON data to: {filepath}")
-            self.logger.info(f"Records downloaded: {len(data) if isinstance(data, list) else 'N/A'}")
+            self.logger.info(f"Records downloaded: {record_count if record_count is not None else 'N/A'}")
             return True
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             self.logger.error(f"Request error: {e}")
             return False
         except json.JSONDecodeError as e:
@@ -117,14 +685,90 @@ class APIDataDownloader:
             self.logger.error(f"Unexpected error: {e}")
             return False
             
-    def download_csv_data(self, endpoint: str, filename: str = None, params: Dict = None) -> bool:
+    @staticmethod
+    def _write_json_stream(source, filepath: str, pretty: bool = False) -> Optional[int]:
+        """
+        Re-encode a streamed JSON body to filepath
+        
+        Top-level arrays are decoded and written one element at a time. The file
+        is written to a .part path and renamed into place, and its metadata
+        sidecar is written from a hash computed on the way through.
+        
+        Args:
+            source: File-like object yielding the response body
+            filepath: Output path
+            pretty: Indent the output by 2 spaces
+            
+        Returns:
+            Number of records for an array body, otherwise None
+        """
+        events = ijson.parse(source, use_float=True)
+        first = next(events)
+        events = chain([first], events)
+        digest = hashlib.sha256()
+        
+        tmp_path = filepath + '.part'
+        try:
+            with open(tmp_path, 'wb') as f:
+                def write(data: bytes):
+                    digest.update(data)
+                    f.write(data)
+                
+                if first[1] == 'start_array':
+                    writer = _JSONArrayWriter(write, pretty)
+                    for record in ijson.items(events, 'item'):
+                        writer.append(record)
+                    writer.close()
+                    count = writer.count
+                else:
+                    count = None
+                    write(_encode(next(ijson.items(events, '')), pretty))
+                    for _ in events:  # Reject trailing data, as response.json() would
+                        pass
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        
+        write_meta_sidecar(filepath, count, digest.hexdigest())
+        return count
+            
+    def download_json_batch(self, jobs: List[Tuple[str, Optional[str], Optional[Dict]]],
+                            max_workers: int = 4) -> List[bool]:
+        """
+        Download several JSON queries concurrently
+        
+        Requests are issued from a small thread pool over the shared session, so
+        the round-trips overlap instead of running back to back.
+        
+        Args:
+            jobs: (endpoint, filename, params) tuples, as for download_json_data
+            max_workers: Maximum number of requests in flight
+            
+        Returns:
+            List of success flags, in the same order as jobs
+        """
+        if not jobs:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as pool:
+            return list(pool.map(lambda job: self.download_json_data(*job), jobs))
+            
+    def download_csv_data(self, endpoint: str, filename: str = None, params: Dict = None,
+                          progress: Optional[Callable[[int, Optional[int]], None]] = None) -> bool:
         """
         Download CSV data from API endpoint
         
+        The body is requested gzip-compressed and decompressed by urllib3 as it
+        is copied to disk.
+        
         Args:
             endpoint: API endpoint path
             filename: Output filename (optional)
             params: Query parameters (optional)
+            progress: Called after each block with (bytes received, Content-Length
+                or None); both count bytes on the wire, i.e. before decompression
             
         Returns:
             bool: Success status
@@ -133,23 +777,39 @@ class APIDataDownloader:
             url = f"{self.base_url}/{endpoint.lstrip('/')}"
             self.logger.info(f"Downloading CSV data from: {url}")
             
-            response = self.session.get(url, params=params, timeout=30, stream=True)
-            response.raise_for_status()
+            filepath = self._output_path(endpoint, filename, '.csv')
+            key = self._validator_key(endpoint, params, '.csv')
+            headers, cached_file = self._conditional_headers(key, filepath, filename)
+            headers['Accept-Encoding'] = 'gzip, deflate'
             
-            # Generate filename if not provided
-            if not filename:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"{endpoint.replace('/', '_')}_{timestamp}.csv"
-            
-            # Ensure .csv extension
-            if not filename.endswith('.csv'):
-                filename += '.csv'
-                
-            filepath = os.path.join(self.output_dir, filename)
+            response = self.session.get(url, params=params, timeout=30, stream=True,
+                                        headers=headers)
+            if response.status_code == 304:
+                response.close()
+                self.logger.info(f"Not modified since last download: {cached_file}")
+                self._record_validators(key, None, response.headers)
+                return True
+            response.raise_for_status()
             
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            # Copy the decoded body straight from the socket in 1 MiB blocks
+            raw = response.raw
+            raw.decode_content = True
+            try:
+                with open(filepath, 'wb') as f:
+                    if progress is None:
+                        shutil.copyfileobj(raw, f, length=_COPY_BUFFER_SIZE)
+                    else:
+                        length = response.headers.get('Content-Length')
+                        total = int(length) if length and length.isdigit() else None
+                        while True:
+                            block = raw.read(_COPY_BUFFER_SIZE)
+                            if not block:
+                                break
+                            f.write(block)
+                            progress(raw.tell(), total)
+            finally:
+                response.close()
+            self._record_validators(key, filepath, response.headers)
                     
             self.logger.info(f"Successfully saved CSV data to: {filepath}")
             return True
@@ -161,12 +821,88 @@ class APIDataDownloader:
             self.logger.error(f"Unexpected error: {e}")
             return False
             
+    # Keys that wrap the records of a paginated response, in probe order
+    _ENVELOPE_KEYS = ('data', 'results', 'items', 'records')
+    
+    @classmethod
+    def _page_records(cls, data: Any, envelope_key: Optional[str] = None) -> Any:
+        """Extract the records from one page, handling different response formats"""
+        if not isinstance(data, dict):
+            return data
+        if envelope_key is not None:
+            return data.get(envelope_key, data)
+        return next((data[key] for key in cls._ENVELOPE_KEYS if key in data), data)
+            
+    def _page_client(self) -> Optional['httpx.Client']:
+        """
+        HTTP/2 client for page requests, or None to use the requests session
+        
+        The client is capped at one connection, over which concurrent page
+        requests run as separate streams. It is created on first use so that
+        it picks up headers and auth set after construction. Failed connection
+        attempts are retried by the transport; retryable statuses by
+        _client_get.
+        """
+        if not self.use_http2:
+            return None
+        if self._http2_client is None:
+            self._http2_client = httpx.Client(
+                headers=dict(self.session.headers),
+                auth=self.session.auth,
+                timeout=30,
+                transport=httpx.HTTPTransport(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=1, max_keepalive_connections=1),
+                    retries=_RETRY_TOTAL,
+                ),
+            )
+        return self._http2_client
+    
+    def _client_get(self, client: 'httpx.Client', url: str, params: Dict) -> 'httpx.Response':
+        """
+        GET through the HTTP/2 client, retrying 429/5xx responses like the session
+        
+        Waits out Retry-After when the server sends it, otherwise backs off
+        exponentially with the session's backoff factor.
+        """
+        for attempt in range(_RETRY_TOTAL + 1):
+            response = client.get(url, params=params)
+            if response.status_code not in _RETRY_STATUSES or attempt == _RETRY_TOTAL:
+                return response
+            try:
+                delay = self._retry.parse_retry_after(response.headers.get('Retry-After') or '')
+            except InvalidHeader:
+                delay = None
+            if delay is None:
+                delay = _RETRY_BACKOFF * (2 ** attempt) if attempt else 0
+            self.logger.warning(f"HTTP {response.status_code} from {url}, retrying in {delay:.1f}s")
+            response.close()
+            time.sleep(delay)
+        
+    def _fetch_page(self, url: str, params: Dict, client: Optional['httpx.Client'] = None) -> Any:
+        """Fetch and decode one page of a paginated endpoint"""
+        if client is not None:
+            response = self._client_get(client, url, params)
+        else:
+            response = self.session.get(url, params=params, timeout=30)
+        response.raise_for_status()
+        return _response_json(response)
+            
     def download_paginated_data(self, endpoint: str, filename: str = None, 
                               page_param: str = 'page', limit_param: str = 'limit',
-                              page_size: int = 100, max_pages: int = None) -> bool:
+                              page_size: int = 100, max_pages: int = None,
+                              concurrent_pages: int = 4, streaming: bool = True,
+                              pretty: bool = False, envelope_key: Optional[str] = None,
+                              rate_limit: Optional[float] = None) -> bool:
         """
         Download paginated data from API
         
+        Up to concurrent_pages requests are kept in flight ahead of the page
+        being processed; pages are still consumed in order, and requests for
+        pages past the last one are cancelled where possible. Records are
+        written to disk as each page arrives, so memory use is bounded by the
+        page size rather than the total download.
+        
         Args:
             endpoint: API endpoint path
             filename: Output filename (optional)
@@ -174,75 +910,97 @@ class APIDataDownloader:
             limit_param: Parameter name for page size
             page_size: Number of records per page
             max_pages: Maximum number of pages to download
+            concurrent_pages: Maximum number of page requests in flight
+            streaming: Write NDJSON (one record per line, .ndjson); False writes
+                a single JSON array (.json) as before
+            pretty: Indent the JSON array output by 2 spaces (ignored for NDJSON)
+            envelope_key: Key holding each page's records, if known; by default
+                'data', 'results', 'items' and 'records' are tried in turn
+            rate_limit: Maximum page requests per second (unlimited by default)
             
         Returns:
             bool: Success status
         """
+        extension = '.ndjson' if streaming else '.json'
+        if filename and streaming and filename.endswith('.json'):
+            filename = filename[:-len('.json')] + extension
+            
+        filepath = self._output_path(endpoint, filename, extension, '_paginated')
+        tmp_path = filepath + '.part'
+        
         try:
-            all_data = []
+            total_records = 0
             page = 1
+            next_page = 1
+            url = f"{self.base_url}/{endpoint.lstrip('/')}"
+            pending = deque()
+            bucket = _TokenBucket(rate_limit) if rate_limit else None
+            client = self._page_client()
             
-            while True:
-                if max_pages and page > max_pages:
-                    break
-                    
-                params = {page_param: page, limit_param: page_size}
-                url = f"{self.base_url}/{endpoint.lstrip('/')}"
-                
-                self.logger.info(f"Downloading page {page} from: {url}")
-                
-                response = self.session.get(url, params=params, timeout=30)
-                response.raise_for_status()
+            with open(tmp_path, 'wb') as f, \
+                    ThreadPoolExecutor(max_workers=concurrent_pages) as pool:
+                def prefetch():
+                    nonlocal next_page
+                    while len(pending) < concurrent_pages and not (max_pages and next_page > max_pages):
+                        if bucket is not None:
+                            bucket.take()
+                        if self.logger.isEnabledFor(logging.INFO):
+                            self.logger.info(f"Downloading page {next_page} from: {url}")
+                        params = {page_param: next_page, limit_param: page_size}
+                        pending.append(pool.submit(self._fetch_page, url, params, client))
+                        next_page += 1
                 
-                data = response.json()
-                
-                # Handle different response formats
-                if isinstance(data, dict):
-                    if 'data' in data:
-                        page_data = data['data']
-                    elif 'results' in data:
-                        page_data = data['results']
-                    else:
-                        page_data = data
+                # Chosen once rather than per record
+                if streaming:
+                    array = None
+                    write_record = lambda record: f.write(_encode(record) + b'\n')
                 else:
-                    page_data = data
-                    
-                if not page_data or len(page_data) == 0:
-                    break
+                    array = _JSONArrayWriter(f.write, pretty)
+                    write_record = array.append
                     
-                all_data.extend(page_data if isinstance(page_data, list) else [page_data])
+                try:
+                    prefetch()
+                    while pending:
+                        data = pending.popleft().result()
+                        page_data = self._page_records(data, envelope_key)
+                            
+                        if not page_data or len(page_data) == 0:
+                            break
+                            
+                        records = page_data if isinstance(page_data, list) else [page_data]
+                        for record in records:
+                            write_record(record)
+                        total_records += len(records)
+                        
+                        # Check if there are more pages
+                        if len(page_data) < page_size:
+                            break
+                            
+                        page += 1
+                        prefetch()
+                finally:
+                    for future in pending:
+                        future.cancel()
                 
-                # Check if there are more pages
-                if len(page_data) < page_size:
-                    break
-                    
-                page += 1
-                time.sleep(0.1)  # Be nice to the API
-                
-            # Save all collected data
-            if not filename:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"{endpoint.replace('/', '_')}_paginated_{timestamp}.json"
-                
-            if not filename.endswith('.json'):
-                filename += '.json'
-                
-            filepath = os.path.join(self.output_dir, filename)
+                if array is not None:
+                    array.close()
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(all_data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, filepath)
                 
             self.logger.info(f"Successfully saved paginated data to: {filepath}")
-            self.logger.info(f"Total records downloaded: {len(all_data)}")
+            self.logger.info(f"Total records downloaded: {total_records}")
             self.logger.info(f"Total pages processed: {page - 1}")
             return True
             
-        except requests.exceptions.RequestException as e:
+        except _REQUEST_ERRORS as e:
             self.logger.error(f"Request error: {e}")
             return False
         except Exception as e:
             self.logger.error(f"Unexpected error: {e}")
             return False
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
 
 
 def main():
@@ -253,7 +1011,8 @@ def main():
     OUTPUT_DIR = "data"
     
     # Initialize downloader
-    downloader = APIDataDownloader(API_BASE_URL, OUTPUT_DIR)
+    # Reuse downloads from the last hour instead of fetching them again
+    downloader = APIDataDownloader(API_BASE_URL, OUTPUT_DIR, cache_ttl=3600)
     
     # Example: Set authentication if needed
     # downloader.set_authentication('bearer', token='your_token_here')
@@ -264,37 +1023,35 @@ def main():
     print(f"🌐 API Base URL: {API_BASE_URL}")
     print("-" * 50)
     
-    # Example downloads from CMS.gov
-    success_count = 0
-    total_downloads = 0
+    # Example downloads from CMS.gov, fetched concurrently
+    jobs = []
     
     # Download first 10 records from the CMS dataset
-    total_downloads += 1
     cms_params = {
         'query': '[SELECT * FROM a678955c-467c-5df1-a8bf-c94d22c86247][LIMIT 10]',
         'show_db_columns': ''
     }
-    if downloader.download_json_data('sql', 'cms_data_sample.json', params=cms_params):
-        success_count += 1
+    jobs.append(('sql', 'cms_data_sample.json', cms_params))
         
     # Download larger dataset (100 records)
-    total_downloads += 1
     cms_params_large = {
         'query': '[SELECT * FROM a678955c-467c-5df1-a8bf-c94d22c86247][LIMIT 100]',
         'show_db_columns': ''
     }
-    if downloader.download_json_data('sql', 'cms_data_100.json', params=cms_params_large):
-        success_count += 1
+    jobs.append(('sql', 'cms_data_100.json', cms_params_large))
         
     # Download all data (remove LIMIT for full dataset - be careful with large datasets!)
-    total_downloads += 1
     cms_params_all = {
         'query': '[SELECT * FROM a678955c-467c-5df1-a8bf-c94d22c86247]',
         'show_db_columns': ''
     }
+    jobs.append(('sql', 'cms_data_full.json', cms_params_all))
     print("⚠️  Downloading full dataset - this may take a while...")
-    if downloader.download_json_data('sql', 'cms_data_full.json', params=cms_params_all):
-        success_count += 1
+    
+    results = downloader.download_json_batch(jobs)
+    downloader.close()
+    success_count = sum(results)
+    total_downloads = len(jobs)
     
     print("-" * 50)
     print(f"✅ Download completed: {success_count}/{total_downloads} successful")
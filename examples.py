@@ -4,16 +4,55 @@ Example usage of the API data downloader
 """
 
 from download_api_data import APIDataDownloader
+import asyncio
 import os
 
+# Maximum requests in flight per API
+MAX_CONCURRENT_DOWNLOADS = 8
 
-def example_ecommerce_download():
+# Seconds for which earlier downloads are reused instead of hitting the API again
+CACHE_TTL = 3600
+
+
+async def download_all(downloader: APIDataDownloader, downloads, output_dir: str):
+    """
+    Download a list of endpoints concurrently
+    
+    Args:
+        downloader: APIDataDownloader for the target API
+        downloads: (endpoint, filename, description[, params]) tuples
+        output_dir: Output folder, for progress messages
+        
+    Returns:
+        List of success flags, in the same order as downloads
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+    
+    async def fetch(client, endpoint, filename, description, params=None):
+        print(f"\n📥 {description}...")
+        success = await downloader.download_json_data_async(
+            client, endpoint, filename, params=params, semaphore=semaphore
+        )
+        if success:
+            print(f"✅ Saved to {output_dir}/{filename}")
+        else:
+            print(f"❌ Failed to download {endpoint}")
+        return success
+    
+    async with downloader.async_client(MAX_CONCURRENT_DOWNLOADS) as client:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(fetch(client, *job)) for job in downloads]
+    
+    return [task.result() for task in tasks]
+
+
+async def example_ecommerce_download():
     """Example: Download e-commerce related data"""
     print("🛍️  E-commerce Data Download Example")
     print("=" * 50)
     
     # Example with a free e-commerce API
-    downloader = APIDataDownloader("https://fakestoreapi.com", "data/ecommerce")
+    downloader = APIDataDownloader("https://fakestoreapi.com", "data/ecommerce", cache_ttl=CACHE_TTL)
     
     downloads = [
         ("products", "all_products.json", "Downloading all products"),
@@ -22,21 +61,16 @@ def example_ecommerce_download():
         ("carts", "carts.json", "Downloading shopping carts")
     ]
     
-    for endpoint, filename, description in downloads:
-        print(f"\n📥 {description}...")
-        success = downloader.download_json_data(endpoint, filename)
-        if success:
-            print(f"✅ Saved to data/ecommerce/{filename}")
-        else:
-            print(f"❌ Failed to download {endpoint}")
+    await download_all(downloader, downloads, "data/ecommerce")
 
 
-def example_jsonplaceholder_download():
+async def example_jsonplaceholder_download():
     """Example: Download data from JSONPlaceholder API"""
     print("\n📄 JSONPlaceholder Data Download Example")
     print("=" * 50)
     
-    downloader = APIDataDownloader("https://jsonplaceholder.typicode.com", "data/jsonplaceholder")
+    downloader = APIDataDownloader("https://jsonplaceholder.typicode.com", "data/jsonplaceholder",
+                                   cache_ttl=CACHE_TTL)
     
     # Download different types of data
     downloads = [
@@ -45,25 +79,15 @@ def example_jsonplaceholder_download():
         ("comments", "comments.json", "Downloading comments"),
         ("albums", "albums.json", "Downloading albums"),
         ("photos", "photos.json", "Downloading photos (this might be large!)"),
-        ("todos", "todos.json", "Downloading todos")
+        ("todos", "todos.json", "Downloading todos"),
+        # Example with parameters
+        ("posts", "user_1_posts.json", "Downloading posts for user 1", {"userId": 1})
     ]
     
-    for endpoint, filename, description in downloads:
-        print(f"\n📥 {description}...")
-        success = downloader.download_json_data(endpoint, filename)
-        if success:
-            print(f"✅ Saved to data/jsonplaceholder/{filename}")
-        else:
-            print(f"❌ Failed to download {endpoint}")
-            
-    # Example with parameters
-    print(f"\n📥 Downloading posts for user 1...")
-    success = downloader.download_json_data("posts", "user_1_posts.json", params={"userId": 1})
-    if success:
-        print(f"✅ Saved to data/jsonplaceholder/user_1_posts.json")
+    await download_all(downloader, downloads, "data/jsonplaceholder")
 
 
-def example_custom_api():
+async def example_custom_api():
     """Example: Template for your own API"""
     print("\n🔧 Custom API Example Template")
     print("=" * 50)
@@ -79,7 +103,7 @@ def example_custom_api():
         print("⚠️  Please update the API_URL and API_KEY variables in this function")
         return
     
-    downloader = APIDataDownloader(API_URL, "data/custom")
+    downloader = APIDataDownloader(API_URL, "data/custom", cache_ttl=CACHE_TTL)
     
     # Set authentication (uncomment and modify as needed)
     # downloader.set_authentication('bearer', token=API_KEY)
@@ -91,11 +115,19 @@ def example_custom_api():
         # ("endpoint2", "filename2.json"),
     ]
     
-    for endpoint, filename in endpoints:
-        print(f"\n📥 Downloading {endpoint}...")
-        success = downloader.download_json_data(endpoint, filename)
-        if success:
-            print(f"✅ Saved to data/custom/{filename}")
+    await download_all(
+        downloader,
+        [(endpoint, filename, f"Downloading {endpoint}") for endpoint, filename in endpoints],
+        "data/custom",
+    )
+
+
+async def main_async():
+    """Run all examples"""
+    # Run examples
+    await example_jsonplaceholder_download()
+    await example_ecommerce_download()
+    await example_custom_api()
 
 
 def main():
@@ -107,10 +139,7 @@ def main():
     os.makedirs("data", exist_ok=True)
     
     try:
-        # Run examples
-        example_jsonplaceholder_download()
-        example_ecommerce_download()
-        example_custom_api()
+        asyncio.run(main_async())
         
         print("\n" + "=" * 60)
         print("🎉 All examples completed!")
@@ -6,19 +6,118 @@ Simple HTTP endpoint for monitoring agent health in containerized environments.
 """
 
 import json
+import os
+import threading
 import time
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from functools import lru_cache
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from cms_agent import create_cms_agent
 from agent_integration import RAGDataManager
 
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    _dumps = lambda obj: json.dumps(obj, separators=(',', ':')).encode()
+
+
+@lru_cache(maxsize=1)
+def _get_agent():
+    """CMS agent shared by all requests (handlers are created per connection)"""
+    return create_cms_agent()
+
+
+@lru_cache(maxsize=1)
+def _get_rag():
+    """RAG data manager shared by all requests"""
+    return RAGDataManager(_get_agent())
+
+
+# Prometheus exposition for /metrics; %a renders floats exactly as str() does
+_METRICS_TEMPLATE = b"""# HELP cms_data_records Total number of CMS records
+# TYPE cms_data_records gauge
+cms_data_records %d
+
+# HELP cms_data_age_hours Age of data in hours
+# TYPE cms_data_age_hours gauge
+cms_data_age_hours %a
+
+# HELP cms_data_valid Data validation status (1=valid, 0=invalid)
+# TYPE cms_data_valid gauge
+cms_data_valid %d
+
+# HELP cms_data_file_size_mb Size of data file in MB
+# TYPE cms_data_file_size_mb gauge
+cms_data_file_size_mb %a
+"""
+
+# Seconds a validate/status result is reused, so bursts of probes and scrapes coalesce
+_CACHE_TTL = 2.0
+
+_cache = {'validate': (0.0, None), 'status': (0.0, None)}
+_cache_locks = {key: threading.Lock() for key in _cache}
+
+
+def _cached(key, fn, ttl=_CACHE_TTL):
+    """
+    Return fn() for key, reusing a result younger than ttl seconds
+    
+    Concurrent callers for the same key wait for the one computing it rather
+    than all calling fn.
+    """
+    ts, value = _cache[key]
+    if value is not None and time.monotonic() - ts < ttl:
+        return value
+    
+    with _cache_locks[key]:
+        ts, value = _cache[key]
+        now = time.monotonic()
+        if value is not None and now - ts < ttl:
+            return value
+        value = fn()
+        _cache[key] = (now, value)
+        return value
+
+
+def _validate():
+    """Cached agent.validate_data()"""
+    return _cached('validate', _get_agent().validate_data)
+
+
+# (mtime_ns, size) of agent_status.json when the shared agent last loaded it
+_status_file_key = None
+
+
+def _agent_status():
+    """
+    agent.get_status() with the status re-read from disk when it has changed
+    
+    The scheduler runs as a separate process and rewrites agent_status.json,
+    while the shared agent only loads it at construction.
+    """
+    global _status_file_key
+    agent = _get_agent()
+    try:
+        st = os.stat(agent._status_path)
+        key = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        key = None
+    if key is not None and key != _status_file_key:
+        agent.status = agent._load_status()
+        _status_file_key = key
+    return agent.get_status()
+
+
+def _status():
+    """Cached agent.get_status()"""
+    return _cached('status', _agent_status)
+
 
 class HealthCheckHandler(BaseHTTPRequestHandler):
     """HTTP handler for health checks"""
     
-    def __init__(self, *args, **kwargs):
-        self.agent = create_cms_agent()
-        self.rag_manager = RAGDataManager(self.agent)
-        super().__init__(*args, **kwargs)
+    # Keep-alive, so scrapers and probes reuse their connection
+    protocol_version = 'HTTP/1.1'
     
     def do_GET(self):
         """Handle GET requests"""
@@ -35,7 +134,7 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
         """Basic health check"""
         try:
             # Quick validation
-            validation = self.agent.validate_data()
+            validation = _validate()
             
             if validation.get('valid', False):
                 self._send_response(200, {
@@ -60,8 +159,8 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
     def _handle_status(self):
         """Detailed status information"""
         try:
-            status = self.agent.get_status()
-            validation = self.agent.validate_data()
+            status = _status()
+            validation = _validate()
             
             response = {
                 "agent_status": status,
@@ -80,42 +179,34 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
     def _handle_metrics(self):
         """Prometheus-style metrics"""
         try:
-            status = self.agent.get_status()
-            validation = self.agent.validate_data()
+            status = _status()
+            validation = _validate()
             
-            metrics = f"""# HELP cms_data_records Total number of CMS records
-# TYPE cms_data_records gauge
-cms_data_records {status['current_record_count']}
-
-# HELP cms_data_age_hours Age of data in hours
-# TYPE cms_data_age_hours gauge
-cms_data_age_hours {status['data_age_hours']}
-
-# HELP cms_data_valid Data validation status (1=valid, 0=invalid)
-# TYPE cms_data_valid gauge
-cms_data_valid {1 if validation.get('valid', False) else 0}
-
-# HELP cms_data_file_size_mb Size of data file in MB
-# TYPE cms_data_file_size_mb gauge
-cms_data_file_size_mb {validation.get('file_size_mb', 0)}
-"""
+            payload = _METRICS_TEMPLATE % (
+                status['current_record_count'],
+                status['data_age_hours'],
+                1 if validation.get('valid', False) else 0,
+                validation.get('file_size_mb', 0),
+            )
             
             self.send_response(200)
             self.send_header('Content-type', 'text/plain')
+            self.send_header('Content-Length', str(len(payload)))
             self.end_headers()
-            self.wfile.write(metrics.encode())
+            self.wfile.write(payload)
         
         except Exception as e:
             self._send_response(500, {"error": str(e)})
     
     def _send_response(self, status_code, data):
         """Send JSON response"""
+        payload = _dumps(data)
+        
         self.send_response(status_code)
         self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
         self.end_headers()
-        
-        response = json.dumps(data, indent=2)
-        self.wfile.write(response.encode())
+        self.wfile.write(payload)
     
     def log_message(self, format, *args):
         """Suppress default logging"""
@@ -124,7 +215,11 @@ cms_data_file_size_mb {validation.get('file_size_mb', 0)}
 
 def start_health_server(port=8080):
     """Start the health check server"""
-    server = HTTPServer(('', port), HealthCheckHandler)
+    # Create the agent once up front instead of on the first probe
+    _get_rag()
+    
+    # One thread per connection, so a slow /status does not hold up /health probes
+    server = ThreadingHTTPServer(('', port), HealthCheckHandler)
     print(f"Health check server running on port {port}")
     print(f"Endpoints: /health, /status, /metrics")
     server.serve_forever()
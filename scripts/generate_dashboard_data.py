@@ -5,33 +5,156 @@ This script reads the current agent status and data, then generates
 JSON files that the static dashboard can use.
 """
 
+import gzip
+import heapq
 import json
 import os
 import sys
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import logging
 
 # Add the parent directory to Python path
 sys.path.append(str(Path(__file__).parent.parent))
 
+try:
+    import orjson
+    _parse = orjson.loads
+    _dumps = lambda obj: orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _parse = json.loads
+    _dumps = lambda obj: json.dumps(obj, indent=2).encode()
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _loads(path):
+    """Parse a JSON file, handing the raw bytes straight to the decoder"""
+    return _parse(Path(path).read_bytes())
+
+# Parsed datasets keyed by path, with the (mtime_ns, size) they were parsed at
+_dataset_cache = {}
+
+def load_dataset(path):
+    """
+    Parse a dataset file, reusing the previous parse while the file is unchanged
+    
+    The generators below all read cms_full_dataset.json; with this cache it is
+    parsed once per run rather than once per generator.
+    """
+    path = Path(path)
+    st = path.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    
+    cached = _dataset_cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    
+    data = _loads(path)
+    _dataset_cache[path] = (key, data)
+    return data
+
+def _write_bytes(path, payload):
+    """
+    Atomically write payload to path
+    
+    The bytes go to a temporary sibling with a bare open/write/close on a raw
+    descriptor and are then renamed over path, so readers never see a
+    partially written file.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+def write_outputs(data_dir, outputs):
+    """
+    Serialize every output, then write the files back to back
+    
+    Each file also gets a gzip-compressed .gz sibling that a static web
+    server (e.g. nginx gzip_static) can serve without compressing per request.
+    
+    Args:
+        data_dir: Output directory
+        outputs: Mapping of file name to data, written in order
+    """
+    payloads = [(data_dir / name, _dumps(data)) for name, data in outputs.items()]
+    for path, payload in payloads:
+        _write_bytes(path, payload)
+        _write_bytes(path.with_name(path.name + ".gz"), gzip.compress(payload, compresslevel=6, mtime=0))
+        logger.info(f"Generated {path.name}")
+
 def ensure_data_directory():
     """Create web/data directory if it doesn't exist"""
     data_dir = Path("web/data")
     data_dir.mkdir(parents=True, exist_ok=True)
     return data_dir
 
+# Inputs whose (mtime_ns, size) decide whether the generated files are current
+SOURCE_FILES = [
+    Path("cms_data/agent_status.json"),
+    Path("cms_data/cms_full_dataset.json"),
+    Path("cms_data/cms_record_count.json"),
+    Path("cms_data/agent.log"),
+]
+
+def source_fingerprints():
+    """(mtime_ns, size) of each source file, None for missing ones"""
+    fingerprints = {}
+    for path in SOURCE_FILES:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            fingerprints[str(path)] = None
+        else:
+            fingerprints[str(path)] = [st.st_mtime_ns, st.st_size]
+    return fingerprints
+
+def outputs_up_to_date(data_dir, fingerprints):
+    """
+    Check whether the previous run already generated data from these sources
+    
+    Args:
+        data_dir: Output directory holding manifest.json
+        fingerprints: Current source_fingerprints()
+        
+    Returns:
+        True when the manifest records the same sources, was written today
+        (freshness is scored in days) and all of its files still exist
+    """
+    try:
+        manifest = _loads(data_dir / "manifest.json")
+    except (OSError, ValueError):
+        return False
+    
+    if not isinstance(manifest, dict) or manifest.get("sources") != fingerprints:
+        return False
+    if not str(manifest.get("generated_at", "")).startswith(date.today().isoformat()):
+        return False
+    return all((data_dir / name).exists() for name in manifest.get("files", []))
+
 def generate_status_data():
     """Generate agent status data"""
     status_file = Path("cms_data/agent_status.json")
     
     if status_file.exists():
         try:
-            with open(status_file, 'r') as f:
-                status_data = json.load(f)
+            status_data = _loads(status_file)
         except (json.JSONDecodeError, FileNotFoundError):
             status_data = {}
     else:
@@ -47,47 +170,248 @@ def generate_status_data():
     
     return status
 
-def generate_stats_data():
-    """Generate data statistics"""
-    cms_data_file = Path("cms_data/cms_full_dataset.json")
-    record_count_file = Path("cms_data/cms_record_count.json")
+RATING_FIELDS = ['hhcahps_survey_summary_star_rating', 'overall_rating', 'rating', 'star_rating']
+SURVEY_COUNT_FIELDS = ['number_of_completed_surveys', 'survey_count', 'surveys']
+
+def compute_all_metrics(cms_data_file=Path("cms_data/cms_full_dataset.json"),
+                        record_count_file=Path("cms_data/cms_record_count.json")):
+    """
+    Compute the stats, quality and insights data together
+    
+    The dataset is parsed once and its records are walked once, counting
+    ratings, checking completeness and keeping the top performers on the way.
     
+    Returns:
+        (stats, quality, insights) dicts
+    """
+    now = datetime.now()
     stats = {
         "record_count": 0,
         "data_size": 0,
         "last_update": None,
-        "generated_at": datetime.now().isoformat()
+        "generated_at": now.isoformat()
+    }
+    quality = {
+        "completeness": 100,
+        "validity": 100,
+        "freshness": 100,
+        "generated_at": now.isoformat()
+    }
+    insights = {
+        "rating_distribution": {"1": 0, "2": 0, "3": 0, "4": 0, "5": 0},
+        "top_performers": [],
+        "generated_at": now.isoformat()
     }
     
     if cms_data_file.exists():
-        stats["data_size"] = cms_data_file.stat().st_size
-        stats["last_update"] = datetime.fromtimestamp(
-            cms_data_file.stat().st_mtime
-        ).isoformat()
+        st = cms_data_file.stat()
+        stats["data_size"] = st.st_size
+        stats["last_update"] = datetime.fromtimestamp(st.st_mtime).isoformat()
+        
+        # Check freshness based on file age
+        file_age = now - datetime.fromtimestamp(st.st_mtime)
+        if file_age > timedelta(days=7):
+            quality["freshness"] = max(0, 100 - (file_age.days - 7) * 10)
         
-        # Try to count records directly from the file
         try:
-            with open(cms_data_file, 'r') as f:
-                data = json.load(f)
-                if isinstance(data, list):
-                    stats["record_count"] = len(data)
-                elif isinstance(data, dict) and 'records' in data:
-                    stats["record_count"] = len(data['records'])
-        except (json.JSONDecodeError, FileNotFoundError):
-            pass
+            data = load_dataset(cms_data_file)
+        except Exception as e:
+            logger.warning(f"Could not analyze data file: {e}")
+            quality["validity"] = 80  # Reduced if we can't parse
+            data = None
+        
+        if isinstance(data, dict) and 'records' in data:
+            stats["record_count"] = len(data['records'])
+        elif isinstance(data, list):
+            stats["record_count"] = len(data)
+            if data:
+                _scan_records(data, quality, insights)
+    else:
+        # No data file
+        quality["completeness"] = 0
+        quality["validity"] = 0
+        quality["freshness"] = 0
+        
+        # Use demo data if no real data available
+        insights["rating_distribution"] = {"1": 156, "2": 425, "3": 1203, "4": 3845, "5": 6439}
+        insights["top_performers"] = [
+            {"id": "257085", "name": "Provider 257085", "rating": 5, "survey_count": 1553},
+            {"id": "557061", "name": "Provider 557061", "rating": 5, "survey_count": 1546},
+            {"id": "397012", "name": "Provider 397012", "rating": 5, "survey_count": 1240}
+        ]
     
     if record_count_file.exists():
         try:
-            with open(record_count_file, 'r') as f:
-                count_data = json.load(f)
-                if isinstance(count_data, dict):
-                    stats["record_count"] = count_data.get("total_records", stats["record_count"])
-                elif isinstance(count_data, int):
-                    stats["record_count"] = count_data
+            count_data = _loads(record_count_file)
+            if isinstance(count_data, dict):
+                stats["record_count"] = count_data.get("total_records", stats["record_count"])
+            elif isinstance(count_data, int):
+                stats["record_count"] = count_data
         except (json.JSONDecodeError, FileNotFoundError):
             pass
     
-    return stats
+    return stats, quality, insights
+
+def _survey_count(provider):
+    """Survey count from the first usable count field, or 0"""
+    for count_field in SURVEY_COUNT_FIELDS:
+        if provider.get(count_field):
+            try:
+                return int(provider[count_field])
+            except (ValueError, TypeError):
+                pass
+    return 0
+
+def _scan_columns(ratings, surveys):
+    """
+    Rating histogram, high-rated count and top-10 indices over the rating columns
+    
+    Compiled with Numba when available. The top 10 are kept by insertion in
+    file order, so ties rank the same as a stable sort.
+    """
+    counts = np.zeros(6, dtype=np.int64)
+    top = np.empty(10, dtype=np.int64)
+    n_top = 0
+    high_rated = 0
+    for i in range(ratings.shape[0]):
+        rating = ratings[i]
+        if rating >= 1 and rating < 6:
+            counts[int(rating)] += 1
+        if rating >= 4.5:
+            high_rated += 1
+            pos = n_top
+            while pos > 0 and (ratings[top[pos - 1]] < rating or
+                               (ratings[top[pos - 1]] == rating and surveys[top[pos - 1]] < surveys[i])):
+                pos -= 1
+            if pos < 10:
+                if n_top < 10:
+                    n_top += 1
+                for j in range(n_top - 1, pos, -1):
+                    top[j] = top[j - 1]
+                top[pos] = i
+    return counts, high_rated, top[:n_top]
+
+if njit is not None:
+    _scan_columns = njit(cache=True, nogil=True)(_scan_columns)
+
+def _scan_records(records, quality, insights):
+    """
+    Fill in completeness, rating distribution and top performers from the records
+    
+    One pass over the records extracts a rating column (NaN where missing or
+    unparseable) and survey counts for the high-rated providers; the rating
+    histogram and top-10 selection then run on those columns in a Numba kernel,
+    vectorized with NumPy, or in plain Python, depending on what is installed.
+    """
+    nan = float('nan')
+    ratings = []
+    surveys = []
+    complete_records = 0
+    
+    for provider in records:
+        rating_val = nan
+        survey_count = 0
+        if isinstance(provider, dict):
+            # Check if key fields are present
+            if provider.get('cms_certification_number_ccn'):
+                complete_records += 1
+            
+            # Look for rating fields - adapt based on your data structure
+            rating_field = next((field for field in RATING_FIELDS if provider.get(field)), None)
+            if rating_field:
+                try:
+                    rating_val = float(provider[rating_field])
+                except (ValueError, TypeError):
+                    pass
+            
+            # Potential top performers (high rating threshold)
+            if rating_val >= 4.5:
+                survey_count = _survey_count(provider)
+        
+        ratings.append(rating_val)
+        surveys.append(survey_count)
+    
+    # Ratings count in the bucket of their integer part, e.g. 4.5 -> "4";
+    # top performers are ordered by rating then survey count, ties in file order
+    if np is not None:
+        rating_col = np.array(ratings, dtype=np.float64)
+        survey_col = np.array(surveys, dtype=np.int64)
+        
+        if njit is not None:
+            counts, high_rated_count, top = _scan_columns(rating_col, survey_col)
+            counts = counts.tolist()
+            top = top.tolist()
+        else:
+            buckets = np.trunc(rating_col)
+            buckets = buckets[(buckets >= 1) & (buckets <= 5)].astype(np.int8)
+            counts = np.bincount(buckets, minlength=6).tolist()
+            
+            high = np.flatnonzero(rating_col >= 4.5)
+            high_rated_count = len(high)
+            top = high[np.lexsort((high, -survey_col[high], -rating_col[high]))[:10]].tolist()
+    else:
+        counts = [0] * 6
+        for rating_val in ratings:
+            if 1 <= rating_val < 6:
+                counts[int(rating_val)] += 1
+        
+        high = [i for i, rating_val in enumerate(ratings) if rating_val >= 4.5]
+        high_rated_count = len(high)
+        top = heapq.nlargest(10, high, key=lambda i: (ratings[i], surveys[i]))
+    
+    rating_counts = {str(rating): counts[rating] for rating in range(1, 6)}
+    top_providers = []
+    for i in top:
+        provider_id = records[i].get("cms_certification_number_ccn", "unknown")
+        top_providers.append({
+            "id": str(provider_id),
+            "name": f"Provider {provider_id}",
+            "rating": ratings[i],
+            "survey_count": surveys[i]
+        })
+    
+    quality["completeness"] = (complete_records / len(records)) * 100
+    insights["rating_distribution"] = rating_counts
+    insights["top_performers"] = top_providers
+    
+    logger.info(f"Generated insights: {high_rated_count} top performers, rating distribution: {rating_counts}")
+
+def generate_stats_data():
+    """Generate data statistics"""
+    return compute_all_metrics()[0]
+
+# Activity type for log levels that decide it outright
+LEVEL_ACTIVITY_TYPES = {"ERROR": "error", "WARNING": "warning"}
+
+def tail_lines(path, n=10, block_size=8192):
+    """
+    Read the last n lines of a file by reading blocks backwards from the end
+    
+    Args:
+        path: File to read
+        n: Number of lines to return
+        block_size: Bytes read per step
+        
+    Returns:
+        Up to n lines as bytes, without their line endings
+    """
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        data = b''
+        # n + 1 newlines guarantee n whole lines, with or without a final newline
+        while pos > 0 and data.count(b'\n') <= n:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    
+    lines = data.split(b'\n')
+    if lines[-1] == b'':
+        lines.pop()
+    if pos > 0:
+        # The first line may have started before the blocks we read
+        lines = lines[1:]
+    return lines[-n:]
 
 def generate_activity_data():
     """Generate recent activity data from logs"""
@@ -96,11 +420,9 @@ def generate_activity_data():
     
     if log_file.exists():
         try:
-            with open(log_file, 'r') as f:
-                lines = f.readlines()
-            
             # Parse last 10 log entries
-            for line in lines[-10:]:
+            for line in tail_lines(log_file, 10):
+                line = line.decode('utf-8', errors='replace')
                 if line.strip():
                     # Simple log parsing
                     parts = line.strip().split(' - ', 2)
@@ -109,15 +431,13 @@ def generate_activity_data():
                         level = parts[1]
                         message = parts[2]
                         
-                        activity_type = "info"
-                        if "ERROR" in level:
-                            activity_type = "error"
-                        elif "WARNING" in level:
-                            activity_type = "warning"
-                        elif "download" in message.lower() and "complete" in message.lower():
-                            activity_type = "success"
-                        elif "download" in message.lower():
-                            activity_type = "info"
+                        activity_type = LEVEL_ACTIVITY_TYPES.get(level.strip())
+                        if activity_type is None:
+                            lowered = message.lower()
+                            if "download" in lowered and "complete" in lowered:
+                                activity_type = "success"
+                            else:
+                                activity_type = "info"
                         
                         activities.append({
                             "type": activity_type,
@@ -137,189 +457,58 @@ def generate_activity_data():
 
 def generate_quality_data():
     """Generate data quality metrics"""
-    cms_data_file = Path("cms_data/cms_full_dataset.json")
-    
-    quality = {
-        "completeness": 100,
-        "validity": 100,
-        "freshness": 100,
-        "generated_at": datetime.now().isoformat()
-    }
-    
-    if cms_data_file.exists():
-        # Check freshness based on file age
-        file_age = datetime.now() - datetime.fromtimestamp(cms_data_file.stat().st_mtime)
-        if file_age > timedelta(days=7):
-            quality["freshness"] = max(0, 100 - (file_age.days - 7) * 10)
-        
-        # Basic completeness check
-        try:
-            with open(cms_data_file, 'r') as f:
-                data = json.load(f)
-            
-            if isinstance(data, list) and len(data) > 0:
-                # Sample some records for completeness
-                sample_size = min(100, len(data))
-                complete_records = 0
-                
-                for i in range(0, len(data), len(data) // sample_size):
-                    record = data[i]
-                # Check if key fields are present
-                if isinstance(record, dict):
-                    key_fields = ['cms_certification_number_ccn']
-                    if all(field in record and record[field] for field in key_fields):
-                        complete_records += 1
-                
-                quality["completeness"] = (complete_records / sample_size) * 100
-                
-        except Exception as e:
-            logger.warning(f"Could not analyze data for quality: {e}")
-            quality["validity"] = 80  # Reduced if we can't parse
-    else:
-        # No data file
-        quality["completeness"] = 0
-        quality["validity"] = 0
-        quality["freshness"] = 0
-    
-    return quality
+    return compute_all_metrics()[1]
 
 def generate_insights_data():
     """Generate insights and analytics data"""
-    cms_data_file = Path("cms_data/cms_full_dataset.json")
-    
-    # Default insights
-    insights = {
-        "rating_distribution": {"1": 0, "2": 0, "3": 0, "4": 0, "5": 0},
-        "top_performers": [],
-        "generated_at": datetime.now().isoformat()
-    }
-    
-    if not cms_data_file.exists():
-        # Use demo data if no real data available
-        insights["rating_distribution"] = {"1": 156, "2": 425, "3": 1203, "4": 3845, "5": 6439}
-        insights["top_performers"] = [
-            {"id": "257085", "name": "Provider 257085", "rating": 5, "survey_count": 1553},
-            {"id": "557061", "name": "Provider 557061", "rating": 5, "survey_count": 1546},
-            {"id": "397012", "name": "Provider 397012", "rating": 5, "survey_count": 1240}
-        ]
-        return insights
-    
-    try:
-        with open(cms_data_file, 'r') as f:
-            data = json.load(f)
-        
-        if isinstance(data, list) and len(data) > 0:
-            # Analyze rating distribution
-            rating_counts = {"1": 0, "2": 0, "3": 0, "4": 0, "5": 0}
-            top_providers = []
-            
-            for provider in data:
-                if not isinstance(provider, dict):
-                    continue
-                    
-                # Look for rating fields - adapt based on your data structure
-                rating_field = None
-                for field in ['hhcahps_survey_summary_star_rating', 'overall_rating', 'rating', 'star_rating']:
-                    if field in provider and provider[field]:
-                        rating_field = field
-                        break
-                
-                if rating_field:
-                    try:
-                        rating = int(float(provider[rating_field]))
-                        if 1 <= rating <= 5:
-                            rating_counts[str(rating)] += 1
-                    except (ValueError, TypeError):
-                        pass
-                
-                # Collect potential top performers
-                if rating_field and provider.get(rating_field):
-                    try:
-                        rating_val = float(provider[rating_field])
-                        if rating_val >= 4.5:  # High rating threshold
-                            provider_id = provider.get("cms_certification_number_ccn", "unknown")
-                            survey_count = 0
-                            
-                            # Try to get survey count from various fields
-                            for count_field in ['number_of_completed_surveys', 'survey_count', 'surveys']:
-                                if count_field in provider and provider[count_field]:
-                                    try:
-                                        survey_count = int(provider[count_field])
-                                        break
-                                    except (ValueError, TypeError):
-                                        pass
-                            
-                            top_providers.append({
-                                "id": str(provider_id),
-                                "name": f"Provider {provider_id}",
-                                "rating": rating_val,
-                                "survey_count": survey_count
-                            })
-                    except (ValueError, TypeError):
-                        pass
-            
-            insights["rating_distribution"] = rating_counts
-            
-            # Sort top performers by survey count and rating
-            top_providers.sort(key=lambda x: (x["rating"], x["survey_count"]), reverse=True)
-            insights["top_performers"] = top_providers[:10]
-            
-            logger.info(f"Generated insights: {len(top_providers)} top performers, rating distribution: {rating_counts}")
-            
-    except Exception as e:
-        logger.warning(f"Could not analyze data file for insights: {e}")
-        # Keep default/demo data
-    
-    return insights
+    return compute_all_metrics()[2]
 
-def main():
-    """Main function to generate all dashboard data"""
+def main(force=False):
+    """
+    Main function to generate all dashboard data
+    
+    Args:
+        force: Regenerate even when the sources are unchanged since the last run
+    """
     logger.info("Starting dashboard data generation...")
     
     # Ensure output directory exists
     data_dir = ensure_data_directory()
     
+    fingerprints = source_fingerprints()
+    if not force and outputs_up_to_date(data_dir, fingerprints):
+        logger.info("Dashboard data is up to date, nothing to generate")
+        return
+    
     # Generate all data files
     try:
+        outputs = {}
+        
         # Agent status
-        status_data = generate_status_data()
-        with open(data_dir / "status.json", "w") as f:
-            json.dump(status_data, f, indent=2)
-        logger.info("Generated status.json")
+        outputs["status.json"] = generate_status_data()
         
-        # Data statistics
-        stats_data = generate_stats_data()
-        with open(data_dir / "stats.json", "w") as f:
-            json.dump(stats_data, f, indent=2)
-        logger.info("Generated stats.json")
+        # Data statistics, quality and insights, from one pass over the dataset
+        stats_data, quality_data, insights_data = compute_all_metrics()
+        outputs["stats.json"] = stats_data
         
         # Recent activity
-        activity_data = generate_activity_data()
-        with open(data_dir / "activity.json", "w") as f:
-            json.dump(activity_data, f, indent=2)
-        logger.info("Generated activity.json")
+        outputs["activity.json"] = generate_activity_data()
         
         # Data quality
-        quality_data = generate_quality_data()
-        with open(data_dir / "quality.json", "w") as f:
-            json.dump(quality_data, f, indent=2)
-        logger.info("Generated quality.json")
+        outputs["quality.json"] = quality_data
         
         # Insights and analytics
-        insights_data = generate_insights_data()
-        with open(data_dir / "insights.json", "w") as f:
-            json.dump(insights_data, f, indent=2)
-        logger.info("Generated insights.json")
+        outputs["insights.json"] = insights_data
         
-        # Create a manifest file
-        manifest = {
+        # Create a manifest file, written last so it only describes a complete set
+        outputs["manifest.json"] = {
             "generated_at": datetime.now().isoformat(),
-            "files": ["status.json", "stats.json", "activity.json", "quality.json", "insights.json"],
-            "generator_version": "1.0.0"
+            "files": list(outputs),
+            "generator_version": "1.0.0",
+            "sources": fingerprints
         }
-        with open(data_dir / "manifest.json", "w") as f:
-            json.dump(manifest, f, indent=2)
-        logger.info("Generated manifest.json")
+        
+        write_outputs(data_dir, outputs)
         
         logger.info("Dashboard data generation completed successfully!")
         
@@ -328,4 +517,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
+    main(force="--force" in sys.argv[1:])
@@ -2,19 +2,20 @@
 Enhanced Dashboard API with secure API key management and rate limiting
 """
 
-from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import json
 import os
 import sys
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 from pathlib import Path
 import time
-from collections import defaultdict, deque
+from collections import defaultdict, OrderedDict
+from bisect import bisect_left
 import hashlib
 import asyncio
 from functools import wraps
@@ -22,6 +23,31 @@ from functools import wraps
 # For environment variables
 from dotenv import load_dotenv
 
+try:
+    import orjson
+    _parse = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _parse = json.loads
+    _dumps = lambda obj: json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# The pooled Claude API client multiplexes over HTTP/2 when h2 is installed
+try:
+    import h2  # noqa: F401
+    _HTTP2 = httpx is not None
+except ImportError:
+    _HTTP2 = False
+
 # Add the current directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
@@ -50,8 +76,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Rate limiting storage
-rate_limit_storage = defaultdict(lambda: deque())
+# Rate limiting storage: accepted request times per (client ip, endpoint), oldest first
+rate_limit_storage: Dict[Tuple[str, str], List[float]] = {}
+RATE_LIMIT_SWEEP_INTERVAL = 60.0
+_last_rate_limit_sweep = 0.0
 
 # Configuration from environment
 class Config:
@@ -73,38 +101,293 @@ class Config:
 
 config = Config()
 
+def _loads(path: Path) -> Any:
+    """Parse a JSON file, handing the raw bytes straight to the decoder"""
+    return _parse(path.read_bytes())
+
+# Parsed datasets keyed by path, with the (mtime_ns, size) they were parsed at
+_dataset_cache: Dict[Path, Tuple[Tuple[int, int], Any]] = {}
+
+def load_dataset(path: Path) -> Any:
+    """
+    Parse a dataset file, reusing the previous parse while the file is unchanged
+    
+    After the first request, serving the dataset costs a stat() call instead
+    of a full parse. Endpoints call this through asyncio.to_thread so a parse
+    never blocks the event loop.
+    """
+    st = path.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    
+    cached = _dataset_cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    
+    data = _loads(path)
+    _dataset_cache[path] = (key, data)
+    return data
+
+def file_etag(path: Path) -> str:
+    """
+    Quoted ETag for the current version of a data file, from its path, mtime and size
+    
+    The tag only needs to tell versions apart, so the non-cryptographic xxh3
+    is used when xxhash is installed.
+    """
+    st = path.stat()
+    key = f"{path}:{st.st_mtime_ns}:{st.st_size}".encode()
+    if xxhash is not None:
+        digest = xxhash.xxh3_64_hexdigest(key)
+    else:
+        digest = hashlib.blake2b(key, digest_size=8).hexdigest()
+    return f'"{digest}"'
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Tag the response with etag, or answer 304 when the client already has it
+    
+    Args:
+        request: Incoming request, checked for If-None-Match
+        response: Response whose headers receive the ETag
+        etag: Current ETag of the data behind the endpoint
+        
+    Returns:
+        A 304 response to return as-is, or None to build the full response
+    """
+    response.headers["ETag"] = etag
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or etag in (tag.strip() for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+class SearchIndex:
+    """
+    Trigram index over the lowercased field values of a record list
+    
+    A substring query only needs to check the records that contain every
+    trigram of the query, so matching no longer stringifies the whole
+    dataset on each request. Each record's values are also kept as one
+    lowercased blob, so confirming a candidate is a single substring test.
+    """
+    
+    # Joins the values in a blob; a query containing it is matched per value
+    SEPARATOR = "\x00"
+    
+    def __init__(self, records: List[Any]):
+        self.records = records
+        self.blobs: List[str] = []
+        self.trigrams: Dict[str, set] = defaultdict(set)
+        
+        for idx, record in enumerate(records):
+            values = [str(value).lower() for value in record.values() if value is not None] \
+                if isinstance(record, dict) else []
+            self.blobs.append(self.SEPARATOR.join(values))
+            
+            grams = {value[i:i + 3] for value in values for i in range(len(value) - 2)}
+            for gram in grams:
+                self.trigrams[gram].add(idx)
+    
+    def search(self, query: str) -> List[int]:
+        """
+        Indices of records with a field value containing the query, in file order
+        
+        Args:
+            query: Case-insensitive substring to look for
+            
+        Returns:
+            Matching record indices
+        """
+        query = query.lower()
+        
+        if len(query) >= 3:
+            # Intersect the rarest trigram sets first
+            postings = sorted(
+                (self.trigrams.get(query[i:i + 3], set()) for i in range(len(query) - 2)),
+                key=len
+            )
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                if not candidates:
+                    break
+                candidates &= posting
+            candidates = sorted(candidates)
+        else:
+            candidates = range(len(self.blobs))
+        
+        # Trigrams can match across positions, so confirm the substring
+        if self.SEPARATOR in query:
+            records = self.records
+            return [
+                idx for idx in candidates
+                if isinstance(records[idx], dict) and any(
+                    query in str(value).lower()
+                    for value in records[idx].values()
+                    if value is not None
+                )
+            ]
+        
+        blobs = self.blobs
+        return [idx for idx in candidates if query in blobs[idx]]
+
+def build_rating_index(records: List[Any]) -> Dict[str, List[int]]:
+    """Map each star rating value to the indices of the records that carry it"""
+    index = defaultdict(list)
+    for idx, record in enumerate(records):
+        if isinstance(record, dict):
+            value = record.get('hhcahps_survey_summary_star_rating')
+            if isinstance(value, str):
+                index[value].append(idx)
+    return dict(index)
+
+# Record indexes keyed by (builder, dataset path), with the parsed record list they index
+_index_cache: Dict[Tuple[Any, Path], Tuple[Any, Any]] = {}
+
+def get_index(build, path: Path, records: List[Any]) -> Any:
+    """
+    Index built over a dataset, rebuilt whenever load_dataset re-parses it
+    
+    Args:
+        build: Callable building the index from the record list
+        path: Dataset path the records were loaded from
+        records: Record list returned by load_dataset
+        
+    Returns:
+        The cached or freshly built index
+    """
+    cached = _index_cache.get((build, path))
+    if cached is not None and cached[0] is records:
+        return cached[1]
+    
+    index = build(records)
+    _index_cache[(build, path)] = (records, index)
+    return index
+
+def _sweep_rate_limits(now: float, max_window: float):
+    """Forget clients whose newest request is older than the longest window"""
+    stale = [
+        key for key, timestamps in rate_limit_storage.items()
+        if not timestamps or now - timestamps[-1] > max_window
+    ]
+    for key in stale:
+        del rate_limit_storage[key]
+
+class ResponseCache:
+    """
+    LRU of serialized response bodies, bounded by total size in bytes
+    
+    Keys include the dataset ETag, so a changed dataset simply stops hitting
+    the old entries, which then age out.
+    """
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._bodies: "OrderedDict[Tuple[Any, ...], bytes]" = OrderedDict()
+    
+    def get(self, key: Tuple[Any, ...]) -> Optional[bytes]:
+        body = self._bodies.get(key)
+        if body is not None:
+            self._bodies.move_to_end(key)
+        return body
+    
+    def put(self, key: Tuple[Any, ...], body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        old = self._bodies.pop(key, None)
+        if old is not None:
+            self.size -= len(old)
+        self._bodies[key] = body
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, evicted = self._bodies.popitem(last=False)
+            self.size -= len(evicted)
+    
+    def clear(self):
+        self._bodies.clear()
+        self.size = 0
+
+response_cache = ResponseCache(max_bytes=int(os.getenv("RESPONSE_CACHE_BYTES", str(32 * 1024 * 1024))))
+
+def json_body_response(body: bytes, etag: str, cache_status: str) -> Response:
+    """JSON response for an already serialized body, tagged with its ETag and cache status"""
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "X-Cache": cache_status}
+    )
+
+# Record pages longer than this are streamed in chunks of STREAM_CHUNK_RECORDS
+STREAM_PAGE_RECORDS = 1000
+STREAM_CHUNK_RECORDS = 250
+
+def records_response(page_records: List[Any], meta: Dict[str, Any], headers: Dict[str, str]) -> Response:
+    """
+    Serialize a records page straight to JSON bytes, bypassing FastAPI's encoder
+    
+    Args:
+        page_records: Records on the page
+        meta: Remaining top-level fields (total, page, ...), emitted after "records"
+        headers: Extra response headers
+        
+    Returns:
+        A Response, or a StreamingResponse emitting the records array in
+        chunks for long pages
+    """
+    if len(page_records) <= STREAM_PAGE_RECORDS:
+        body = _dumps({"records": page_records, **meta})
+        return Response(content=body, media_type="application/json", headers=headers)
+    
+    tail = b"]," + _dumps(meta)[1:]
+    
+    def chunks():
+        yield b'{"records":['
+        for start in range(0, len(page_records), STREAM_CHUNK_RECORDS):
+            chunk = _dumps(page_records[start:start + STREAM_CHUNK_RECORDS])[1:-1]
+            yield chunk if start == 0 else b"," + chunk
+        yield tail
+    
+    return StreamingResponse(chunks(), media_type="application/json", headers=headers)
+
 # Rate limiting decorator
 def rate_limit(requests_per_minute: int = None, requests_per_hour: int = None, requests_per_day: int = None):
     def decorator(func):
         @wraps(func)
         async def wrapper(request: Request, *args, **kwargs):
+            global _last_rate_limit_sweep
             client_ip = request.client.host
-            current_time = time.time()
+            current_time = time.monotonic()
             
-            # Clean old entries and check limits
             limits = [
                 (requests_per_minute or config.RATE_LIMIT_RPM, 60, "minute"),
                 (requests_per_hour or config.RATE_LIMIT_RPH, 3600, "hour"),
                 (requests_per_day or config.RATE_LIMIT_RPD, 86400, "day")
             ]
+            max_window = limits[-1][1]
+            
+            if current_time - _last_rate_limit_sweep > RATE_LIMIT_SWEEP_INTERVAL:
+                _last_rate_limit_sweep = current_time
+                _sweep_rate_limits(current_time, max_window)
+            
+            timestamps = rate_limit_storage.setdefault((client_ip, func.__name__), [])
             
+            # Remove timestamps outside the longest window
+            expired = bisect_left(timestamps, current_time - max_window)
+            if expired:
+                del timestamps[:expired]
+            
+            # Timestamps are sorted, so each window count is one binary search
             for limit, window, period in limits:
-                key = f"{client_ip}:{func.__name__}:{period}"
-                timestamps = rate_limit_storage[key]
-                
-                # Remove old timestamps
-                while timestamps and current_time - timestamps[0] > window:
-                    timestamps.popleft()
-                
-                # Check if limit exceeded
-                if len(timestamps) >= limit:
+                if len(timestamps) - bisect_left(timestamps, current_time - window) >= limit:
                     raise HTTPException(
                         status_code=429,
                         detail=f"Rate limit exceeded: {limit} requests per {period}"
                     )
-                
-                # Add current timestamp
-                timestamps.append(current_time)
+            
+            # Record the request once it is within every limit
+            timestamps.append(current_time)
             
             return await func(request, *args, **kwargs)
         return wrapper
@@ -132,6 +415,37 @@ async def startup_event():
     logger.info("Starting CMS Data Agent API v2.0")
     logger.info(f"Claude API available: {config.has_claude_key}")
     logger.info(f"Rate limits: {config.RATE_LIMIT_RPM}/min, {config.RATE_LIMIT_RPH}/hour, {config.RATE_LIMIT_RPD}/day")
+    
+    # Parse the dataset and build the chat context before the first request
+    await get_data_context()
+    
+    if httpx is not None:
+        get_claude_client()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the pooled Claude API client"""
+    client = getattr(app.state, "claude_client", None)
+    if client is not None:
+        app.state.claude_client = None
+        await client.aclose()
+
+def get_claude_client() -> "httpx.AsyncClient":
+    """
+    Shared Claude API client, created on first use
+    
+    Reusing one pooled client keeps TCP/TLS connections warm across chat
+    requests instead of handshaking for each message.
+    """
+    client = getattr(app.state, "claude_client", None)
+    if client is None:
+        client = httpx.AsyncClient(
+            http2=_HTTP2,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=20)
+        )
+        app.state.claude_client = client
+    return client
 
 @app.get("/")
 async def root():
@@ -200,8 +514,6 @@ async def chat_with_data(request: Request, chat_request: dict, api_key: str = De
 
 async def call_claude_api_server(message: str) -> str:
     """Call Claude API using server-side API key"""
-    import httpx
-    
     data_context = await get_data_context()
     
     system_prompt = f"""You are an AI assistant helping users analyze CMS healthcare provider data.
@@ -219,30 +531,29 @@ Please provide helpful, accurate responses about this healthcare data. Focus on:
 Always base your responses on the actual data characteristics described above."""
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.anthropic.com/v1/messages",
-                headers={
-                    "Content-Type": "application/json",
-                    "x-api-key": config.CLAUDE_API_KEY,
-                    "anthropic-version": "2023-06-01"
-                },
-                json={
-                    "model": config.CLAUDE_MODEL,
-                    "max_tokens": config.CLAUDE_MAX_TOKENS,
-                    "system": system_prompt,
-                    "messages": [{"role": "user", "content": message}]
-                },
-                timeout=30.0
-            )
+        response = await get_claude_client().post(
+            "https://api.anthropic.com/v1/messages",
+            headers={
+                "Content-Type": "application/json",
+                "x-api-key": config.CLAUDE_API_KEY,
+                "anthropic-version": "2023-06-01"
+            },
+            json={
+                "model": config.CLAUDE_MODEL,
+                "max_tokens": config.CLAUDE_MAX_TOKENS,
+                "system": system_prompt,
+                "messages": [{"role": "user", "content": message}]
+            },
+            timeout=30.0
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            return data["content"][0]["text"]
+        else:
+            logger.error(f"Claude API error: {response.status_code}")
+            return generate_demo_chat_response(message)
             
-            if response.status_code == 200:
-                data = response.json()
-                return data["content"][0]["text"]
-            else:
-                logger.error(f"Claude API error: {response.status_code}")
-                return generate_demo_chat_response(message)
-                
     except Exception as e:
         logger.error(f"Error calling Claude API: {e}")
         return generate_demo_chat_response(message)
@@ -253,39 +564,60 @@ async def call_claude_api_with_key(message: str, api_key: str) -> str:
     # to avoid exposing the client's API key
     return f"I received your message: '{message}'. Server-side Claude integration would process this with your provided API key."
 
-async def get_data_context() -> str:
-    """Get context about the current dataset"""
-    try:
-        cms_data_file = Path("cms_data/cms_full_dataset.json")
-        if cms_data_file.exists():
-            with open(cms_data_file, 'r') as f:
-                data = json.load(f)
-                total_records = len(data) if isinstance(data, list) else 0
-                
-            if total_records > 0:
-                sample_record = data[0] if isinstance(data, list) else {}
-                fields = list(sample_record.keys()) if sample_record else []
-                
-                # Calculate basic stats
-                ratings = []
-                for record in data[:100]:  # Sample first 100 for performance
-                    if isinstance(record, dict) and 'hhcahps_survey_summary_star_rating' in record:
-                        try:
-                            rating = int(record['hhcahps_survey_summary_star_rating'])
-                            if 1 <= rating <= 5:
-                                ratings.append(rating)
-                        except (ValueError, TypeError):
-                            pass
-                
-                avg_rating = sum(ratings) / len(ratings) if ratings else 0
-                
-                return f"""
+def describe_dataset(data: Any) -> str:
+    """Build the chat context summary for a parsed dataset"""
+    total_records = len(data) if isinstance(data, list) else 0
+    
+    if total_records > 0:
+        sample_record = data[0]
+        fields = list(sample_record.keys()) if sample_record else []
+        
+        # Calculate basic stats
+        ratings = []
+        for record in data[:100]:  # Sample first 100 for performance
+            if isinstance(record, dict) and 'hhcahps_survey_summary_star_rating' in record:
+                try:
+                    rating = int(record['hhcahps_survey_summary_star_rating'])
+                    if 1 <= rating <= 5:
+                        ratings.append(rating)
+                except (ValueError, TypeError):
+                    pass
+        
+        avg_rating = sum(ratings) / len(ratings) if ratings else 0
+        
+        return f"""
 Dataset Summary:
 - Total records: {total_records}
 - Available fields: {', '.join(fields[:10])}{'...' if len(fields) > 10 else ''}
 - Average rating (sample): {avg_rating:.2f}
 - Data format: Healthcare provider survey results with star ratings
 """
+    
+    return "No CMS data currently loaded."
+
+# Chat context with the (mtime_ns, size) of the dataset it was built from
+_data_context_cache: Optional[Tuple[Tuple[int, int], str]] = None
+
+async def get_data_context() -> str:
+    """
+    Get context about the current dataset
+    
+    The summary is rebuilt only when the dataset file changes; otherwise
+    each chat request pays for a single stat() call.
+    """
+    global _data_context_cache
+    try:
+        cms_data_file = Path("cms_data/cms_full_dataset.json")
+        if cms_data_file.exists():
+            st = cms_data_file.stat()
+            key = (st.st_mtime_ns, st.st_size)
+            if _data_context_cache is not None and _data_context_cache[0] == key:
+                return _data_context_cache[1]
+            
+            data = await asyncio.to_thread(load_dataset, cms_data_file)
+            context = describe_dataset(data)
+            _data_context_cache = (key, context)
+            return context
         
         return "No CMS data currently loaded."
         
@@ -329,8 +661,7 @@ async def get_agent_status():
     try:
         status_file = Path("cms_data/agent_status.json")
         if status_file.exists():
-            with open(status_file, 'r') as f:
-                status_data = json.load(f)
+            status_data = await asyncio.to_thread(_loads, status_file)
         else:
             status_data = {"status": "unknown", "last_seen": None}
         
@@ -345,12 +676,23 @@ async def get_agent_status():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/data/stats")
-async def get_data_stats():
+async def get_data_stats(request: Request, response: Response):
     """Get data statistics"""
     try:
         cms_data_file = Path("cms_data/cms_full_dataset.json")
         record_count_file = Path("cms_data/cms_record_count.json")
         
+        etag = None
+        if cms_data_file.exists():
+            etag = file_etag(cms_data_file)
+            cached = not_modified(request, response, etag)
+            if cached is not None:
+                return cached
+            
+            body = response_cache.get(("stats", etag))
+            if body is not None:
+                return json_body_response(body, etag, "HIT")
+        
         stats = {
             "record_count": 0,
             "data_size": 0,
@@ -365,14 +707,18 @@ async def get_data_stats():
             
             # Count records
             try:
-                with open(cms_data_file, 'r') as f:
-                    data = json.load(f)
-                    if isinstance(data, list):
-                        stats["record_count"] = len(data)
+                data = await asyncio.to_thread(load_dataset, cms_data_file)
+                if isinstance(data, list):
+                    stats["record_count"] = len(data)
             except:
                 pass
         
-        return stats
+        if etag is None:
+            return stats
+        
+        body = _dumps(stats)
+        response_cache.put(("stats", etag), body)
+        return json_body_response(body, etag, "MISS")
         
     except Exception as e:
         logger.error(f"Error getting data stats: {e}")
@@ -382,6 +728,7 @@ async def get_data_stats():
 @rate_limit(requests_per_minute=20)  # Higher limit for data access
 async def get_data_records(
     request: Request,
+    response: Response,
     page: int = 1,
     limit: int = 50,
     search: str = None,
@@ -397,46 +744,57 @@ async def get_data_records(
         if not cms_data_file.exists():
             return {"records": [], "total": 0, "page": page, "limit": limit}
         
-        with open(cms_data_file, 'r') as f:
-            all_records = json.load(f)
+        etag = file_etag(cms_data_file)
+        cached = not_modified(request, response, etag)
+        if cached is not None:
+            return cached
+        
+        cache_key = ("records", etag, page, limit, search, rating)
+        body = response_cache.get(cache_key)
+        if body is not None:
+            return json_body_response(body, etag, "HIT")
+        
+        all_records = await asyncio.to_thread(load_dataset, cms_data_file)
         
         if not isinstance(all_records, list):
             return {"records": [], "total": 0, "page": page, "limit": limit}
         
-        # Apply filters
-        filtered_records = all_records
+        # Apply filters as sorted lists of record indices
+        matches = None
         
         if search:
-            search_lower = search.lower()
-            filtered_records = [
-                record for record in filtered_records
-                if any(
-                    search_lower in str(value).lower()
-                    for value in record.values()
-                    if value is not None
-                )
-            ]
+            index = await asyncio.to_thread(get_index, SearchIndex, cms_data_file, all_records)
+            matches = index.search(search)
         
         if rating is not None:
-            rating_str = str(rating)
-            filtered_records = [
-                record for record in filtered_records
-                if record.get('hhcahps_survey_summary_star_rating') == rating_str
-            ]
+            rating_index = await asyncio.to_thread(get_index, build_rating_index, cms_data_file, all_records)
+            rated = rating_index.get(str(rating), [])
+            if matches is None:
+                matches = rated
+            else:
+                rated = set(rated)
+                matches = [idx for idx in matches if idx in rated]
         
         # Pagination
-        total = len(filtered_records)
         start_idx = (page - 1) * limit
         end_idx = start_idx + limit
-        page_records = filtered_records[start_idx:end_idx]
+        if matches is None:
+            total = len(all_records)
+            page_records = all_records[start_idx:end_idx]
+        else:
+            total = len(matches)
+            page_records = [all_records[idx] for idx in matches[start_idx:end_idx]]
         
-        return {
-            "records": page_records,
+        meta = {
             "total": total,
             "page": page,
             "limit": limit,
             "total_pages": (total + limit - 1) // limit
         }
+        page_response = records_response(page_records, meta, {"ETag": etag, "X-Cache": "MISS"})
+        if not isinstance(page_response, StreamingResponse):
+            response_cache.put(cache_key, page_response.body)
+        return page_response
         
     except Exception as e:
         logger.error(f"Error getting data records: {e}")
@@ -444,4 +802,11 @@ async def get_data_records(
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    
+    # Rate-limit counters live in process memory, so each worker enforces them separately
+    workers = int(os.getenv("SECURE_API_WORKERS", "1"))
+    if workers > 1:
+        logger.warning(f"Starting {workers} workers; rate limits apply per worker")
+    
+    # loop/http "auto" pick uvloop and httptools when installed (uvicorn[standard])
+    uvicorn.run("secure_dashboard_api:app", host="0.0.0.0", port=8000, workers=workers)
@@ -3,17 +3,421 @@
 Simple API Data Downloader
 
 A simplified version for quick data downloads from APIs.
-Usage: python simple_download.py <api_url> [output_filename]
+Usage: python simple_download.py [--count] <api_url> [output_filename]
 """
 
+import asyncio
+import errno
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from urllib3.util.request import ACCEPT_ENCODING as _DECODABLE_ENCODINGS
+import hashlib
 import json
+import logging
 import sys
 import os
-from datetime import datetime
+import re
+import threading
+import time
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def download_data(api_url, output_file=None, headers=None):
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Progress goes through logging, so batch callers can silence it with
+# logging.getLogger('simple_download').setLevel(logging.WARNING)
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'API Data Downloader'
+
+# Encodings we can decode, strongest compression first. br and zstd are only
+# offered when brotli / zstandard are installed, which requests (via urllib3)
+# and httpx both use to decode them
+ACCEPT_ENCODING = ', '.join(
+    [name for name in ('zstd', 'br') if name in _DECODABLE_ENCODINGS.split(',')] + ['gzip', 'deflate']
+)
+
+# Transient failures (connection errors, 429 and 5xx) are retried on the pooled
+# connection with exponential backoff and jitter, waiting out any Retry-After
+# the server sends. Once retries run out the last response is returned, so
+# raise_for_status() reports it as usual
+_RETRY_OPTIONS = dict(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset(['GET']),
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+try:
+    RETRY = Retry(backoff_jitter=0.25, **_RETRY_OPTIONS)
+except TypeError:
+    # backoff_jitter needs urllib3 2.x; 1.26 backs off without it
+    RETRY = Retry(**_RETRY_OPTIONS)
+
+# Shared session: keeps connections alive across downloads and carries the
+# headers every request sends
+_SESSION = requests.Session()
+_SESSION.headers.update({'User-Agent': USER_AGENT, 'Accept-Encoding': ACCEPT_ENCODING})
+_ADAPTER = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=RETRY)
+_SESSION.mount('https://', _ADAPTER)
+_SESSION.mount('http://', _ADAPTER)
+
+# Chunk size for streaming bodies to disk, and the file buffer that batches
+# those chunks into fewer write() calls
+COPY_CHUNK_SIZE = 64 * 1024
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Downloads in flight at once in download_many
+MAX_CONCURRENT_DOWNLOADS = 8
+
+# Output file extension by MIME type
+MIME_EXTENSIONS = {
+    'application/json': 'json',
+    'text/json': 'json',
+    'text/csv': 'csv',
+    'application/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/jsonlines': 'ndjson',
+    'application/jsonl': 'ndjson',
+    'application/xml': 'xml',
+    'text/xml': 'xml',
+}
+
+# Allowed output filenames: a single plain name inside data/, no separators
+_NAME_RE = re.compile(r'\A[A-Za-z0-9._-]{1,200}\Z')
+
+# Earlier downloads by URL (saved file, ETag / Last-Modified, Cache-Control expiry)
+VALIDATORS_FILE = os.path.join("data", ".download_etags.json")
+_validators = None
+_validators_lock = threading.Lock()
+
+# Generated output paths handed out by this process whose files are still being
+# written, so downloads finishing within the same second get distinct names
+_generated_paths = set()
+_generated_paths_lock = threading.Lock()
+
+
+def _parse_json(body, content_type):
+    """
+    Decode a JSON response body
+    
+    UTF-8 bodies are parsed straight from the bytes with orjson when it is
+    installed; input orjson rejects (NaN, integers beyond 64 bits) goes
+    through the json module, after decoding any other declared charset.
+    
+    Args:
+        body: Response body as bytes or bytearray
+        content_type: Content-Type header of the response
+    """
+    charset = content_type.partition('charset=')[2].split(';')[0].strip(' "\'').lower()
+    if not charset or charset in ('utf-8', 'utf8'):
+        if orjson is not None:
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+    else:
+        try:
+            return json.loads(body.decode(charset, errors='replace'))
+        except LookupError:
+            pass
+    # json.loads detects UTF-8/16/32 from the bytes themselves
+    return json.loads(body)
+
+
+def _dump_json(data):
+    """Encode data as 2-space indented UTF-8 JSON bytes"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _ndjson_record(line):
+    """
+    Re-encode one NDJSON line compactly
+    
+    Returns:
+        The record as a newline-terminated UTF-8 line, or None for a blank line
+    """
+    if not line.strip():
+        return None
+    if orjson is not None:
+        try:
+            return orjson.dumps(orjson.loads(line), option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+        except (orjson.JSONDecodeError, orjson.JSONEncodeError):
+            pass
+    return json.dumps(json.loads(line), ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def _file_type(content_type):
+    """
+    Output extension for a Content-Type header
+    
+    Parameters such as charset are ignored. Types missing from MIME_EXTENSIONS
+    use their structured syntax suffix (application/vnd.api+json -> json),
+    falling back to txt.
+    """
+    mime = content_type.split(';', 1)[0].strip().lower()
+    ext = MIME_EXTENSIONS.get(mime)
+    if ext is None:
+        suffix = mime.rpartition('+')[2] if '+' in mime else ''
+        ext = suffix if suffix in ('json', 'xml') else 'txt'
+    return ext
+
+
+def _check_output_file(output_file):
+    """
+    Reject output filenames that could escape data/
+    
+    Raises:
+        ValueError: If output_file is not a plain name of letters, digits,
+            '.', '_' and '-', or consists only of dots
+    """
+    if output_file and (not _NAME_RE.match(output_file) or not output_file.strip('.')):
+        raise ValueError(f"Invalid output filename: {output_file!r}")
+
+
+@functools.lru_cache(maxsize=None)
+def _ensure_dir(path):
+    """Create a directory once per process and return its path"""
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _output_path(output_file, ext):
+    """
+    Path under data/ to save a download to
+    
+    Args:
+        output_file: Requested filename, or None to name it by time and type
+        ext: Extension for a generated name, from _file_type
+    """
+    data_dir = _ensure_dir("data")
+    
+    if output_file:
+        return os.path.join(data_dir, output_file)
+    
+    # Generate output filename, numbering it if the name is already taken
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    with _generated_paths_lock:
+        output_path = os.path.join(data_dir, f"api_data_{timestamp}.{ext}")
+        n = 1
+        while output_path in _generated_paths or os.path.exists(output_path):
+            n += 1
+            output_path = os.path.join(data_dir, f"api_data_{timestamp}_{n}.{ext}")
+        _generated_paths.add(output_path)
+    return output_path
+
+
+def _release_generated_path(output_path):
+    """Forget a generated output path once its download has finished writing"""
+    with _generated_paths_lock:
+        _generated_paths.discard(output_path)
+
+
+def _load_validators():
+    """Stored validators, loaded from VALIDATORS_FILE on first use"""
+    global _validators
+    if _validators is None:
+        try:
+            with open(VALIDATORS_FILE, 'rb') as f:
+                loaded = json.loads(f.read())
+        except (OSError, ValueError):
+            loaded = {}
+        _validators = loaded if isinstance(loaded, dict) else {}
+    return _validators
+
+
+def _previous_download(api_url, output_file):
+    """
+    Validators of an earlier download of api_url that this one would replace
+    
+    Returns:
+        The stored entry, or None if there is none, its file is gone or the
+        caller asked for a different filename
+    """
+    entry = _load_validators().get(api_url)
+    if not entry or not os.path.exists(entry.get('file', '')):
+        return None
+    if output_file and entry['file'] != os.path.join("data", output_file):
+        return None
+    return entry
+
+
+def _conditional_headers(entry, headers):
+    """Request headers plus If-None-Match / If-Modified-Since from an earlier download"""
+    request_headers = dict(headers or {})
+    if entry is not None:
+        if entry.get('etag'):
+            request_headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            request_headers['If-Modified-Since'] = entry['last_modified']
+    return request_headers
+
+
+def _max_age(response_headers):
+    """Seconds the response may be reused for, from Cache-Control max-age"""
+    cache_control = response_headers.get('Cache-Control', '').lower()
+    if 'no-store' in cache_control or 'no-cache' in cache_control:
+        return None
+    for directive in cache_control.split(','):
+        name, _, value = directive.strip().partition('=')
+        if name == 'max-age':
+            try:
+                return int(value.strip('"'))
+            except ValueError:
+                return None
+    return None
+
+
+def _record_download(api_url, output_path, response_headers, entry=None):
+    """
+    Remember a download's validators, persisting them atomically
+    
+    Args:
+        api_url: Downloaded URL
+        output_path: File the body is saved in
+        response_headers: Headers of the 200 or 304 response
+        entry: Earlier entry refreshed by a 304, whose validators are kept
+            where the 304 omits them
+    """
+    entry = entry or {}
+    etag = response_headers.get('ETag') or entry.get('etag')
+    last_modified = response_headers.get('Last-Modified') or entry.get('last_modified')
+    max_age = _max_age(response_headers)
+    if not (etag or last_modified or max_age):
+        return
+    
+    with _validators_lock:
+        validators = _load_validators()
+        validators[api_url] = {
+            'file': output_path,
+            'etag': etag,
+            'last_modified': last_modified,
+            'expires_at': time.time() + max_age if max_age else None
+        }
+        
+        tmp_path = VALIDATORS_FILE + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(validators, f, indent=2)
+        os.replace(tmp_path, VALIDATORS_FILE)
+
+
+def _write_bytes(output_path, payload):
+    """Write payload with write() calls straight on a raw descriptor, no buffered file object"""
+    fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _write_checksum(output_path, digest):
+    """Save a sha256sum-compatible <output_path>.sha256 sidecar and report the digest"""
+    checksum = digest.hexdigest()
+    with open(output_path + '.sha256', 'w', encoding='utf-8') as f:
+        f.write(f"{checksum}  {os.path.basename(output_path)}\n")
+    logger.info("🔐 SHA-256: %s", checksum)
+
+
+def _save_json(data, output_path):
+    """Write parsed JSON data to output_path and report the record count"""
+    payload = _dump_json(data)
+    _write_bytes(output_path, payload)
+    _write_checksum(output_path, hashlib.sha256(payload))
+    logger.info("📊 Records: %s", len(data) if isinstance(data, list) else 'N/A')
+
+
+def _save_ndjson(lines, output_path):
+    """
+    Parse NDJSON line by line as it arrives, writing each record through to
+    output_path, and report the record count
+    
+    Args:
+        lines: Iterable of the body's lines as bytes
+        output_path: File to write the records to
+    """
+    digest = hashlib.sha256()
+    records = 0
+    with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        # Bound once so the per-line loop uses local lookups
+        to_record, update, write = _ndjson_record, digest.update, f.write
+        for line in lines:
+            record = to_record(line)
+            if record is not None:
+                update(record)
+                write(record)
+                records += 1
+    _write_checksum(output_path, digest)
+    logger.info("📊 Records: %s", records)
+
+
+def _forward_file(path, out_fd):
+    """
+    Copy a saved download to another open file descriptor
+    
+    Uses sendfile(2) so the kernel moves the bytes from the page cache without
+    a round trip through Python; falls back to read/write where sendfile is
+    unavailable or does not support the target descriptor.
+    
+    Returns:
+        Number of bytes written to out_fd
+    """
+    with open(path, 'rb') as f:
+        in_fd = f.fileno()
+        size = os.fstat(in_fd).st_size
+        sent = 0
+        if hasattr(os, 'sendfile'):
+            try:
+                while sent < size:
+                    n = os.sendfile(out_fd, in_fd, sent, size - sent)
+                    if n == 0:
+                        break
+                    sent += n
+                return sent
+            except OSError as e:
+                if sent or e.errno not in (errno.EINVAL, errno.ENOSYS, errno.ENOTSOCK, errno.EOPNOTSUPP):
+                    raise
+        while chunk := f.read(COPY_CHUNK_SIZE):
+            view = memoryview(chunk)
+            while view:
+                view = view[os.write(out_fd, view):]
+            sent += len(chunk)
+        return sent
+
+
+async def _aiter_byte_lines(response):
+    """
+    Lines of an httpx response body as bytes
+    
+    Only b'\\n' ends a line: aiter_lines() decodes to str and also splits on
+    U+2028 and other separators that may appear unescaped inside JSON strings.
+    """
+    pending = b''
+    async for chunk in response.aiter_bytes(COPY_CHUNK_SIZE):
+        *lines, pending = (pending + chunk).split(b'\n')
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
+
+
+def download_data(api_url, output_file=None, headers=None, parse_json=False, forward_to_fd=None):
     """
     Download data from API and save to file
     
@@ -21,76 +425,262 @@ def download_data(api_url, output_file=None, headers=None):
         api_url: URL to fetch data from
         output_file: Output filename (optional)
         headers: HTTP headers dict (optional)
+        parse_json: Parse JSON bodies to report the record count and re-indent
+            them (NDJSON is re-encoded line by line); otherwise the server's
+            bytes are saved unchanged
+        forward_to_fd: Open file descriptor (file, pipe or socket) to also
+            send the saved file to, e.g. for handing it to an ingestion
+            service (optional)
+    
+    Raises:
+        ValueError: If output_file is not a plain filename
     """
+    _check_output_file(output_file)
     try:
-        print(f"🔄 Downloading data from: {api_url}")
+        entry = _previous_download(api_url, output_file)
+        if entry is not None and entry.get('expires_at') and time.time() < entry['expires_at']:
+            logger.info("♻️  Still fresh, keeping: %s", entry['file'])
+            if forward_to_fd is not None:
+                logger.info("📤 Forwarded %s bytes", _forward_file(entry['file'], forward_to_fd))
+            return True
         
-        # Make request
-        response = requests.get(api_url, headers=headers or {}, timeout=30)
-        response.raise_for_status()
+        logger.info("🔄 Downloading data from: %s", api_url)
         
-        # Determine content type
-        content_type = response.headers.get('content-type', '').lower()
+        # Make request; the body is read as it is saved
+        request_headers = _conditional_headers(entry, headers)
+        with _SESSION.get(api_url, headers=request_headers, timeout=30, stream=True) as response:
+            if entry is not None and response.status_code == 304:
+                _record_download(api_url, entry['file'], response.headers, entry)
+                logger.info("♻️  Not modified since last download, keeping: %s", entry['file'])
+                if forward_to_fd is not None:
+                    logger.info("📤 Forwarded %s bytes", _forward_file(entry['file'], forward_to_fd))
+                return True
+            
+            response.raise_for_status()
+            
+            # Determine content type
+            file_type = _file_type(response.headers.get('content-type', ''))
+            if response.headers.get('content-encoding'):
+                logger.info("🗜️  Content-Encoding: %s", response.headers['content-encoding'])
+            
+            output_path = _output_path(output_file, file_type)
+            
+            try:
+                # Save data based on content type
+                if parse_json and file_type == 'json':
+                    # Read the body without the response keeping its own copy, and
+                    # free it before the re-indented output is built
+                    body = response.raw.read(decode_content=True)
+                    data = _parse_json(body, response.headers.get('content-type', ''))
+                    del body
+                    _save_json(data, output_path)
+                elif parse_json and file_type == 'ndjson':
+                    _save_ndjson(response.iter_lines(chunk_size=COPY_CHUNK_SIZE, delimiter=b'\n'), output_path)
+                else:
+                    # Copy the decoded body to disk in chunks instead of buffering
+                    # it, hashing each chunk on the way; the bound methods keep
+                    # attribute lookups out of the per-chunk loop
+                    response.raw.decode_content = True
+                    digest = hashlib.sha256()
+                    with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                        read, update, write = response.raw.read, digest.update, f.write
+                        while chunk := read(COPY_CHUNK_SIZE):
+                            update(chunk)
+                            write(chunk)
+                    _write_checksum(output_path, digest)
+            finally:
+                # Once written, the file on disk keeps its name taken
+                _release_generated_path(output_path)
         
-        # Generate output filename if not provided
-        if not output_file:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            if 'json' in content_type:
-                output_file = f"api_data_{timestamp}.json"
-            elif 'csv' in content_type:
-                output_file = f"api_data_{timestamp}.csv"
-            else:
-                output_file = f"api_data_{timestamp}.txt"
+        _record_download(api_url, output_path, response.headers)
+        logger.info("✅ Data saved to: %s", output_path)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("📁 File size: %s bytes", os.path.getsize(output_path))
         
-        # Create data directory
-        os.makedirs("data", exist_ok=True)
-        output_path = os.path.join("data", output_file)
+        if forward_to_fd is not None:
+            logger.info("📤 Forwarded %s bytes", _forward_file(output_path, forward_to_fd))
         
-        # Save data based on content type
-        if 'json' in content_type:
-            data = response.json()
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            print(f"📊 Records: {len(data) if isinstance(data, list) else 'N/A'}")
-        else:
-            with open(output_path, 'wb') as f:
-                f.write(response.content)
+        return True
         
-        print(f"✅ Data saved to: {output_path}")
-        print(f"📁 File size: {os.path.getsize(output_path)} bytes")
+    except requests.exceptions.RequestException as e:
+        logger.error("❌ Request error: %s", e)
+        return False
+    except Exception as e:
+        logger.error("❌ Error: %s", e)
+        return False
+
+
+async def _download_data_async(client, api_url, output_file=None, headers=None, parse_json=False):
+    """
+    Async counterpart of download_data on a shared httpx client
+    
+    Args:
+        client: httpx.AsyncClient to request through
+        api_url: URL to fetch data from
+        output_file: Output filename (optional)
+        headers: HTTP headers dict (optional)
+        parse_json: Parse JSON bodies to report the record count and re-indent them
+    
+    Raises:
+        ValueError: If output_file is not a plain filename
+    """
+    _check_output_file(output_file)
+    try:
+        entry = _previous_download(api_url, output_file)
+        if entry is not None and entry.get('expires_at') and time.time() < entry['expires_at']:
+            logger.info("♻️  Still fresh, keeping: %s", entry['file'])
+            return True
+        
+        logger.info("🔄 Downloading data from: %s", api_url)
+        
+        request_headers = _conditional_headers(entry, headers)
+        async with client.stream('GET', api_url, headers=request_headers) as response:
+            if entry is not None and response.status_code == 304:
+                _record_download(api_url, entry['file'], response.headers, entry)
+                logger.info("♻️  Not modified since last download, keeping: %s", entry['file'])
+                return True
+            
+            response.raise_for_status()
+            
+            file_type = _file_type(response.headers.get('content-type', ''))
+            if response.headers.get('content-encoding'):
+                logger.info("🗜️  Content-Encoding: %s", response.headers['content-encoding'])
+            output_path = _output_path(output_file, file_type)
+            
+            try:
+                if parse_json and file_type == 'json':
+                    body = bytearray()
+                    async for chunk in response.aiter_bytes():
+                        body += chunk
+                    data = _parse_json(body, response.headers.get('content-type', ''))
+                    del body
+                    _save_json(data, output_path)
+                elif parse_json and file_type == 'ndjson':
+                    digest = hashlib.sha256()
+                    records = 0
+                    with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                        to_record, update, write = _ndjson_record, digest.update, f.write
+                        async for line in _aiter_byte_lines(response):
+                            record = to_record(line)
+                            if record is not None:
+                                update(record)
+                                write(record)
+                                records += 1
+                    _write_checksum(output_path, digest)
+                    logger.info("📊 Records: %s", records)
+                else:
+                    digest = hashlib.sha256()
+                    with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                        update, write = digest.update, f.write
+                        async for chunk in response.aiter_bytes(COPY_CHUNK_SIZE):
+                            update(chunk)
+                            write(chunk)
+                    _write_checksum(output_path, digest)
+            finally:
+                # Once written, the file on disk keeps its name taken
+                _release_generated_path(output_path)
+        
+        _record_download(api_url, output_path, response.headers)
+        logger.info("✅ Data saved to: %s", output_path)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("📁 File size: %s bytes", os.path.getsize(output_path))
         
         return True
         
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Request error: {e}")
+    except httpx.HTTPError as e:
+        logger.error("❌ Request error: %s", e)
         return False
     except Exception as e:
-        print(f"❌ Error: {e}")
+        logger.error("❌ Error: %s", e)
         return False
 
 
+async def download_many_async(urls, headers=None, max_concurrency=MAX_CONCURRENT_DOWNLOADS, parse_json=False):
+    """
+    Download several URLs concurrently over one pooled httpx client
+    
+    Args:
+        urls: URLs to fetch; each is saved under an automatic filename
+        headers: HTTP headers dict sent with every request (optional)
+        max_concurrency: Maximum downloads in flight at once
+        parse_json: Parse JSON bodies to report record counts and re-indent them
+        
+    Returns:
+        List of success flags, in the same order as urls
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+    
+    async def fetch(client, api_url):
+        async with semaphore:
+            return await _download_data_async(client, api_url, headers=headers, parse_json=parse_json)
+    
+    async with httpx.AsyncClient(
+        headers={'User-Agent': USER_AGENT, 'Accept-Encoding': ACCEPT_ENCODING},
+        timeout=30, limits=limits, follow_redirects=True
+    ) as client:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(fetch(client, api_url)) for api_url in urls]
+    
+    return [task.result() for task in tasks]
+
+
+def download_many(urls, headers=None, max_concurrency=MAX_CONCURRENT_DOWNLOADS, parse_json=False):
+    """
+    Download several URLs concurrently: on the httpx client when it is
+    installed, otherwise on a thread pool sharing the requests session
+    
+    Args:
+        urls: URLs to fetch; each is saved under an automatic filename
+        headers: HTTP headers dict sent with every request (optional)
+        max_concurrency: Maximum downloads in flight at once
+        parse_json: Parse JSON bodies to report record counts and re-indent them
+        
+    Returns:
+        List of success flags, in the same order as urls
+    """
+    if httpx is None:
+        # requests releases the GIL while waiting on sockets, and the
+        # session's pool lets the threads reuse connections per host
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            return list(executor.map(
+                lambda api_url: download_data(api_url, headers=headers, parse_json=parse_json), urls
+            ))
+    return asyncio.run(download_many_async(urls, headers, max_concurrency, parse_json))
+
+
 def main():
     """Main function"""
-    if len(sys.argv) < 2:
-        print("Usage: python simple_download.py <api_url> [output_filename]")
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
+    # --count parses JSON downloads to report the record count
+    parse_json = '--count' in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg != '--count']
+    
+    if not args:
+        print("Usage: python simple_download.py [--count] <api_url> [output_filename]")
         print("\nExamples:")
         print("  python simple_download.py https://jsonplaceholder.typicode.com/posts")
         print("  python simple_download.py https://api.example.com/data my_data.json")
+        print("  python simple_download.py --count https://api.example.com/data")
         sys.exit(1)
     
-    api_url = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else None
+    api_url = args[0]
+    output_file = args[1] if len(args) > 1 else None
     
-    # Example headers (customize as needed)
+    # Example headers (customize as needed); User-Agent is set on the session
     headers = {
-        'User-Agent': 'API Data Downloader',
         'Accept': 'application/json'
         # Add authentication headers here if needed:
         # 'Authorization': 'Bearer your_token_here',
         # 'X-API-Key': 'your_api_key_here',
     }
     
-    success = download_data(api_url, output_file, headers)
+    try:
+        success = download_data(api_url, output_file, headers, parse_json=parse_json)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
     
     if success:
         print("🎉 Download completed successfully!")